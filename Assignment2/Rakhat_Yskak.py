@@ -1,220 +1,471 @@
 #!/usr/bin/python
 
-from mn_wifi.cli import CLI
 from mn_wifi.net import Mininet_wifi
 from mininet.node import RemoteController
 from mininet.log import setLogLevel, info
+import argparse
+import json
 import os
 import time
-
+import numpy as np
+
+import runs
+import shared  # noqa: F401
+import trajectory as mobility
+from instance import Instance, add_instance_args
+from handovers import AssociationSampler
+from iperf_pool import IperfServerPool
+from jobs import JobSupervisor
+from node_batch import run_batch
+
+# Default address of the domain controllers (--controller-ip)
 HOST = "192.168.56.1"
-PORTS = [6633, 6634, 6635]
-
-# Create tests directory if it doesn't exist
-if not os.path.exists("./tests"):
-    os.makedirs("./tests")
-
 
-def run_baseline_tests(net):
-    """Run tests WITHOUT mobility to establish baseline performance"""
+# Default controller ports of the three domains
+PORTS = [6633, 6634, 6635]
 
-    info("*** BASELINE TEST (NO MOBILITY) ***\n")
-    # Get nodes
-    sta1 = net.get("sta1")
-    sta2 = net.get("sta2")
-    sta3 = net.get("sta3")
-    c1_h1 = net.get("c1_h1")
-    c2_h1 = net.get("c2_h1")
-    c3_h1 = net.get("c3_h1")
-
-    info("*** Starting iperf servers on hosts\n")
-    # Start TCP servers
-    c1_h1.cmd("iperf -s -p 5001 > /dev/null 2>&1 &")
-    c2_h1.cmd("iperf -s -p 5002 > /dev/null 2>&1 &")
-    c3_h1.cmd("iperf -s -p 5003 > /dev/null 2>&1 &")
-
-    # Start UDP servers
-    c1_h1.cmd("iperf -s -u -p 5101 > /dev/null 2>&1 &")
-    c2_h1.cmd("iperf -s -u -p 5102 > /dev/null 2>&1 &")
-    c3_h1.cmd("iperf -s -u -p 5103 > /dev/null 2>&1 &")
-
-    time.sleep(2)
-
-    info("*** Baseline Test: ICMP Traffic (No Mobility)\n")
-    # ICMP tests - 60 seconds
-    sta1.cmd("ping -c 120 -i 0.5 10.0.0.1 > ./tests/baseline_icmp_sta1.txt &")
-    sta2.cmd("ping -c 120 -i 0.5 10.0.0.5 > ./tests/baseline_icmp_sta2.txt &")
-    sta3.cmd("ping -c 120 -i 0.5 10.0.0.9 > ./tests/baseline_icmp_sta3.txt &")
-
-    info("*** Baseline Test: TCP Traffic (No Mobility)\n")
-    # TCP tests - 60 seconds
-    sta1.cmd("iperf -c 10.0.0.1 -p 5001 -t 60 -i 1 > ./tests/baseline_tcp_sta1.txt &")
-    sta2.cmd("iperf -c 10.0.0.5 -p 5002 -t 60 -i 1 > ./tests/baseline_tcp_sta2.txt &")
-    sta3.cmd("iperf -c 10.0.0.9 -p 5003 -t 60 -i 1 > ./tests/baseline_tcp_sta3.txt &")
-
-    info("*** Baseline Test: UDP Traffic (No Mobility)\n")
-    # UDP tests - 60 seconds
-    sta1.cmd(
-        "iperf -c 10.0.0.1 -p 5101 -u -b 10M -t 60 -i 1 > ./tests/baseline_udp_sta1.txt &"
+# iperf client report format: "text" or "csv" (iperf -y C, loaded by graph.py
+# as plain columns instead of matching human-readable lines)
+IPERF_FORMAT = os.environ.get("IPERF_FORMAT", "text")
+IPERF_FLAGS = "-y C" if IPERF_FORMAT == "csv" else ""
+
+# Client run time, and how long past it a phase waits for stragglers
+TEST_DURATION = 60
+PHASE_GRACE = 15
+
+# Upper bound on waiting for switches to connect to their controllers
+STABILIZE_TIMEOUT = 10
+
+# Table-miss entry of OpenFlow 1.3 controllers, restored after clearing flows
+TABLE_MISS_FLOW = "priority=0,actions=CONTROLLER:65535"
+
+# Experiment parameters (overridden per run by sweep.py)
+PROPAGATION_EXP = 3
+UDP_RATE = "10M"
+AP_RANGE = 120
+TRAJECTORY = "cross"
+
+# Initial station positions
+STATION_POSITIONS = {
+    "sta1": "10,30,0",
+    "sta2": "30,30,0",
+    "sta3": "50,30,0",
+}
+
+# Access point positions and channels
+ACCESS_POINTS = {
+    "c1_ap1": ("10,30,0", 1),
+    "c2_ap1": ("30,30,0", 6),
+    "c3_ap1": ("50,30,0", 11),
+}
+
+# Association policy assumed by the handover prediction (see trajectory.py);
+# no ac_method is configured, so stations keep their AP while in range
+HANDOVER_POLICY = "sticky"
+
+# Server host, server IP and AP of every measured station
+STATION_TARGETS = {
+    "sta1": ("c1_h1", "10.0.0.1", "c1_ap1"),
+    "sta2": ("c2_h1", "10.0.0.5", "c2_ap1"),
+    "sta3": ("c3_h1", "10.0.0.9", "c3_ap1"),
+}
+
+# Static control twins (name -> (twin of, IP)) for concurrent runs; they stay
+# at their twin's initial position while the originals move
+CONTROL_STATIONS = {
+    "sta4": ("sta1", "10.0.0.16/24"),
+    "sta5": ("sta2", "10.0.0.17/24"),
+    "sta6": ("sta3", "10.0.0.18/24"),
+}
+
+# Mobility phase trajectories: station -> (start, stop) position, moving
+# from t=1s to t=TEST_DURATION, or a random model from trajectory.py (see
+# MOBILITY_MODELS)
+TRAJECTORIES = {
+    # sta1: Domain1 -> Domain3, sta2: Domain2 -> Domain3, sta3: Domain3 -> Domain1
+    "cross": {
+        "sta1": ("10,30,0", "50,30,0"),
+        "sta2": ("30,30,0", "50,25,0"),
+        "sta3": ("50,30,0", "10,25,0"),
+    },
+    # sta1: Domain3 -> Domain1, sta2: Domain3 -> Domain2, sta3: Domain1 -> Domain3
+    "reverse": {
+        "sta1": ("50,30,0", "10,30,0"),
+        "sta2": ("50,25,0", "30,30,0"),
+        "sta3": ("10,25,0", "50,30,0"),
+    },
+    # sta1 and sta3 swap ends through Domain2, sta2 stays in Domain2
+    "swap": {
+        "sta1": ("10,30,0", "50,30,0"),
+        "sta2": ("30,30,0", "30,25,0"),
+        "sta3": ("50,30,0", "10,30,0"),
+    },
+}
+
+# Random mobility models, replayed with setPosition() every TIME_STEP
+MOBILITY_AREA = ((0, 10), (60, 50))
+MOBILITY_MODELS = {
+    "random-waypoint": lambda times, starts: mobility.random_waypoint(
+        times, starts, MOBILITY_AREA
+    ),
+    "gauss-markov": lambda times, starts: mobility.gauss_markov(
+        times, starts, MOBILITY_AREA
+    ),
+}
+
+
+# Names, subnet and ports of this process's experiment instance
+# (see Project/mininet/instance.py)
+INSTANCE = Instance()
+
+
+def use_instance(instance):
+    """Run this process's experiment as the given instance"""
+    global INSTANCE
+    INSTANCE = instance
+
+
+def get_node(net, name):
+    """Node of this instance by its logical name (sta1, c1_h1, ...)"""
+    return net.get(INSTANCE.name(name))
+
+
+def target_ip(station):
+    """IP of the server host a station sends its traffic to"""
+    return INSTANCE.address(STATION_TARGETS[station][1])
+
+
+def report_path(tests_dir, phase, protocol, station):
+    """Report file of one client"""
+    extension = "csv" if protocol != "icmp" and IPERF_FORMAT == "csv" else "txt"
+    return os.path.join(tests_dir, f"{phase}_{protocol}_{station}.{extension}")
+
+
+def wait_for_clients(clients, phase):
+    """Finish a phase as soon as every client exits (or the timeout hits)"""
+    start = time.monotonic()
+    results = clients.wait(TEST_DURATION + PHASE_GRACE)
+    info(f"*** {phase} clients finished in {time.monotonic() - start:.1f}s\n")
+    for name, command, returncode in results:
+        if returncode:
+            info(f"*** Warning: '{command}' on {name} exited with {returncode}\n")
+
+
+def start_mobility(net, tests_dir, trajectory):
+    """Move sta1-sta3 along a trajectory and write the predicted handovers
+
+    Straight-line trajectories are handed to mn_wifi's mobility; random
+    models are precomputed and replayed by a TrajectoryPlayer, which is
+    returned so that the caller can stop it.
+    """
+    stations = list(STATION_TARGETS)
+    times = mobility.time_grid(TEST_DURATION + 1)
+    starts = [mobility.parse_position(STATION_POSITIONS[sta]) for sta in stations]
+    if trajectory in TRAJECTORIES:
+        positions = np.stack(
+            [
+                mobility.waypoints(
+                    times,
+                    [1, TEST_DURATION],
+                    [mobility.parse_position(p) for p in path],
+                )
+                for path in (TRAJECTORIES[trajectory][sta] for sta in stations)
+            ]
+        )
+    else:
+        positions = MOBILITY_MODELS[trajectory](times, starts)
+
+    # Predict associations and handovers from the AP layout and logDistance
+    ap_names = list(ACCESS_POINTS)
+    rssi, distance = mobility.log_distance_rssi(
+        positions,
+        [mobility.parse_position(position) for position, _ in ACCESS_POINTS.values()],
+        [mobility.CHANNEL_FREQUENCIES_GHZ[ch] for _, ch in ACCESS_POINTS.values()],
+        net.radio["exp"],
     )
-    sta2.cmd(
-        "iperf -c 10.0.0.5 -p 5102 -u -b 10M -t 60 -i 1 > ./tests/baseline_udp_sta2.txt &"
+    association = mobility.predict_association(
+        rssi, distance, net.radio["ap_range"], HANDOVER_POLICY
     )
-    sta3.cmd(
-        "iperf -c 10.0.0.9 -p 5103 -u -b 10M -t 60 -i 1 > ./tests/baseline_udp_sta3.txt &"
+
+    # Exactly one mover per station: mn_wifi or the player
+    start_time = time.time()
+    if trajectory in TRAJECTORIES:
+        net.startMobility(time=0)
+        for station, (start, stop) in TRAJECTORIES[trajectory].items():
+            node = get_node(net, station)
+            net.mobility(node, "start", time=1, position=start)
+            net.mobility(node, "stop", time=TEST_DURATION, position=stop)
+        net.stopMobility(time=TEST_DURATION + 1)
+        player = None
+    else:
+        player = mobility.TrajectoryPlayer(
+            [get_node(net, sta) for sta in stations], times, positions
+        )
+        player.start()
+
+    events = mobility.write_timeline(
+        tests_dir, stations, ap_names, times, positions, rssi, association, start_time
+    )
+    info(f"*** {len(events)} handover(s) predicted for '{trajectory}'\n")
+    return player
+
+
+def domain_of(position):
+    """Number of the domain whose AP is closest to an "x,y,z" position"""
+    point = mobility.parse_position(position)
+    distances = [
+        np.linalg.norm(point - mobility.parse_position(ap_position))
+        for ap_position, _ in ACCESS_POINTS.values()
+    ]
+    return int(np.argmin(distances)) + 1
+
+
+def describe_movements(trajectory):
+    """Movement of every moving station along a trajectory (Domain1→Domain3)
+
+    Random models have no fixed route, so their stations are described by
+    the model's name.
+    """
+    if trajectory not in TRAJECTORIES:
+        return {station: trajectory for station in STATION_TARGETS}
+    return {
+        station: f"Domain{domain_of(start)}→Domain{domain_of(stop)}"
+        for station, (start, stop) in TRAJECTORIES[trajectory].items()
+    }
+
+
+def write_manifest(tests_dir, trajectory, reports=None):
+    """Write tests/manifest.json for graph.py
+
+    It records the trajectory and the movement of every moving station and,
+    if given, the report list ([{"phase", "protocol", "station", "file"}])
+    that replaces discovering reports by their file names.
+    """
+    manifest = {"trajectory": trajectory, "movements": describe_movements(trajectory)}
+    if reports is not None:
+        manifest["reports"] = reports
+    with open(os.path.join(tests_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def start_sampler(net, tests_dir):
+    """Start recording the association/RSSI timeline of the moving stations"""
+    sampler = AssociationSampler(
+        [get_node(net, station) for station in STATION_TARGETS],
+        [get_node(net, ap) for ap in ACCESS_POINTS],
+        label=INSTANCE.logical,
     )
+    sampler.start(tests_dir, "mobility")
+    return sampler
 
-    info("*** Baseline tests running (60 seconds)...\n")
-    time.sleep(65)
 
-    info("*** Baseline tests completed!\n")
+def wait_for_network(net):
+    """Wait until every switch is connected to its controller"""
+    info("*** Waiting for network to stabilize\n")
+    if not net.waitConnected(timeout=STABILIZE_TIMEOUT):
+        info("*** Warning: not all switches connected, continuing anyway\n")
+
+
+def run_phase(net, servers, participants, tests_dir, udp_rate, label, trajectory=None):
+    """Run ICMP, TCP and UDP clients for every participant at the same time
+
+    participants are (node, station, group) tuples: the node sends to the
+    server host of station (see STATION_TARGETS) and reports to
+    <group>_<protocol>_<node>. With a trajectory, the stations of
+    STATION_TARGETS move along it while the clients run.
+    """
+    info("*** Reserving iperf servers on hosts\n")
+    ports = {}
+    for name, station, _ in participants:
+        host = get_node(net, STATION_TARGETS[station][0])
+        ports[name] = (servers.acquire(host, "tcp"), servers.acquire(host, "udp"))
+    servers.wait_ready()
+
+    player = sampler = None
+    if trajectory is not None:
+        info("*** Starting Mobility!\n")
+        player = start_mobility(net, tests_dir, trajectory)
+        sampler = start_sampler(net, tests_dir)
+
+    info(f"*** {label} Test: ICMP, TCP and UDP Traffic\n")
+    # Kept on the network so that reset_network() can stop the clients of
+    # an aborted phase
+    clients = net.clients = JobSupervisor()
+    for name, station, group in participants:
+        node = get_node(net, name)
+        server_ip = target_ip(station)
+        tcp, udp = ports[name]
+        commands = {
+            "icmp": f"ping -c {TEST_DURATION * 2} -i 0.5 {server_ip}",
+            "tcp": f"iperf -c {server_ip} -p {tcp} -t {TEST_DURATION} -i 1 "
+            f"{IPERF_FLAGS}",
+            "udp": f"iperf -c {server_ip} -p {udp} -u -b {udp_rate} "
+            f"-t {TEST_DURATION} -i 1 {IPERF_FLAGS}",
+        }
+        for protocol, command in commands.items():
+            clients.start(node, command, report_path(tests_dir, group, protocol, name))
+
+    info(f"*** {label} tests running ({TEST_DURATION} seconds)...\n")
+    wait_for_clients(clients, label)
+    if sampler is not None:
+        sampler.stop()
+    if player is not None:
+        player.stop()
+
+    info(f"*** {label} tests completed!\n")
+
+    # Return the servers to the pool
+    for tcp, udp in ports.values():
+        servers.release(tcp, udp)
+
+
+def run_baseline_tests(net, servers, tests_dir="./tests", udp_rate=UDP_RATE):
+    """Run tests WITHOUT mobility to establish baseline performance"""
 
-    # Kill iperf servers
-    c1_h1.cmd("pkill -9 iperf")
-    c2_h1.cmd("pkill -9 iperf")
-    c3_h1.cmd("pkill -9 iperf")
-    time.sleep(2)
+    info("*** BASELINE TEST (NO MOBILITY) ***\n")
+    participants = [(station, station, "baseline") for station in STATION_TARGETS]
+    run_phase(net, servers, participants, tests_dir, udp_rate, "Baseline")
 
 
-def run_mobility_tests(net):
+def run_mobility_tests(
+    net, servers, tests_dir="./tests", udp_rate=UDP_RATE, trajectory=TRAJECTORY
+):
     """Run tests WITH mobility to measure impact on performance"""
 
     info("*** MOBILITY TEST (WITH MOBILITY) ***\n")
-    info("*** Waiting for network to stabilize\n")
-    time.sleep(5)
-
-    # Get nodes
-    sta1 = net.get("sta1")
-    sta2 = net.get("sta2")
-    sta3 = net.get("sta3")
-    c1_h1 = net.get("c1_h1")
-    c2_h1 = net.get("c2_h1")
-    c3_h1 = net.get("c3_h1")
-
-    info("*** Starting iperf servers on hosts\n")
-    # Start TCP servers
-    c1_h1.cmd("iperf -s -p 5001 > /dev/null 2>&1 &")
-    c2_h1.cmd("iperf -s -p 5002 > /dev/null 2>&1 &")
-    c3_h1.cmd("iperf -s -p 5003 > /dev/null 2>&1 &")
-
-    # Start UDP servers
-    c1_h1.cmd("iperf -s -u -p 5101 > /dev/null 2>&1 &")
-    c2_h1.cmd("iperf -s -u -p 5102 > /dev/null 2>&1 &")
-    c3_h1.cmd("iperf -s -u -p 5103 > /dev/null 2>&1 &")
-
-    time.sleep(2)
-
-    info("*** Starting Mobility!\n")
-    # Start mobility
-    net.startMobility(time=0)
-
-    # sta1: Domain1 -> Domain3 (moves across all domains)
-    net.mobility(sta1, "start", time=1, position="10,30,0")
-    net.mobility(sta1, "stop", time=60, position="50,30,0")
-
-    # sta2: Domain2 -> Domain3
-    net.mobility(sta2, "start", time=1, position="30,30,0")
-    net.mobility(sta2, "stop", time=60, position="50,25,0")
-
-    # sta3: Domain3 -> Domain1
-    net.mobility(sta3, "start", time=1, position="50,30,0")
-    net.mobility(sta3, "stop", time=60, position="10,25,0")
-
-    net.stopMobility(time=61)
-
-    info("*** Mobility Test: ICMP Traffic (With Mobility)\n")
-    # ICMP tests - 60 seconds
-    sta1.cmd("ping -c 120 -i 0.5 10.0.0.1 > ./tests/mobility_icmp_sta1.txt &")
-    sta2.cmd("ping -c 120 -i 0.5 10.0.0.5 > ./tests/mobility_icmp_sta2.txt &")
-    sta3.cmd("ping -c 120 -i 0.5 10.0.0.9 > ./tests/mobility_icmp_sta3.txt &")
-
-    info("*** Mobility Test: TCP Traffic (With Mobility)\n")
-    # TCP tests - 60 seconds
-    sta1.cmd("iperf -c 10.0.0.1 -p 5001 -t 60 -i 1 > ./tests/mobility_tcp_sta1.txt &")
-    sta2.cmd("iperf -c 10.0.0.5 -p 5002 -t 60 -i 1 > ./tests/mobility_tcp_sta2.txt &")
-    sta3.cmd("iperf -c 10.0.0.9 -p 5003 -t 60 -i 1 > ./tests/mobility_tcp_sta3.txt &")
-
-    info("*** Mobility Test: UDP Traffic (With Mobility)\n")
-    # UDP tests - 60 seconds
-    sta1.cmd(
-        "iperf -c 10.0.0.1 -p 5101 -u -b 10M -t 60 -i 1 > ./tests/mobility_udp_sta1.txt &"
-    )
-    sta2.cmd(
-        "iperf -c 10.0.0.5 -p 5102 -u -b 10M -t 60 -i 1 > ./tests/mobility_udp_sta2.txt &"
-    )
-    sta3.cmd(
-        "iperf -c 10.0.0.9 -p 5103 -u -b 10M -t 60 -i 1 > ./tests/mobility_udp_sta3.txt &"
-    )
-
-    info("*** Mobility tests running (60 seconds)...\n")
-    info("*** Stations are moving between domains!\n")
-    time.sleep(65)
-
-    info("*** Mobility tests completed!\n")
-
-    # Kill iperf servers
-    c1_h1.cmd("pkill -9 iperf")
-    c2_h1.cmd("pkill -9 iperf")
-    c3_h1.cmd("pkill -9 iperf")
-
-
-def topology():
+    wait_for_network(net)
+    participants = [(station, station, "mobility") for station in STATION_TARGETS]
+    run_phase(net, servers, participants, tests_dir, udp_rate, "Mobility", trajectory)
+
+
+def run_concurrent_tests(
+    net, servers, tests_dir="./tests", udp_rate=UDP_RATE, trajectory=TRAJECTORY
+):
+    """Measure moving stations and their static control twins in one phase
+
+    sta1-sta3 move along the trajectory while sta4-sta6 stay put, all
+    running the same traffic at the same time. The reports of
+    tests/manifest.json map the control group to the "baseline" phase of
+    its twin, so graph.py compares the two groups station by station.
+    """
+
+    info("*** CONCURRENT TEST (CONTROL GROUP + MOBILITY) ***\n")
+    wait_for_network(net)
+
+    participants = [(station, station, "mobility") for station in STATION_TARGETS]
+    participants += [
+        (twin, station, "control") for twin, (station, _) in CONTROL_STATIONS.items()
+    ]
+
+    reports = [
+        {
+            "phase": "baseline" if group == "control" else group,
+            "protocol": protocol,
+            "station": station,
+            "file": os.path.basename(report_path(tests_dir, group, protocol, name)),
+        }
+        for name, station, group in participants
+        for protocol in ("icmp", "tcp", "udp")
+    ]
+    write_manifest(tests_dir, trajectory, reports)
+
+    run_phase(net, servers, participants, tests_dir, udp_rate, "Concurrent", trajectory)
+
+
+def build_network(
+    exp=PROPAGATION_EXP, ap_range=AP_RANGE, control_stations=False, controller_ip=HOST
+):
+    """Build and start the 3-domain network, wait until it is connected
+
+    With control_stations, static twins sta4-sta6 are added for concurrent
+    runs. Datapaths of domain N get DPIDs 0xN1 (s1), 0xN2 (s2) and 0xN3
+    (ap1), shifted by the instance index (see Project/mininet/instance.py).
+    """
     info("*** Starting network\n")
     net = Mininet_wifi(autoSetMacs=True)
+    net.radio = {"exp": exp, "ap_range": ap_range}
 
     info("*** Creating Controllers\n")
-    c1 = net.addController("c1", controller=RemoteController, ip=HOST, port=PORTS[0])
-    c2 = net.addController("c2", controller=RemoteController, ip=HOST, port=PORTS[1])
-    c3 = net.addController("c3", controller=RemoteController, ip=HOST, port=PORTS[2])
+    c1, c2, c3 = [
+        net.addController(
+            INSTANCE.name(f"c{domain}"),
+            controller=RemoteController,
+            ip=controller_ip,
+            port=INSTANCE.port(port),
+        )
+        for domain, port in enumerate(PORTS, 1)
+    ]
 
     info("*** Creating Domain 1\n")
     c1_ap1 = net.addAccessPoint(
-        "c1_ap1",
-        ssid="domain1",
+        INSTANCE.name("c1_ap1"),
+        ssid=INSTANCE.name("domain1"),
         mode="g",
-        channel="1",
-        position="10,30,0",
-        range=120,
+        channel=str(ACCESS_POINTS["c1_ap1"][1]),
+        position=ACCESS_POINTS["c1_ap1"][0],
+        range=ap_range,
+        dpid=INSTANCE.dpid(0x13),
     )
-    c1_s1 = net.addSwitch("c1_s1")
-    c1_s2 = net.addSwitch("c1_s2")
-    c1_h1 = net.addHost("c1_h1", ip="10.0.0.1/24")
-    c1_h2 = net.addHost("c1_h2", ip="10.0.0.2/24")
+    c1_s1 = net.addSwitch(INSTANCE.name("c1_s1"), dpid=INSTANCE.dpid(0x11))
+    c1_s2 = net.addSwitch(INSTANCE.name("c1_s2"), dpid=INSTANCE.dpid(0x12))
+    c1_h1 = net.addHost(INSTANCE.name("c1_h1"), ip=INSTANCE.address("10.0.0.1/24"))
+    c1_h2 = net.addHost(INSTANCE.name("c1_h2"), ip=INSTANCE.address("10.0.0.2/24"))
 
     info("*** Creating Domain 2\n")
     c2_ap1 = net.addAccessPoint(
-        "c2_ap1",
-        ssid="domain2",
+        INSTANCE.name("c2_ap1"),
+        ssid=INSTANCE.name("domain2"),
         mode="g",
-        channel="6",
-        position="30,30,0",
-        range=120,
+        channel=str(ACCESS_POINTS["c2_ap1"][1]),
+        position=ACCESS_POINTS["c2_ap1"][0],
+        range=ap_range,
+        dpid=INSTANCE.dpid(0x23),
     )
-    c2_s1 = net.addSwitch("c2_s1")
-    c2_s2 = net.addSwitch("c2_s2")
-    c2_h1 = net.addHost("c2_h1", ip="10.0.0.5/24")
-    c2_h2 = net.addHost("c2_h2", ip="10.0.0.6/24")
+    c2_s1 = net.addSwitch(INSTANCE.name("c2_s1"), dpid=INSTANCE.dpid(0x21))
+    c2_s2 = net.addSwitch(INSTANCE.name("c2_s2"), dpid=INSTANCE.dpid(0x22))
+    c2_h1 = net.addHost(INSTANCE.name("c2_h1"), ip=INSTANCE.address("10.0.0.5/24"))
+    c2_h2 = net.addHost(INSTANCE.name("c2_h2"), ip=INSTANCE.address("10.0.0.6/24"))
 
     info("*** Creating Domain 3\n")
     c3_ap1 = net.addAccessPoint(
-        "c3_ap1",
-        ssid="domain3",
+        INSTANCE.name("c3_ap1"),
+        ssid=INSTANCE.name("domain3"),
         mode="g",
-        channel="11",
-        position="50,30,0",
-        range=120,
+        channel=str(ACCESS_POINTS["c3_ap1"][1]),
+        position=ACCESS_POINTS["c3_ap1"][0],
+        range=ap_range,
+        dpid=INSTANCE.dpid(0x33),
     )
-    c3_s1 = net.addSwitch("c3_s1")
-    c3_s2 = net.addSwitch("c3_s2")
-    c3_h1 = net.addHost("c3_h1", ip="10.0.0.9/24")
-    c3_h2 = net.addHost("c3_h2", ip="10.0.0.10/24")
-
-    sta1 = net.addStation("sta1", ip="10.0.0.13/24", position="10,30,0")
-    sta2 = net.addStation("sta2", ip="10.0.0.14/24", position="30,30,0")
-    sta3 = net.addStation("sta3", ip="10.0.0.15/24", position="50,30,0")
+    c3_s1 = net.addSwitch(INSTANCE.name("c3_s1"), dpid=INSTANCE.dpid(0x31))
+    c3_s2 = net.addSwitch(INSTANCE.name("c3_s2"), dpid=INSTANCE.dpid(0x32))
+    c3_h1 = net.addHost(INSTANCE.name("c3_h1"), ip=INSTANCE.address("10.0.0.9/24"))
+    c3_h2 = net.addHost(INSTANCE.name("c3_h2"), ip=INSTANCE.address("10.0.0.10/24"))
+
+    sta1 = net.addStation(
+        INSTANCE.name("sta1"),
+        ip=INSTANCE.address("10.0.0.13/24"),
+        position=STATION_POSITIONS["sta1"],
+    )
+    sta2 = net.addStation(
+        INSTANCE.name("sta2"),
+        ip=INSTANCE.address("10.0.0.14/24"),
+        position=STATION_POSITIONS["sta2"],
+    )
+    sta3 = net.addStation(
+        INSTANCE.name("sta3"),
+        ip=INSTANCE.address("10.0.0.15/24"),
+        position=STATION_POSITIONS["sta3"],
+    )
+    twins = CONTROL_STATIONS if control_stations else {}
+    for twin, (station, ip) in twins.items():
+        net.addStation(
+            INSTANCE.name(twin),
+            ip=INSTANCE.address(ip),
+            position=STATION_POSITIONS[station],
+        )
 
     info("*** Configuring Propagation Model\n")
-    net.setPropagationModel(model="logDistance", exp=3)
+    net.setPropagationModel(model="logDistance", exp=exp)
 
     info("*** Configuring WiFi nodes\n")
     net.configureNodes()
@@ -222,6 +473,8 @@ def topology():
     net.addLink(sta1, c1_ap1)
     net.addLink(sta2, c2_ap1)
     net.addLink(sta3, c3_ap1)
+    for twin, (station, _) in twins.items():
+        net.addLink(get_node(net, twin), get_node(net, STATION_TARGETS[station][2]))
 
     info("*** Creating Domain 1 Internal Links\n")
     net.addLink(c1_ap1, c1_s1)
@@ -247,21 +500,7 @@ def topology():
 
     info("*** Enabling mobility\n")
     net.plotGraph(max_x=100, max_y=100)
-
-    net.startMobility(time=0)
-    # sta1: starts at domain1, moves through domain2, ends at domain3
-    net.mobility(sta1, "start", time=1, position="10,20,0")
-    net.mobility(sta1, "stop", time=60, position="50,20,0")
-
-    # sta2: starts at domain2, moves to domain3
-    net.mobility(sta2, "start", time=1, position="30,20,0")
-    net.mobility(sta2, "stop", time=60, position="50,25,0")
-
-    # sta3: starts at domain3, moves to domain1
-    net.mobility(sta3, "start", time=1, position="50,20,0")
-    net.mobility(sta3, "stop", time=60, position="10,25,0")
-
-    net.stopMobility(time=61)
+    # Stations only move in the mobility phase (see start_mobility)
 
     info("*** Building network\n")
     net.build()
@@ -283,38 +522,218 @@ def topology():
     c3_s2.start([c3])
     c3_ap1.start([c3])
 
-    # info("*** Starting CLI\n")
-    # CLI(net)
+    wait_for_network(net)
+    return net
+
+
+def reset_stations(net):
+    """Move stations back to their initial positions between runs"""
+    for station, position in STATION_POSITIONS.items():
+        get_node(net, station).setPosition(position)
+    for twin, (station, _) in CONTROL_STATIONS.items():
+        if INSTANCE.name(twin) in net:
+            get_node(net, twin).setPosition(STATION_POSITIONS[station])
+
+
+def clear_flows(net):
+    """Delete every flow entry on switches and APs; the controllers reinstall them
+
+    del-flows also removes the table-miss entry an OpenFlow 1.3 controller
+    installs at the handshake, and the switches stay connected, so it is
+    restored here for the reactive controllers to see new flows again.
+    """
+    datapaths = {node.name: node for node in net.switches + net.aps}
+    run_batch(
+        {
+            node: [
+                f"ovs-ofctl del-flows {name}",
+                f"ovs-ofctl add-flow {name} {TABLE_MISS_FLOW}",
+            ]
+            for name, node in datapaths.items()
+        }
+    )
+
 
-    info("*** Waiting for network to stabilize\n")
-    time.sleep(5)
+def reset_network(net, servers=None):
+    """Return a built network to its initial state without stop()/build()
+
+    Clients left running by an aborted phase of this run are stopped, flow
+    tables are cleared, stations go back to their initial positions and the
+    servers of the pool are restarted.
+    """
+    start = time.monotonic()
+    info("*** Resetting network\n")
+    clients = getattr(net, "clients", None)
+    if clients is not None:
+        clients.stop()
+    clear_flows(net)
+    reset_stations(net)
+    wait_for_network(net)
+    if servers is not None:
+        servers.restart()
+    info(f"*** Network reset in {time.monotonic() - start:.1f}s\n")
+
+
+def run_experiment(
+    net,
+    tests_dir="./tests",
+    udp_rate=UDP_RATE,
+    trajectory=TRAJECTORY,
+    servers=None,
+    concurrent=False,
+):
+    """Run the baseline and mobility phases on a built network
+
+    Both phases share the iperf servers of the pool; a pool is created (and
+    stopped afterwards) if none is given. With concurrent, the control group
+    and the moving stations are measured in a single phase instead (the
+    network must have been built with control_stations).
+    """
+    os.makedirs(tests_dir, exist_ok=True)
+    own_servers = servers is None
+    if own_servers:
+        servers = IperfServerPool(port_offset=INSTANCE.port_offset)
 
     info("\n" + "=" * 70 + "\n")
     info("*** STARTING AUTOMATED TESTS ***\n")
     info("=" * 70 + "\n\n")
 
+    if concurrent:
+        info("*** Phase 1/1: Running control group and mobility tests together...\n")
+        run_concurrent_tests(net, servers, tests_dir, udp_rate, trajectory)
+    else:
+        run_sequential_tests(net, servers, tests_dir, udp_rate, trajectory)
+
+    info("\n" + "=" * 70 + "\n")
+    info("*** ALL TESTS COMPLETED! ***\n")
+    info(f"*** Results saved in {tests_dir}/ directory\n")
+    run_dir = os.path.dirname(os.path.normpath(tests_dir))
+    info(f"*** Run graph.py {run_dir or '.'} to generate comparison graphs\n")
+    info("=" * 70 + "\n\n")
+
+    if own_servers:
+        servers.stop()
+
+
+def run_sequential_tests(net, servers, tests_dir, udp_rate, trajectory):
+    """Run the baseline phase, then the mobility phase"""
+    # Also replaces a manifest left by a concurrent run, whose report list
+    # would hide the new reports
+    write_manifest(tests_dir, trajectory)
+
     # Run baseline tests (no mobility)
     info("*** Phase 1/2: Running baseline tests (NO mobility)...\n")
-    run_baseline_tests(net)
+    run_baseline_tests(net, servers, tests_dir, udp_rate)
 
     info("\n" + "=" * 70 + "\n")
     info("*** Baseline tests complete! Preparing for mobility tests...\n")
     info("=" * 70 + "\n\n")
-    time.sleep(3)
 
     # Run mobility tests
     info("*** Phase 2/2: Running mobility tests (WITH mobility)...\n")
-    run_mobility_tests(net)
-
-    info("\n" + "=" * 70 + "\n")
-    info("*** ALL TESTS COMPLETED! ***\n")
-    info("*** Results saved in ./tests/ directory\n")
-    info("*** Run plot_results.py to generate comparison graphs\n")
-    info("=" * 70 + "\n\n")
-
-    net.stop()
+    run_mobility_tests(net, servers, tests_dir, udp_rate, trajectory)
+
+
+def topology(
+    output_dir="./runs",
+    name=None,
+    exp=PROPAGATION_EXP,
+    ap_range=AP_RANGE,
+    udp_rate=UDP_RATE,
+    trajectory=TRAJECTORY,
+    concurrent=False,
+    controller_ip=HOST,
+):
+    """Build the network and run one experiment into a new run directory"""
+    run_dir = runs.new_run_dir(output_dir, name)
+    info(f"*** Writing results to {run_dir}\n")
+    started = time.time()
+    params = {
+        "exp": exp,
+        "ap_range": ap_range,
+        "udp_rate": udp_rate,
+        "trajectory": trajectory,
+    }
+    net = build_network(
+        exp, ap_range, control_stations=concurrent, controller_ip=controller_ip
+    )
+    try:
+        run_experiment(
+            net,
+            os.path.join(run_dir, "tests"),
+            udp_rate,
+            trajectory,
+            concurrent=concurrent,
+        )
+        runs.write_run_file(
+            run_dir,
+            os.path.basename(run_dir),
+            params,
+            started,
+            net,
+            concurrent=concurrent,
+            instance=INSTANCE.describe(),
+        )
+    finally:
+        net.stop()
+    return run_dir
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baseline vs mobility wifi experiment")
+    parser.add_argument(
+        "--output",
+        default="./runs",
+        help="Directory receiving one timestamped directory per run (default: ./runs)",
+    )
+    parser.add_argument(
+        "--name", help="Run directory name (default: the start time, YYYYmmdd-HHMMSS)"
+    )
+    parser.add_argument(
+        "--exp",
+        type=float,
+        default=PROPAGATION_EXP,
+        help=f"logDistance propagation exponent (default: {PROPAGATION_EXP})",
+    )
+    parser.add_argument(
+        "--ap-range",
+        type=float,
+        default=AP_RANGE,
+        help=f"Access point range (default: {AP_RANGE})",
+    )
+    parser.add_argument(
+        "--udp-rate",
+        default=UDP_RATE,
+        help=f"UDP client rate, iperf -b (default: {UDP_RATE})",
+    )
+    parser.add_argument(
+        "--trajectory",
+        choices=sorted(TRAJECTORIES) + sorted(MOBILITY_MODELS),
+        default=TRAJECTORY,
+        help=f"Mobility phase trajectory (default: {TRAJECTORY})",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Measure static control twins and moving stations in one phase",
+    )
+    parser.add_argument(
+        "--controller-ip",
+        default=HOST,
+        help=f"Address of the domain controllers (default: {HOST})",
+    )
+    add_instance_args(parser)
+    args = parser.parse_args()
+
     setLogLevel("info")
-    topology()
+    use_instance(Instance.from_args(args))
+    topology(
+        args.output,
+        args.name,
+        args.exp,
+        args.ap_range,
+        args.udp_rate,
+        args.trajectory,
+        args.concurrent,
+        args.controller_ip,
+    )
@@ -1,658 +1,965 @@
 #!/usr/bin/python
 
+import matplotlib
+
+matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 import re
 import os
+import argparse
+import json
+import time
 import numpy as np
-
-# Create graphs directory if it doesn't exist
-if not os.path.exists("./graphs"):
-    os.makedirs("./graphs")
-
-
-def parse_ping_results(filename):
-    """Parse ping results for latency and packet loss analysis"""
+import functools
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+import handovers
+import runs
+import stats
+
+# Bump whenever a parser's output changes so stale .npz caches are rebuilt
+PARSER_VERSION = 2
+CACHE_DIR_NAME = ".cache"
+MANIFEST_NAME = "manifest.json"
+BUILD_STATE_NAME = "build.json"
+
+# Experiment matrix defaults; phases and stations themselves are discovered
+REFERENCE_PHASE = "baseline"
+PHASE_LABELS = {"baseline": "Baseline", "mobility": "With Mobility"}
+PHASE_COLORS = {"baseline": "green", "mobility": "red"}
+EXTRA_PHASE_COLORS = ["tab:blue", "tab:orange", "tab:purple", "tab:brown", "tab:cyan"]
+# Movements of runs whose manifest.json does not record them
+MOVEMENTS = {
+    "sta1": "Domain1→Domain3",
+    "sta2": "Domain2→Domain3",
+    "sta3": "Domain3→Domain1",
+}
+STATIONS_PER_PAGE = 6
+
+# Metrics plotted over time, on which recorded handovers are overlaid
+HANDOVER_METRICS = ["tcp", "udp", "jitter"]
+
+# Series longer than this are min/max-decimated to the subplot's pixel width
+MAX_PLOT_POINTS = 5000
+
+# Per-metric plot settings
+METRICS = {
+    "icmp": {
+        "protocol": "icmp",
+        "title": "ICMP Latency",
+        "xlabel": "Packet Sequence",
+        "ylabel": "Latency (ms)",
+        "avg_label": "Avg: {:.2f}ms",
+        "marker": "o",
+        "markersize": 2,
+        "linewidth": 1,
+    },
+    "tcp": {
+        "protocol": "tcp",
+        "title": "TCP Throughput",
+        "xlabel": "Time (seconds)",
+        "ylabel": "Throughput (Mbits/sec)",
+        "avg_label": "Avg: {:.2f} Mbps",
+        "marker": "s",
+        "markersize": 4,
+        "linewidth": 1.5,
+    },
+    "udp": {
+        "protocol": "udp",
+        "title": "UDP Throughput",
+        "xlabel": "Time (seconds)",
+        "ylabel": "Throughput (Mbits/sec)",
+        "avg_label": "Avg: {:.2f} Mbps",
+        "marker": "^",
+        "markersize": 4,
+        "linewidth": 1.5,
+    },
+    "jitter": {
+        "protocol": "udp",
+        "title": "UDP Jitter",
+        "xlabel": "Time (seconds)",
+        "ylabel": "Jitter (ms)",
+        "avg_label": "Avg: {:.2f}ms",
+        "marker": "d",
+        "markersize": 4,
+        "linewidth": 1.5,
+    },
+}
+SUMMARY_PANELS = [
+    ("icmp", "Average Latency (ms)"),
+    ("tcp", "Average Throughput (Mbps)"),
+    ("udp", "Average Throughput (Mbps)"),
+]
+
+# In-process memo: (parser, path) -> (cache key, parsed result)
+_parsed_reports = {}
+
+# In-process memo: (path, mtime, size) -> content hash
+_content_hashes = {}
+
+
+# Interval lines of an iperf report, e.g.
+#   [  1] 0.0000-1.0000 sec  1.25 MBytes  10.5 Mbits/sec
+#   [  1] 8.0000-9.0000 sec  0.000 Bytes  0.000 bits/sec
+# UDP server reports additionally carry jitter and lost/total datagrams:
+#   [  1] 0.0000-61.6666 sec  58.7 MBytes  7.99 Mbits/sec   0.609 ms 11611/53502 (22%)
+# The trailing group captures the rest of the line (iperf3 sender/receiver tags).
+IPERF_INTERVAL_RE = re.compile(
+    r"^\[[^\]\n]*\]\s+(\d+\.\d+)-\s*(\d+\.\d+)\s+sec"
+    r"\s+\S+\s+\w*Bytes\s+(\d+\.?\d*)\s+([MKG]?)bits/sec"
+    r"(?:\s+(\d+\.?\d*)\s+ms\s+(\d+)/\s*(\d+)\s+\()?"
+    r"(.*)",
+    re.MULTILINE,
+)
+
+# Report file names: <phase>_<protocol>_<station>.<format>, where iperf
+# reports may also be iperf -y C (.csv) or iperf3 -J (.json) output
+REPORT_NAME_RE = re.compile(
+    r"^(?P<phase>[A-Za-z0-9-]+)_(?P<protocol>icmp|tcp|udp)_(?P<station>\w+)"
+    r"\.(?P<format>txt|csv|json)$"
+)
+
+# Fields of an iperf -y C line (UDP server reports append jitter and loss)
+IPERF_CSV_INTERVAL = 6
+IPERF_CSV_BITS_PER_SECOND = 8
+IPERF_CSV_JITTER = 9
+IPERF_CSV_LOST = 10
+IPERF_CSV_TOTAL = 11
+
+# Reply lines and the statistics footer of a ping report
+PING_REPORT_RE = re.compile(
+    r"time=(\d+\.?\d*)"
+    r"|(\d+) packets transmitted, (\d+) received.*?(\d+)% packet loss"
+)
+
+
+def read_report(filename):
+    """Read a raw test report, or None if it does not exist"""
     if not os.path.exists(filename):
         print(f"Warning: {filename} not found")
-        return [], 0, 0
+        return None
 
     with open(filename, "r") as f:
-        content = f.read()
+        return f.read()
 
-    # Extract RTT values (time=X.XX ms)
-    rtts = re.findall(r"time=(\d+\.?\d*)", content)
-    rtts = [float(rtt) for rtt in rtts]
 
-    # Extract packet loss statistics
-    loss_match = re.search(r"(\d+)% packet loss", content)
-    packet_loss = float(loss_match.group(1)) if loss_match else 0
+def report_cache_key(filename, parser_name):
+    """Identify one parse of a report by path, mtime, size and parser version"""
+    stat = os.stat(filename)
+    return (
+        f"{os.path.abspath(filename)}|{stat.st_mtime_ns}|{stat.st_size}"
+        f"|{parser_name}|v{PARSER_VERSION}"
+    )
 
-    # Extract transmitted and received packets
-    packets_match = re.search(r"(\d+) packets transmitted, (\d+) received", content)
-    transmitted = int(packets_match.group(1)) if packets_match else 0
-    received = int(packets_match.group(2)) if packets_match else 0
 
-    return rtts, packet_loss, (transmitted, received)
+def load_cached_report(cache_file, key):
+    """Load a parsed report from an .npz cache file, or None if stale/missing"""
+    try:
+        with np.load(cache_file) as data:
+            if str(data["key"]) != key:
+                return None
+
+            result = []
+            for i, kind in enumerate(data["kinds"]):
+                column = data[f"arr_{i}"]
+                if kind == "tuple":
+                    column = tuple(column.tolist())
+                elif kind == "scalar":
+                    column = column.item()
+                result.append(column)
+            return tuple(result)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_cached_report(cache_file, key, result):
+    """Write a parsed report to an .npz cache file (best effort, atomic)"""
+    kinds = [
+        (
+            "array"
+            if isinstance(column, np.ndarray)
+            else "tuple" if isinstance(column, tuple) else "scalar"
+        )
+        for column in result
+    ]
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(
+                f,
+                *[np.asarray(column) for column in result],
+                key=np.array(key),
+                kinds=np.array(kinds),
+            )
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_file}: {e}")
 
 
-def parse_iperf_tcp_results(filename):
-    """Parse iperf TCP results for throughput analysis"""
-    if not os.path.exists(filename):
-        print(f"Warning: {filename} not found")
-        return [], []
+def cached_report(parse):
+    """Memoize a report parser in-process and on disk under <dir>/.cache"""
 
-    with open(filename, "r") as f:
-        lines = f.readlines()
+    @functools.wraps(parse)
+    def wrapper(filename):
+        if not os.path.exists(filename):
+            return parse(filename)
 
-    data_points = []
+        key = report_cache_key(filename, parse.__name__)
+        memo_key = (parse.__name__, os.path.abspath(filename))
+        memo = _parsed_reports.get(memo_key)
+        if memo is not None and memo[0] == key:
+            return memo[1]
 
-    for line in lines:
-        # Skip summary lines (they contain different format)
-        if "sender" in line.lower() or "receiver" in line.lower():
-            continue
+        cache_file = os.path.join(
+            os.path.dirname(filename),
+            CACHE_DIR_NAME,
+            f"{os.path.basename(filename)}.{parse.__name__}.npz",
+        )
+        result = load_cached_report(cache_file, key)
+        if result is None:
+            result = parse(filename)
+            save_cached_report(cache_file, key, result)
 
-        if re.search(r"\d+\.\d+-\s*\d+\.\d+\s+sec", line) and "bits/sec" in line:
-            # Extract time interval
-            time_match = re.search(r"(\d+\.\d+)-\s*(\d+\.\d+)\s+sec", line)
+        _parsed_reports[memo_key] = (key, result)
+        return result
 
-            # Extract throughput
-            throughput_match = re.search(r"(\d+\.?\d*)\s+([MKG])bits/sec", line)
+    return wrapper
 
-            # Only add if both time and throughput are found
-            if time_match and throughput_match:
-                time_end = float(time_match.group(2))
-                value = float(throughput_match.group(1))
-                unit = throughput_match.group(2)
 
-                # Convert to Mbits/sec
-                if unit == "K":
-                    value /= 1000
-                elif unit == "G":
-                    value *= 1000
+def split_columns(matches):
+    """Transpose findall() tuples into one list per regex group"""
+    if not matches:
+        return []
+    return [list(map(itemgetter(i), matches)) for i in range(len(matches[0]))]
 
-                data_points.append((time_end, value))
 
-    # Separate into times and throughputs
-    if data_points:
-        times, throughputs = zip(*data_points)
-        return list(times), list(throughputs)
+def to_float_column(values):
+    """Convert matched strings to floats; unmatched optional groups become 0"""
+    return np.array([value or 0 for value in values], dtype=float)
 
-    return [], []
 
+def parse_ping_text(content):
+    """Parse the text of a ping report into RTTs, packet loss and packet counts"""
+    rtts, transmitted, received, packet_loss = split_columns(
+        PING_REPORT_RE.findall(content)
+    ) or ([], [], [], [])
 
-def parse_iperf_udp_results(filename):
-    """Parse iperf UDP results for throughput and jitter analysis"""
-    if not os.path.exists(filename):
-        print(f"Warning: {filename} not found")
-        return [], [], [], []
+    # Extract RTT values (time=X.XX ms)
+    rtts = np.array([rtt for rtt in rtts if rtt], dtype=float)
 
-    with open(filename, "r") as f:
-        lines = f.readlines()
+    # Extract the statistics footer (first one wins, as with re.search)
+    for tx, rx, loss in zip(transmitted, received, packet_loss):
+        if tx:
+            return rtts, float(loss), (int(tx), int(rx))
 
-    data_points = []
+    return rtts, 0, (0, 0)
 
-    for line in lines:
-        # Skip summary lines
-        if "sender" in line.lower() or "receiver" in line.lower():
-            continue
 
-        if re.search(r"\d+\.\d+-\s*\d+\.\d+\s+sec", line) and "bits/sec" in line:
-            # Extract time interval
-            time_match = re.search(r"(\d+\.\d+)-\s*(\d+\.\d+)\s+sec", line)
+def parse_iperf_text(content):
+    """Parse iperf interval lines into time, throughput, jitter and loss arrays"""
+    # Skip summary lines
+    matches = [
+        match
+        for match in IPERF_INTERVAL_RE.findall(content)
+        if "sender" not in match[-1].lower() and "receiver" not in match[-1].lower()
+    ]
+    if not matches:
+        return tuple(np.empty(0) for _ in range(4))
+
+    _, time_end, value, unit, jitter, lost, total, _ = split_columns(matches)
+
+    # Convert to Mbits/sec
+    unit = np.array(unit)
+    throughputs = np.array(value, dtype=float)
+    throughputs[unit == "K"] /= 1000
+    throughputs[unit == "G"] *= 1000
+    throughputs[unit == ""] /= 1000000
+
+    lost = to_float_column(lost)
+    total = to_float_column(total)
+    return (
+        np.array(time_end, dtype=float),
+        throughputs,
+        to_float_column(jitter),
+        loss_percent(lost, total),
+    )
 
-            # Extract throughput
-            throughput_match = re.search(r"(\d+\.?\d*)\s+([MKG])bits/sec", line)
 
-            # Extract jitter (ms)
-            jitter_match = re.search(r"(\d+\.?\d*)\s+ms", line)
+def loss_percent(lost, total):
+    """Datagram loss in percent, 0 where no datagrams were counted"""
+    return np.divide(lost, total, out=np.zeros_like(lost), where=total > 0) * 100
+
+
+def parse_iperf_csv(content):
+    """Parse iperf -y C output into time, throughput, jitter and loss arrays"""
+    rows = [line.split(",") for line in content.splitlines() if line.count(",") >= 8]
+    if not rows:
+        return tuple(np.empty(0) for _ in range(4))
+
+    # Pad TCP/client lines to the width of UDP server reports
+    rows = [row + [""] * (IPERF_CSV_TOTAL + 1 - len(row)) for row in rows]
+    intervals, bits, jitter, lost, total = split_columns(
+        [
+            itemgetter(
+                IPERF_CSV_INTERVAL,
+                IPERF_CSV_BITS_PER_SECOND,
+                IPERF_CSV_JITTER,
+                IPERF_CSV_LOST,
+                IPERF_CSV_TOTAL,
+            )(row)
+            for row in rows
+        ]
+    )
 
-            # Extract packet loss (X/Y)
-            loss_match = re.search(r"(\d+)/\s*(\d+)\s+\(", line)
+    lost = to_float_column(lost)
+    total = to_float_column(total)
+    return (
+        np.array([interval.partition("-")[2] for interval in intervals], dtype=float),
+        np.array(bits, dtype=float) / 1000000,
+        to_float_column(jitter),
+        loss_percent(lost, total),
+    )
 
-            # Only add if we have time and throughput at minimum
-            if time_match and throughput_match:
-                time_end = float(time_match.group(2))
 
-                value = float(throughput_match.group(1))
-                unit = throughput_match.group(2)
-                if unit == "K":
-                    value /= 1000
-                elif unit == "G":
-                    value *= 1000
+def parse_iperf_json(content):
+    """Parse iperf3 -J output into time, throughput, jitter and loss arrays"""
+    try:
+        intervals = json.loads(content).get("intervals", [])
+    except ValueError:
+        # Incomplete document (iperf3 writes it only when the test ends)
+        intervals = []
+    sums = [interval["sum"] for interval in intervals]
+    return (
+        np.array([s["end"] for s in sums], dtype=float),
+        np.array([s["bits_per_second"] for s in sums], dtype=float) / 1000000,
+        np.array([s.get("jitter_ms", 0) for s in sums], dtype=float),
+        np.array([s.get("lost_percent", 0) for s in sums], dtype=float),
+    )
 
-                jitter = float(jitter_match.group(1)) if jitter_match else 0
 
-                if loss_match:
-                    lost = int(loss_match.group(1))
-                    total = int(loss_match.group(2))
-                    loss_percent = (lost / total * 100) if total > 0 else 0
-                else:
-                    loss_percent = 0
+def parse_iperf_content(filename, content):
+    """Parse iperf output in the format given by the report file extension"""
+    if filename.endswith(".csv"):
+        return parse_iperf_csv(content)
+    if filename.endswith(".json"):
+        return parse_iperf_json(content)
+    return parse_iperf_text(content)
 
-                data_points.append((time_end, value, jitter, loss_percent))
 
-    # Separate into individual lists
-    if data_points:
-        times, throughputs, jitters, packet_losses = zip(*data_points)
-        return list(times), list(throughputs), list(jitters), list(packet_losses)
+@cached_report
+def parse_ping_results(filename):
+    """Parse ping results for latency and packet loss analysis"""
+    content = read_report(filename)
+    if content is None:
+        return np.empty(0), 0, 0
+    return parse_ping_text(content)
+
+
+@cached_report
+def parse_iperf_results(filename):
+    """Parse iperf results into time, throughput, jitter and loss arrays"""
+    content = read_report(filename)
+    if content is None:
+        return tuple(np.empty(0) for _ in range(4))
+    return parse_iperf_content(filename, content)
+
+
+def report_parser(protocol):
+    """Pick the parser for a report protocol ("icmp", "tcp" or "udp")"""
+    return parse_ping_results if protocol == "icmp" else parse_iperf_results
+
+
+class ReportTail:
+    """Incrementally parse a growing report, keeping a byte offset into it"""
+
+    def __init__(self, filename, parser):
+        self.filename = filename
+        self.parser = parser
+        self.offset = 0
+        self.result = None
+        self.text = ""
+
+    def poll(self):
+        """Parse newly appended complete lines, return True if anything changed"""
+        if not os.path.exists(self.filename):
+            return False
+
+        size = os.path.getsize(self.filename)
+        if size < self.offset:
+            # File was truncated/rewritten by a new run: start over
+            self.offset = 0
+            self.result = None
+            self.text = ""
+        if size == self.offset:
+            return False
+
+        with open(self.filename, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+
+        # Only consume complete lines; a partial last line is picked up next poll
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return False
+        self.offset += end
+        self.result = self.merge(chunk[:end].decode(errors="replace"))
+
+        # Publish through the parse memo so the plot functions see the update
+        key = report_cache_key(self.filename, self.parser.__name__)
+        _parsed_reports[(self.parser.__name__, os.path.abspath(self.filename))] = (
+            key,
+            self.result,
+        )
+        return True
+
+    def merge(self, text):
+        """Parse a chunk of new lines and append it to the result so far"""
+        if self.parser is parse_ping_results:
+            rtts, loss, counts = parse_ping_text(text)
+            if self.result is None:
+                return rtts, loss, counts
+            old_rtts, old_loss, old_counts = self.result
+            if counts == (0, 0):
+                loss, counts = old_loss, old_counts
+            return np.concatenate([old_rtts, rtts]), loss, counts
+
+        if self.filename.endswith(".json"):
+            # A JSON report is one document: re-parse it whole
+            self.text += text
+            return parse_iperf_json(self.text)
+
+        columns = parse_iperf_content(self.filename, text)
+        if self.result is None:
+            return columns
+        return tuple(np.concatenate(pair) for pair in zip(self.result, columns))
 
-    return [], [], [], []
 
+def parse_iperf_tcp_results(filename):
+    """Parse iperf TCP results for throughput analysis"""
+    times, throughputs, _, _ = parse_iperf_results(filename)
+    return times, throughputs
 
-def plot_icmp_comparison():
-    """Compare ICMP latency: Baseline vs Mobility"""
-    fig, axes = plt.subplots(3, 2, figsize=(16, 12))
-    fig.suptitle(
-        "ICMP Latency: Baseline (No Mobility) vs Mobility Impact",
-        fontsize=16,
-        fontweight="bold",
+
+def parse_iperf_udp_results(filename):
+    """Parse iperf UDP results for throughput and jitter analysis"""
+    return parse_iperf_results(filename)
+
+
+def natural_key(name):
+    """Sort key that orders sta2 before sta10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def discover_reports(tests_dir):
+    """Find the (phase, protocol, station) -> report path matrix of an experiment
+
+    If tests_dir contains a manifest.json, its "reports" list
+    ([{"phase", "protocol", "station", "file"}, ...]) and "movements" map
+    ({"sta1": "Domain1→Domain3", ...}) are used; otherwise report files are
+    discovered by their <phase>_<protocol>_<station>.<format> names, and
+    runs without recorded movements get MOVEMENTS (the "cross" trajectory
+    every run used before movements were recorded).
+
+    Returns (reports, phases, stations, movements).
+    """
+    reports = {}
+    manifest = {}
+
+    manifest_file = os.path.join(tests_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+    movements = manifest.get("movements", MOVEMENTS)
+
+    if "reports" in manifest:
+        for entry in manifest["reports"]:
+            key = (entry["phase"], entry["protocol"], entry["station"])
+            reports[key] = os.path.join(tests_dir, entry["file"])
+    elif os.path.isdir(tests_dir):
+        for name in os.listdir(tests_dir):
+            match = REPORT_NAME_RE.match(name)
+            if match:
+                key = match.group("phase", "protocol", "station")
+                # Prefer machine-readable output over text for the same report
+                if key in reports and match.group("format") == "txt":
+                    continue
+                reports[key] = os.path.join(tests_dir, name)
+
+    # Reference phase first, then the rest in a stable order
+    phases = sorted(
+        {phase for phase, _, _ in reports},
+        key=lambda phase: (phase != REFERENCE_PHASE, natural_key(phase)),
     )
+    stations = sorted({station for _, _, station in reports}, key=natural_key)
+    return reports, phases, stations, movements
 
-    stations = [
-        ("sta1", "Domain1→Domain3"),
-        ("sta2", "Domain2→Domain3"),
-        ("sta3", "Domain3→Domain1"),
-    ]
 
-    for idx, (sta_name, movement) in enumerate(stations):
-        # Baseline
-        baseline_file = f"./tests/baseline_icmp_{sta_name}.txt"
-        baseline_rtts, baseline_loss, _ = parse_ping_results(baseline_file)
-
-        # Mobility
-        mobility_file = f"./tests/mobility_icmp_{sta_name}.txt"
-        mobility_rtts, mobility_loss, _ = parse_ping_results(mobility_file)
-
-        # Plot baseline
-        if baseline_rtts:
-            axes[idx, 0].plot(
-                baseline_rtts,
-                marker="o",
-                markersize=2,
-                linewidth=1,
-                color="green",
-                alpha=0.7,
-            )
-            axes[idx, 0].set_xlabel("Packet Sequence", fontsize=10)
-            axes[idx, 0].set_ylabel("Latency (ms)", fontsize=10)
-            axes[idx, 0].set_title(
-                f"{sta_name} - Baseline (No Mobility)\nLoss: {baseline_loss:.1f}%",
-                fontsize=11,
-            )
-            axes[idx, 0].grid(True, alpha=0.3)
-            avg = np.mean(baseline_rtts)
-            axes[idx, 0].axhline(
-                y=avg, color="r", linestyle="--", label=f"Avg: {avg:.2f}ms", alpha=0.7
-            )
-            axes[idx, 0].legend()
-
-        # Plot mobility
-        if mobility_rtts:
-            axes[idx, 1].plot(
-                mobility_rtts,
-                marker="o",
-                markersize=2,
-                linewidth=1,
-                color="red",
-                alpha=0.7,
-            )
-            axes[idx, 1].set_xlabel("Packet Sequence", fontsize=10)
-            axes[idx, 1].set_ylabel("Latency (ms)", fontsize=10)
-            axes[idx, 1].set_title(
-                f"{sta_name} - With Mobility ({movement})\nLoss: {mobility_loss:.1f}%",
-                fontsize=11,
-            )
-            axes[idx, 1].grid(True, alpha=0.3)
-            avg = np.mean(mobility_rtts)
-            axes[idx, 1].axhline(
-                y=avg, color="r", linestyle="--", label=f"Avg: {avg:.2f}ms", alpha=0.7
-            )
-            axes[idx, 1].legend()
+def phase_label(phase):
+    """Short label of a phase used in statistics and legends"""
+    return PHASE_LABELS.get(phase, phase.capitalize())
 
-    plt.tight_layout()
-    plt.savefig("./graphs/icmp_comparison.png", dpi=300, bbox_inches="tight")
-    print("✓ Generated: ./graphs/icmp_comparison.png")
-    plt.close()
 
+def phase_title(phase, movement=None):
+    """Subplot title suffix of a phase for one station"""
+    if phase == REFERENCE_PHASE:
+        return "Baseline (No Mobility)"
+    if phase == "mobility":
+        return f"With Mobility ({movement})" if movement else "With Mobility"
+    return phase_label(phase)
 
-def plot_tcp_comparison():
-    """Compare TCP throughput: Baseline vs Mobility"""
-    fig, axes = plt.subplots(3, 2, figsize=(16, 12))
-    fig.suptitle(
-        "TCP Throughput: Baseline (No Mobility) vs Mobility Impact",
-        fontsize=16,
-        fontweight="bold",
-    )
 
-    stations = [
-        ("sta1", "Domain1→Domain3"),
-        ("sta2", "Domain2→Domain3"),
-        ("sta3", "Domain3→Domain1"),
+def phase_color(phase, index):
+    """Plot color of a phase (baseline green, mobility red, others cycled)"""
+    if phase in PHASE_COLORS:
+        return PHASE_COLORS[phase]
+    return EXTRA_PHASE_COLORS[index % len(EXTRA_PHASE_COLORS)]
+
+
+def station_pages(stations, stations_per_page=STATIONS_PER_PAGE):
+    """Split stations into pages of small multiples"""
+    if not stations:
+        return [[]]
+    return [
+        stations[i : i + stations_per_page]
+        for i in range(0, len(stations), stations_per_page)
     ]
 
-    for idx, (sta_name, movement) in enumerate(stations):
-        # Baseline
-        baseline_file = f"./tests/baseline_tcp_{sta_name}.txt"
-        baseline_times, baseline_tp = parse_iperf_tcp_results(baseline_file)
-
-        # Mobility
-        mobility_file = f"./tests/mobility_tcp_{sta_name}.txt"
-        mobility_times, mobility_tp = parse_iperf_tcp_results(mobility_file)
-
-        # Plot baseline
-        if baseline_tp:
-            axes[idx, 0].plot(
-                baseline_times,
-                baseline_tp,
-                marker="s",
-                markersize=4,
-                linewidth=1.5,
-                color="green",
-                alpha=0.7,
-            )
-            axes[idx, 0].set_xlabel("Time (seconds)", fontsize=10)
-            axes[idx, 0].set_ylabel("Throughput (Mbits/sec)", fontsize=10)
-            axes[idx, 0].set_title(f"{sta_name} - Baseline (No Mobility)", fontsize=11)
-            axes[idx, 0].grid(True, alpha=0.3)
-            avg = np.mean(baseline_tp)
-            axes[idx, 0].axhline(
-                y=avg,
-                color="r",
-                linestyle="--",
-                label=f"Avg: {avg:.2f} Mbps",
-                alpha=0.7,
-            )
-            axes[idx, 0].legend()
-
-        # Plot mobility
-        if mobility_tp:
-            axes[idx, 1].plot(
-                mobility_times,
-                mobility_tp,
-                marker="s",
-                markersize=4,
-                linewidth=1.5,
-                color="red",
-                alpha=0.7,
-            )
-            axes[idx, 1].set_xlabel("Time (seconds)", fontsize=10)
-            axes[idx, 1].set_ylabel("Throughput (Mbits/sec)", fontsize=10)
-            axes[idx, 1].set_title(
-                f"{sta_name} - With Mobility ({movement})", fontsize=11
-            )
-            axes[idx, 1].grid(True, alpha=0.3)
-            avg = np.mean(mobility_tp)
-            axes[idx, 1].axhline(
-                y=avg,
-                color="r",
-                linestyle="--",
-                label=f"Avg: {avg:.2f} Mbps",
-                alpha=0.7,
-            )
-            axes[idx, 1].legend()
 
-    plt.tight_layout()
-    plt.savefig("./graphs/tcp_comparison.png", dpi=300, bbox_inches="tight")
-    print("✓ Generated: ./graphs/tcp_comparison.png")
-    plt.close()
+def page_output(graphs_dir, name, page):
+    """Output path of one page of a figure (page 0 keeps the plain name)"""
+    suffix = f"_p{page + 1}" if page else ""
+    return os.path.join(graphs_dir, f"{name}_comparison{suffix}.png")
 
 
-def plot_udp_comparison():
-    """Compare UDP throughput: Baseline vs Mobility"""
-    fig, axes = plt.subplots(3, 2, figsize=(16, 12))
+def decimate_minmax(x, y, buckets):
+    """Keep the first, last, min and max sample of each of `buckets` bins, in order"""
+    count = len(y)
+    if buckets <= 0 or count <= 2 * buckets:
+        return x, y
+
+    size = -(-count // buckets)
+    bins = -(-count // size)
+    padded = np.full(bins * size, np.nan)
+    padded[:count] = y
+    view = padded.reshape(bins, size)
+
+    offsets = np.arange(bins) * size
+    keep = np.concatenate(
+        [
+            [0, count - 1],
+            offsets + np.nanargmin(view, axis=1),
+            offsets + np.nanargmax(view, axis=1),
+        ]
+    )
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
+def recorded_handovers(tests_dir):
+    """{(phase, station): [(left, joined, from AP, to AP), ...]} of an experiment
+
+    Read from the association timelines the sampler wrote during the run;
+    joined - left is the interruption time of a handover.
+    """
+    events = {}
+    for phase, path in handovers.find_timelines(tests_dir).items():
+        timeline, aps = handovers.load_timeline(path)
+        for station, (times, ap, _) in timeline.items():
+            events[phase, station] = [
+                (left, joined, aps[old], aps[new])
+                for left, joined, old, new in handovers.find_handovers(times, ap)
+            ]
+    return events
+
+
+def handover_rows(tests_dir):
+    """Flat rows of every recorded handover, for CSV export"""
+    return [
+        {
+            "phase": phase,
+            "station": station,
+            "from_ap": old,
+            "to_ap": new,
+            "left": round(left, 3),
+            "joined": round(joined, 3),
+            "interruption_ms": round((joined - left) * 1000, 1),
+        }
+        for (phase, station), events in sorted(recorded_handovers(tests_dir).items())
+        for left, joined, old, new in events
+    ]
+
+
+def metric_series(metric, filename):
+    """Return the x/y series of a metric from one report, plus its packet loss"""
+    if metric == "icmp":
+        rtts, loss, _ = parse_ping_results(filename)
+        return np.arange(len(rtts)), rtts, loss
+    times, throughputs, jitters, _ = parse_iperf_results(filename)
+    if metric == "jitter":
+        return times, jitters, None
+    return times, throughputs, None
+
+
+def plot_metric_comparison(
+    metric,
+    tests_dir="./tests",
+    graphs_dir="./graphs",
+    dpi=300,
+    page=0,
+    stations_per_page=STATIONS_PER_PAGE,
+    max_points=MAX_PLOT_POINTS,
+):
+    """Plot one metric as a station x phase grid of small multiples"""
+    spec = METRICS[metric]
+    reports, phases, stations, movements = discover_reports(tests_dir)
+    stations = station_pages(stations, stations_per_page)[page]
+    events = recorded_handovers(tests_dir) if metric in HANDOVER_METRICS else {}
+
+    rows, columns = max(len(stations), 1), max(len(phases), 1)
+    fig, axes = plt.subplots(
+        rows, columns, figsize=(8 * columns, 4 * rows), squeeze=False
+    )
     fig.suptitle(
-        "UDP Throughput: Baseline (No Mobility) vs Mobility Impact",
+        f"{spec['title']}: Baseline (No Mobility) vs Mobility Impact",
         fontsize=16,
         fontweight="bold",
     )
 
-    stations = [
-        ("sta1", "Domain1→Domain3"),
-        ("sta2", "Domain2→Domain3"),
-        ("sta3", "Domain3→Domain1"),
-    ]
-
-    for idx, (sta_name, movement) in enumerate(stations):
-        # Baseline
-        baseline_file = f"./tests/baseline_udp_{sta_name}.txt"
-        baseline_times, baseline_tp, _, _ = parse_iperf_udp_results(baseline_file)
-
-        # Mobility
-        mobility_file = f"./tests/mobility_udp_{sta_name}.txt"
-        mobility_times, mobility_tp, _, _ = parse_iperf_udp_results(mobility_file)
-
-        # Plot baseline
-        if baseline_tp:
-            axes[idx, 0].plot(
-                baseline_times,
-                baseline_tp,
-                marker="^",
-                markersize=4,
-                linewidth=1.5,
-                color="green",
+    for row, sta_name in enumerate(stations):
+        for column, phase in enumerate(phases):
+            filename = reports.get((phase, spec["protocol"], sta_name))
+            if filename is None:
+                continue
+
+            x, y, loss = metric_series(metric, filename)
+            if not y.size:
+                continue
+
+            ax = axes[row, column]
+            avg = np.mean(y)
+            marker = spec["marker"]
+
+            # Large series: decimate to the subplot's width in output pixels
+            if max_points and y.size > max_points:
+                pixels = int(ax.bbox.width / fig.dpi * dpi)
+                x, y = decimate_minmax(x, y, pixels)
+                marker = None
+
+            ax.plot(
+                x,
+                y,
+                marker=marker,
+                markersize=spec["markersize"],
+                linewidth=spec["linewidth"],
+                color=phase_color(phase, column),
                 alpha=0.7,
             )
-            axes[idx, 0].set_xlabel("Time (seconds)", fontsize=10)
-            axes[idx, 0].set_ylabel("Throughput (Mbits/sec)", fontsize=10)
-            axes[idx, 0].set_title(f"{sta_name} - Baseline (No Mobility)", fontsize=11)
-            axes[idx, 0].grid(True, alpha=0.3)
-            avg = np.mean(baseline_tp)
-            axes[idx, 0].axhline(
+            ax.set_xlabel(spec["xlabel"], fontsize=10)
+            ax.set_ylabel(spec["ylabel"], fontsize=10)
+            title = f"{sta_name} - {phase_title(phase, movements.get(sta_name))}"
+            if loss is not None:
+                title += f"\nLoss: {loss:.1f}%"
+            ax.set_title(title, fontsize=11)
+            ax.grid(True, alpha=0.3)
+            ax.axhline(
                 y=avg,
                 color="r",
                 linestyle="--",
-                label=f"Avg: {avg:.2f} Mbps",
+                label=spec["avg_label"].format(avg),
                 alpha=0.7,
             )
-            axes[idx, 0].legend()
-
-        # Plot mobility
-        if mobility_tp:
-            axes[idx, 1].plot(
-                mobility_times,
-                mobility_tp,
-                marker="^",
-                markersize=4,
-                linewidth=1.5,
-                color="red",
-                alpha=0.7,
-            )
-            axes[idx, 1].set_xlabel("Time (seconds)", fontsize=10)
-            axes[idx, 1].set_ylabel("Throughput (Mbits/sec)", fontsize=10)
-            axes[idx, 1].set_title(
-                f"{sta_name} - With Mobility ({movement})", fontsize=11
-            )
-            axes[idx, 1].grid(True, alpha=0.3)
-            avg = np.mean(mobility_tp)
-            axes[idx, 1].axhline(
-                y=avg,
-                color="r",
-                linestyle="--",
-                label=f"Avg: {avg:.2f} Mbps",
-                alpha=0.7,
-            )
-            axes[idx, 1].legend()
+
+            # Shade each handover from leaving the old AP to joining the new one
+            for index, (left, joined, _, _) in enumerate(
+                events.get((phase, sta_name), [])
+            ):
+                ax.axvspan(
+                    left,
+                    joined,
+                    color="gray",
+                    alpha=0.3,
+                    label="Handover" if index == 0 else None,
+                )
+                ax.axvline(x=joined, color="gray", linestyle=":", linewidth=1)
+            ax.legend()
 
     plt.tight_layout()
-    plt.savefig("./graphs/udp_comparison.png", dpi=300, bbox_inches="tight")
-    print("✓ Generated: ./graphs/udp_comparison.png")
+    output = page_output(graphs_dir, metric, page)
+    plt.savefig(output, dpi=dpi, bbox_inches="tight")
+    print(f"✓ Generated: {output}")
     plt.close()
 
 
-def plot_jitter_comparison():
-    """Compare UDP jitter: Baseline vs Mobility"""
-    fig, axes = plt.subplots(3, 2, figsize=(16, 12))
+def plot_summary_comparison(
+    tests_dir="./tests",
+    graphs_dir="./graphs",
+    dpi=300,
+    page=0,
+    stations_per_page=STATIONS_PER_PAGE,
+):
+    """Create summary bar charts comparing baseline vs mobility"""
+    reports, phases, stations, _ = discover_reports(tests_dir)
+    stations = station_pages(stations, stations_per_page)[page]
+
+    # Collect data: one average per (metric, phase, station)
+    averages = {}
+    for metric, _ in SUMMARY_PANELS:
+        protocol = METRICS[metric]["protocol"]
+        for phase in phases:
+            values = []
+            for sta in stations:
+                filename = reports.get((phase, protocol, sta))
+                y = metric_series(metric, filename)[1] if filename else np.empty(0)
+                values.append(np.mean(y) if y.size else 0)
+            averages[metric, phase] = values
+
+    # Create bar charts
+    fig, axes = plt.subplots(1, len(SUMMARY_PANELS), figsize=(16, 5))
     fig.suptitle(
-        "UDP Jitter: Baseline (No Mobility) vs Mobility Impact",
-        fontsize=16,
-        fontweight="bold",
+        "Performance Comparison: Baseline vs Mobility", fontsize=16, fontweight="bold"
     )
 
-    stations = [
-        ("sta1", "Domain1→Domain3"),
-        ("sta2", "Domain2→Domain3"),
-        ("sta3", "Domain3→Domain1"),
-    ]
-
-    for idx, (sta_name, movement) in enumerate(stations):
-        # Baseline
-        baseline_file = f"./tests/baseline_udp_{sta_name}.txt"
-        baseline_times, _, baseline_jitter, _ = parse_iperf_udp_results(baseline_file)
-
-        # Mobility
-        mobility_file = f"./tests/mobility_udp_{sta_name}.txt"
-        mobility_times, _, mobility_jitter, _ = parse_iperf_udp_results(mobility_file)
-
-        # Plot baseline
-        if baseline_jitter:
-            axes[idx, 0].plot(
-                baseline_times,
-                baseline_jitter,
-                marker="d",
-                markersize=4,
-                linewidth=1.5,
-                color="green",
-                alpha=0.7,
-            )
-            axes[idx, 0].set_xlabel("Time (seconds)", fontsize=10)
-            axes[idx, 0].set_ylabel("Jitter (ms)", fontsize=10)
-            axes[idx, 0].set_title(f"{sta_name} - Baseline (No Mobility)", fontsize=11)
-            axes[idx, 0].grid(True, alpha=0.3)
-            avg = np.mean(baseline_jitter)
-            axes[idx, 0].axhline(
-                y=avg, color="r", linestyle="--", label=f"Avg: {avg:.2f}ms", alpha=0.7
-            )
-            axes[idx, 0].legend()
-
-        # Plot mobility
-        if mobility_jitter:
-            axes[idx, 1].plot(
-                mobility_times,
-                mobility_jitter,
-                marker="d",
-                markersize=4,
-                linewidth=1.5,
-                color="red",
+    x = np.arange(len(stations))
+    width = 0.7 / max(len(phases), 1)
+
+    for ax, (metric, ylabel) in zip(axes, SUMMARY_PANELS):
+        for index, phase in enumerate(phases):
+            ax.bar(
+                x + (index - (len(phases) - 1) / 2) * width,
+                averages[metric, phase],
+                width,
+                label=phase_title(phase) if index == 0 else phase_label(phase),
+                color=phase_color(phase, index),
                 alpha=0.7,
             )
-            axes[idx, 1].set_xlabel("Time (seconds)", fontsize=10)
-            axes[idx, 1].set_ylabel("Jitter (ms)", fontsize=10)
-            axes[idx, 1].set_title(
-                f"{sta_name} - With Mobility ({movement})", fontsize=11
-            )
-            axes[idx, 1].grid(True, alpha=0.3)
-            avg = np.mean(mobility_jitter)
-            axes[idx, 1].axhline(
-                y=avg, color="r", linestyle="--", label=f"Avg: {avg:.2f}ms", alpha=0.7
-            )
-            axes[idx, 1].legend()
+        ax.set_xlabel("Station", fontsize=11)
+        ax.set_ylabel(ylabel, fontsize=11)
+        ax.set_title(METRICS[metric]["title"], fontsize=12, fontweight="bold")
+        ax.set_xticks(x)
+        ax.set_xticklabels(stations, rotation=45 if len(stations) > 8 else 0)
+        ax.legend()
+        ax.grid(True, alpha=0.3, axis="y")
 
     plt.tight_layout()
-    plt.savefig("./graphs/jitter_comparison.png", dpi=300, bbox_inches="tight")
-    print("✓ Generated: ./graphs/jitter_comparison.png")
+    output = page_output(graphs_dir, "summary", page)
+    plt.savefig(output, dpi=dpi, bbox_inches="tight")
+    print(f"✓ Generated: {output}")
     plt.close()
 
 
-def plot_summary_comparison():
-    """Create summary bar charts comparing baseline vs mobility"""
+def render_figure_pages(figure, tests_dir="./tests", graphs_dir="./graphs", dpi=300):
+    """Render every page of one figure"""
+    _, _, stations, _ = discover_reports(tests_dir)
+    for page in range(len(station_pages(stations))):
+        render_figure(figure, tests_dir, graphs_dir, dpi, page)
+
+
+def render_figure(
+    figure,
+    tests_dir="./tests",
+    graphs_dir="./graphs",
+    dpi=300,
+    page=0,
+    stations_per_page=STATIONS_PER_PAGE,
+    max_points=MAX_PLOT_POINTS,
+):
+    """Render one page of one figure ("icmp", "tcp", "udp", "jitter", "summary")"""
+    if figure == "summary":
+        plot_summary_comparison(tests_dir, graphs_dir, dpi, page, stations_per_page)
+    else:
+        plot_metric_comparison(
+            figure, tests_dir, graphs_dir, dpi, page, stations_per_page, max_points
+        )
 
-    stations = ["sta1", "sta2", "sta3"]
 
-    # Collect data
-    baseline_latency = []
-    mobility_latency = []
-    baseline_tcp = []
-    mobility_tcp = []
-    baseline_udp = []
-    mobility_udp = []
+def plot_icmp_comparison(tests_dir="./tests", graphs_dir="./graphs", dpi=300):
+    """Compare ICMP latency: Baseline vs Mobility"""
+    render_figure_pages("icmp", tests_dir, graphs_dir, dpi)
 
-    for sta in stations:
-        # ICMP
-        b_rtts, _, _ = parse_ping_results(f"./tests/baseline_icmp_{sta}.txt")
-        m_rtts, _, _ = parse_ping_results(f"./tests/mobility_icmp_{sta}.txt")
-        baseline_latency.append(np.mean(b_rtts) if b_rtts else 0)
-        mobility_latency.append(np.mean(m_rtts) if m_rtts else 0)
-
-        # TCP
-        _, b_tcp = parse_iperf_tcp_results(f"./tests/baseline_tcp_{sta}.txt")
-        _, m_tcp = parse_iperf_tcp_results(f"./tests/mobility_tcp_{sta}.txt")
-        baseline_tcp.append(np.mean(b_tcp) if b_tcp else 0)
-        mobility_tcp.append(np.mean(m_tcp) if m_tcp else 0)
-
-        # UDP
-        _, b_udp, _, _ = parse_iperf_udp_results(f"./tests/baseline_udp_{sta}.txt")
-        _, m_udp, _, _ = parse_iperf_udp_results(f"./tests/mobility_udp_{sta}.txt")
-        baseline_udp.append(np.mean(b_udp) if b_udp else 0)
-        mobility_udp.append(np.mean(m_udp) if m_udp else 0)
 
-    # Create bar charts
-    fig, axes = plt.subplots(1, 3, figsize=(16, 5))
-    fig.suptitle(
-        "Performance Comparison: Baseline vs Mobility", fontsize=16, fontweight="bold"
-    )
+def plot_tcp_comparison(tests_dir="./tests", graphs_dir="./graphs", dpi=300):
+    """Compare TCP throughput: Baseline vs Mobility"""
+    render_figure_pages("tcp", tests_dir, graphs_dir, dpi)
 
-    x = np.arange(len(stations))
-    width = 0.35
-
-    # ICMP Latency
-    axes[0].bar(
-        x - width / 2,
-        baseline_latency,
-        width,
-        label="Baseline (No Mobility)",
-        color="green",
-        alpha=0.7,
-    )
-    axes[0].bar(
-        x + width / 2,
-        mobility_latency,
-        width,
-        label="With Mobility",
-        color="red",
-        alpha=0.7,
-    )
-    axes[0].set_xlabel("Station", fontsize=11)
-    axes[0].set_ylabel("Average Latency (ms)", fontsize=11)
-    axes[0].set_title("ICMP Latency", fontsize=12, fontweight="bold")
-    axes[0].set_xticks(x)
-    axes[0].set_xticklabels(stations)
-    axes[0].legend()
-    axes[0].grid(True, alpha=0.3, axis="y")
-
-    # TCP Throughput
-    axes[1].bar(
-        x - width / 2,
-        baseline_tcp,
-        width,
-        label="Baseline (No Mobility)",
-        color="green",
-        alpha=0.7,
-    )
-    axes[1].bar(
-        x + width / 2,
-        mobility_tcp,
-        width,
-        label="With Mobility",
-        color="red",
-        alpha=0.7,
-    )
-    axes[1].set_xlabel("Station", fontsize=11)
-    axes[1].set_ylabel("Average Throughput (Mbps)", fontsize=11)
-    axes[1].set_title("TCP Throughput", fontsize=12, fontweight="bold")
-    axes[1].set_xticks(x)
-    axes[1].set_xticklabels(stations)
-    axes[1].legend()
-    axes[1].grid(True, alpha=0.3, axis="y")
-
-    # UDP Throughput
-    axes[2].bar(
-        x - width / 2,
-        baseline_udp,
-        width,
-        label="Baseline (No Mobility)",
-        color="green",
-        alpha=0.7,
-    )
-    axes[2].bar(
-        x + width / 2,
-        mobility_udp,
-        width,
-        label="With Mobility",
-        color="red",
-        alpha=0.7,
-    )
-    axes[2].set_xlabel("Station", fontsize=11)
-    axes[2].set_ylabel("Average Throughput (Mbps)", fontsize=11)
-    axes[2].set_title("UDP Throughput", fontsize=12, fontweight="bold")
-    axes[2].set_xticks(x)
-    axes[2].set_xticklabels(stations)
-    axes[2].legend()
-    axes[2].grid(True, alpha=0.3, axis="y")
 
-    plt.tight_layout()
-    plt.savefig("./graphs/summary_comparison.png", dpi=300, bbox_inches="tight")
-    print("✓ Generated: ./graphs/summary_comparison.png")
-    plt.close()
+def plot_udp_comparison(tests_dir="./tests", graphs_dir="./graphs", dpi=300):
+    """Compare UDP throughput: Baseline vs Mobility"""
+    render_figure_pages("udp", tests_dir, graphs_dir, dpi)
 
 
-def print_comparison_statistics():
-    """Print detailed comparison statistics"""
-    print("\n" + "=" * 80)
-    print("PERFORMANCE IMPACT ANALYSIS: BASELINE vs MOBILITY")
-    print("=" * 80)
+def plot_jitter_comparison(tests_dir="./tests", graphs_dir="./graphs", dpi=300):
+    """Compare UDP jitter: Baseline vs Mobility"""
+    render_figure_pages("jitter", tests_dir, graphs_dir, dpi)
+
+
+def collect_series(tests_dir, results=None):
+    """Collect the samples of every (phase, metric, station) of an experiment
+
+    With a ResultsStore (see store.py) that holds the experiment, the
+    samples are read from the store instead of parsed from the reports.
+    """
+    run_id = None
+    if results is not None:
+        run_id = results.run_id(os.path.dirname(os.path.abspath(tests_dir)))
+    if run_id is not None:
+        return {
+            (phase, metric, sta): values
+            for (_, phase, metric, sta), values in results.series(run=run_id).items()
+        }
+
+    reports, phases, stations, _ = discover_reports(tests_dir)
+    series = {}
+    for phase in phases:
+        for metric, spec in METRICS.items():
+            for sta in stations:
+                filename = reports.get((phase, spec["protocol"], sta))
+                if filename is not None:
+                    series[phase, metric, sta] = metric_series(metric, filename)[1]
+    return series
+
+
+def experiment_statistics(tests_dir, results=None):
+    """Summary statistics and reference-phase deltas of an experiment"""
+    _, phases, _, _ = discover_reports(tests_dir)
+    table = stats.summarize(collect_series(tests_dir, results))
+    reference = phases[0] if phases else REFERENCE_PHASE
+    return table, stats.compare_phases(table, reference)
+
+
+def export_statistics(tests_dir="./tests", graphs_dir="./graphs", results=None):
+    """Write summary statistics and deltas as CSV and JSON next to the graphs"""
+    table, deltas = experiment_statistics(tests_dir, results)
+    summary_rows = stats.table_rows(table)
+    delta_rows = stats.table_rows(deltas)
+
+    outputs = [
+        os.path.join(graphs_dir, "statistics.csv"),
+        os.path.join(graphs_dir, "statistics_deltas.csv"),
+        os.path.join(graphs_dir, "statistics.json"),
+    ]
+    stats.write_csv(summary_rows, outputs[0])
+    stats.write_csv(delta_rows, outputs[1])
+    stats.write_json({"summary": summary_rows, "deltas": delta_rows}, outputs[2])
 
-    stations = ["sta1", "sta2", "sta3"]
-    movements = ["Domain1→Domain3", "Domain2→Domain3", "Domain3→Domain1"]
+    rows = handover_rows(tests_dir)
+    if rows:
+        outputs.append(os.path.join(graphs_dir, "handovers.csv"))
+        stats.write_csv(rows, outputs[-1])
+    for output in outputs:
+        print(f"✓ Generated: {output}")
+    return table
 
-    for sta, movement in zip(stations, movements):
-        print(f"\n{sta.upper()} ({movement}):")
-        print("-" * 80)
 
-        # ICMP Analysis
-        b_rtts, b_loss, _ = parse_ping_results(f"./tests/baseline_icmp_{sta}.txt")
-        m_rtts, m_loss, _ = parse_ping_results(f"./tests/mobility_icmp_{sta}.txt")
+def print_comparison_statistics(tests_dir="./tests", table=None):
+    """Print detailed comparison statistics (from a precomputed table if given)"""
+    print("\n" + "=" * 80)
+    print("PERFORMANCE IMPACT ANALYSIS: BASELINE vs MOBILITY")
+    print("=" * 80)
 
-        if b_rtts and m_rtts:
-            b_avg = np.mean(b_rtts)
-            m_avg = np.mean(m_rtts)
-            increase = ((m_avg - b_avg) / b_avg * 100) if b_avg > 0 else 0
+    reports, phases, stations, movements = discover_reports(tests_dir)
+    reference = phases[0] if phases else REFERENCE_PHASE
+    b_label = f"{phase_label(reference)}:"
 
-            print(f"  ICMP Latency:")
-            print(f"    Baseline:       {b_avg:.2f} ms (Loss: {b_loss:.1f}%)")
-            print(f"    With Mobility:  {m_avg:.2f} ms (Loss: {m_loss:.1f}%)")
-            print(
-                f"    Impact:         {'+' if increase > 0 else ''}{increase:.1f}% change"
-            )
+    if table is None:
+        table, _ = experiment_statistics(tests_dir)
+    rows = {key: row for row, key in enumerate(table["keys"])}
 
-        # TCP Analysis
-        _, b_tcp = parse_iperf_tcp_results(f"./tests/baseline_tcp_{sta}.txt")
-        _, m_tcp = parse_iperf_tcp_results(f"./tests/mobility_tcp_{sta}.txt")
+    def stat(field, phase, metric, sta):
+        row = rows.get((phase, metric, sta))
+        if row is None or not table["count"][row]:
+            return None
+        return table[field][row]
 
-        if b_tcp and m_tcp:
-            b_avg = np.mean(b_tcp)
-            m_avg = np.mean(m_tcp)
-            decrease = ((b_avg - m_avg) / b_avg * 100) if b_avg > 0 else 0
+    def ping_loss(phase, sta):
+        return parse_ping_results(reports[phase, "icmp", sta])[1]
 
-            print(f"  TCP Throughput:")
-            print(f"    Baseline:       {b_avg:.2f} Mbps")
-            print(f"    With Mobility:  {m_avg:.2f} Mbps")
-            print(
-                f"    Impact:         {'-' if decrease > 0 else '+'}{abs(decrease):.1f}% change"
-            )
+    events = recorded_handovers(tests_dir)
 
-        # UDP Analysis
-        _, b_udp, b_jitter, _ = parse_iperf_udp_results(
-            f"./tests/baseline_udp_{sta}.txt"
-        )
-        _, m_udp, m_jitter, _ = parse_iperf_udp_results(
-            f"./tests/mobility_udp_{sta}.txt"
-        )
-
-        if b_udp and m_udp:
-            b_avg_tp = np.mean(b_udp)
-            m_avg_tp = np.mean(m_udp)
-            b_avg_jit = np.mean(b_jitter)
-            m_avg_jit = np.mean(m_jitter)
-            tp_decrease = (
-                ((b_avg_tp - m_avg_tp) / b_avg_tp * 100) if b_avg_tp > 0 else 0
-            )
-            jit_increase = (
-                ((m_avg_jit - b_avg_jit) / b_avg_jit * 100) if b_avg_jit > 0 else 0
-            )
+    for sta in stations:
+        movement = movements.get(sta)
+        print(f"\n{sta.upper()} ({movement}):" if movement else f"\n{sta.upper()}:")
+        print("-" * 80)
 
-            print(f"  UDP:")
-            print(f"    Throughput:")
-            print(f"      Baseline:       {b_avg_tp:.2f} Mbps")
-            print(f"      With Mobility:  {m_avg_tp:.2f} Mbps")
-            print(
-                f"      Impact:         {'-' if tp_decrease > 0 else '+'}{abs(tp_decrease):.1f}% change"
-            )
-            print(f"    Jitter:")
-            print(f"      Baseline:       {b_avg_jit:.2f} ms")
-            print(f"      With Mobility:  {m_avg_jit:.2f} ms")
-            print(
-                f"      Impact:         {'+' if jit_increase > 0 else ''}{jit_increase:.1f}% change"
-            )
+        for phase in phases[1:]:
+            m_label = f"{phase_label(phase)}:"
+            if len(phases) > 2:
+                print(f"  [{phase_label(reference)} vs {phase_label(phase)}]")
+
+            # ICMP Analysis
+            b_avg = stat("mean", reference, "icmp", sta)
+            m_avg = stat("mean", phase, "icmp", sta)
+
+            if b_avg is not None and m_avg is not None:
+                b_loss = ping_loss(reference, sta)
+                m_loss = ping_loss(phase, sta)
+                increase = ((m_avg - b_avg) / b_avg * 100) if b_avg > 0 else 0
+
+                print(f"  ICMP Latency:")
+                print(f"    {b_label:<16}{b_avg:.2f} ms (Loss: {b_loss:.1f}%)")
+                print(f"    {m_label:<16}{m_avg:.2f} ms (Loss: {m_loss:.1f}%)")
+                print(
+                    f"    Impact:         {'+' if increase > 0 else ''}{increase:.1f}% change"
+                )
+                print(f"    Tail (p95 / p99):")
+                for label, tail_phase in ((b_label, reference), (m_label, phase)):
+                    p95 = stat("p95", tail_phase, "icmp", sta)
+                    p99 = stat("p99", tail_phase, "icmp", sta)
+                    print(f"      {label:<16}{p95:.2f} / {p99:.2f} ms")
+
+            # TCP Analysis
+            b_avg = stat("mean", reference, "tcp", sta)
+            m_avg = stat("mean", phase, "tcp", sta)
+
+            if b_avg is not None and m_avg is not None:
+                decrease = ((b_avg - m_avg) / b_avg * 100) if b_avg > 0 else 0
+
+                print(f"  TCP Throughput:")
+                print(f"    {b_label:<16}{b_avg:.2f} Mbps")
+                print(f"    {m_label:<16}{m_avg:.2f} Mbps")
+                print(
+                    f"    Impact:         {'-' if decrease > 0 else '+'}{abs(decrease):.1f}% change"
+                )
+
+            # UDP Analysis
+            b_avg_tp = stat("mean", reference, "udp", sta)
+            m_avg_tp = stat("mean", phase, "udp", sta)
+
+            if b_avg_tp is not None and m_avg_tp is not None:
+                b_avg_jit = stat("mean", reference, "jitter", sta)
+                m_avg_jit = stat("mean", phase, "jitter", sta)
+                tp_decrease = (
+                    ((b_avg_tp - m_avg_tp) / b_avg_tp * 100) if b_avg_tp > 0 else 0
+                )
+                jit_increase = (
+                    ((m_avg_jit - b_avg_jit) / b_avg_jit * 100) if b_avg_jit > 0 else 0
+                )
+
+                print(f"  UDP:")
+                print(f"    Throughput:")
+                print(f"      {b_label:<16}{b_avg_tp:.2f} Mbps")
+                print(f"      {m_label:<16}{m_avg_tp:.2f} Mbps")
+                print(
+                    f"      Impact:         {'-' if tp_decrease > 0 else '+'}{abs(tp_decrease):.1f}% change"
+                )
+                print(f"    Jitter:")
+                print(f"      {b_label:<16}{b_avg_jit:.2f} ms")
+                print(f"      {m_label:<16}{m_avg_jit:.2f} ms")
+                print(
+                    f"      Impact:         {'+' if jit_increase > 0 else ''}{jit_increase:.1f}% change"
+                )
+
+            # Recorded handovers
+            if (phase, sta) in events:
+                print(f"  Handovers: {len(events[phase, sta])}")
+                for left, joined, old, new in events[phase, sta]:
+                    print(
+                        f"    {joined:7.2f}s  {old} → {new}  "
+                        f"interruption {(joined - left) * 1000:.0f} ms"
+                    )
 
     print("\n" + "=" * 80)
     print("\nKEY FINDINGS:")
@@ -664,44 +971,465 @@ def print_comparison_statistics():
     print("=" * 80)
 
 
+def aggregate_statistics(experiments, results=None):
+    """Statistics across runs, with the run as the unit of replication
+
+    Every run contributes the mean of each (phase, metric, station) series,
+    so "count" is the number of runs and the CI is the bootstrap CI of the
+    mean across runs. Returns (table, deltas against the reference phase).
+    """
+    run_means = {}
+    for experiment in experiments:
+        tests_dir = os.path.join(experiment, "tests")
+        for key, y in collect_series(tests_dir, results).items():
+            if len(y):
+                run_means.setdefault(key, []).append(np.mean(y))
+    table = stats.summarize(run_means)
+    phases = sorted(
+        {phase for phase, _, _ in run_means},
+        key=lambda phase: (phase != REFERENCE_PHASE, natural_key(phase)),
+    )
+    reference = phases[0] if phases else REFERENCE_PHASE
+    return table, stats.compare_phases(table, reference)
+
+
+def plot_aggregate_summary(table, output, dpi=300):
+    """Summary bar charts of the across-run means, with their CIs as error bars"""
+    rows = {key: row for row, key in enumerate(table["keys"])}
+    phases = sorted(
+        {phase for phase, _, _ in rows},
+        key=lambda phase: (phase != REFERENCE_PHASE, natural_key(phase)),
+    )
+    stations = sorted({station for _, _, station in rows}, key=natural_key)
+    runs_count = int(table["count"].max(initial=0))
+
+    fig, axes = plt.subplots(1, len(SUMMARY_PANELS), figsize=(16, 5))
+    fig.suptitle(
+        f"Performance Comparison across {runs_count} run(s): Baseline vs Mobility",
+        fontsize=16,
+        fontweight="bold",
+    )
+
+    x = np.arange(len(stations))
+    width = 0.7 / max(len(phases), 1)
+
+    for ax, (metric, ylabel) in zip(axes, SUMMARY_PANELS):
+        for index, phase in enumerate(phases):
+            means, errors = [], [[], []]
+            for sta in stations:
+                row = rows.get((phase, metric, sta))
+                mean = table["mean"][row] if row is not None else np.nan
+                means.append(mean)
+                errors[0].append(mean - table["ci_low"][row] if row is not None else 0)
+                errors[1].append(table["ci_high"][row] - mean if row is not None else 0)
+            ax.bar(
+                x + (index - (len(phases) - 1) / 2) * width,
+                np.nan_to_num(means),
+                width,
+                yerr=np.nan_to_num(errors),
+                capsize=3,
+                label=phase_title(phase) if index == 0 else phase_label(phase),
+                color=phase_color(phase, index),
+                alpha=0.7,
+            )
+        ax.set_xlabel("Station", fontsize=11)
+        ax.set_ylabel(ylabel, fontsize=11)
+        ax.set_title(METRICS[metric]["title"], fontsize=12, fontweight="bold")
+        ax.set_xticks(x)
+        ax.set_xticklabels(stations, rotation=45 if len(stations) > 8 else 0)
+        ax.legend()
+        ax.grid(True, alpha=0.3, axis="y")
+
+    plt.tight_layout()
+    plt.savefig(output, dpi=dpi, bbox_inches="tight")
+    print(f"✓ Generated: {output}")
+    plt.close()
+
+
+def export_aggregate(experiments, output_dir, dpi=300, results=None):
+    """Write across-run statistics, deltas and a summary chart to output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    table, deltas = aggregate_statistics(experiments, results)
+    summary_rows = stats.table_rows(table)
+    delta_rows = stats.table_rows(deltas)
+
+    outputs = [
+        os.path.join(output_dir, "statistics.csv"),
+        os.path.join(output_dir, "statistics_deltas.csv"),
+        os.path.join(output_dir, "statistics.json"),
+    ]
+    stats.write_csv(summary_rows, outputs[0])
+    stats.write_csv(delta_rows, outputs[1])
+    stats.write_json(
+        {"runs": experiments, "summary": summary_rows, "deltas": delta_rows},
+        outputs[2],
+    )
+    for output in outputs:
+        print(f"✓ Generated: {output}")
+    plot_aggregate_summary(
+        table, os.path.join(output_dir, "summary_comparison.png"), dpi
+    )
+
+    print(f"\nACROSS {len(experiments)} RUN(S) (mean of run means, 95% CI):")
+    print("-" * 80)
+    for row in summary_rows:
+        if row["mean"] is None:
+            continue
+        print(
+            f"  {row['station']:<8}{row['phase']:<12}{row['metric']:<8}"
+            f"{row['mean']:10.2f}  [{row['ci_low']:.2f}, {row['ci_high']:.2f}]"
+            f"  runs={row['count']}"
+        )
+    return table
+
+
+FIGURES = ["icmp", "tcp", "udp", "jitter", "summary"]
+
+
+def content_hash(filename):
+    """SHA-1 of a file's content, hashed once per (path, mtime, size)"""
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    digest = _content_hashes.get(key)
+    if digest is None:
+        sha1 = hashlib.sha1()
+        with open(filename, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(block)
+        digest = _content_hashes[key] = sha1.hexdigest()
+    return digest
+
+
+def figure_inputs(figure, reports, stations):
+    """Report files one page of a figure is drawn from"""
+    if figure == "summary":
+        protocols = {METRICS[metric]["protocol"] for metric, _ in SUMMARY_PANELS}
+    else:
+        protocols = {METRICS[figure]["protocol"]}
+    return sorted(
+        path
+        for (_, protocol, station), path in reports.items()
+        if protocol in protocols and station in stations
+    )
+
+
+def figure_signature(figure, tests_dir, page, dpi, stations_per_page, max_points):
+    """Everything one figure page depends on: input hashes plus layout and options"""
+    reports, phases, stations, movements = discover_reports(tests_dir)
+    stations = station_pages(stations, stations_per_page)[page]
+    inputs = figure_inputs(figure, reports, stations)
+    if figure in HANDOVER_METRICS:
+        inputs += sorted(handovers.find_timelines(tests_dir).values())
+    return {
+        "inputs": {
+            os.path.relpath(path, tests_dir): content_hash(path)
+            for path in inputs
+            if os.path.exists(path)
+        },
+        "recipe": [
+            figure,
+            page,
+            stations,
+            phases,
+            movements,
+            dpi,
+            stations_per_page,
+            max_points,
+            PARSER_VERSION,
+        ],
+    }
+
+
+def load_build_state(graphs_dir):
+    """Signatures of the figure pages last rendered into graphs_dir"""
+    try:
+        with open(os.path.join(graphs_dir, CACHE_DIR_NAME, BUILD_STATE_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_state(graphs_dir, state):
+    """Write the figure signatures of graphs_dir (best effort, atomic)"""
+    state_file = os.path.join(graphs_dir, CACHE_DIR_NAME, BUILD_STATE_NAME)
+    try:
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        tmp_file = f"{state_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, state_file)
+    except OSError as e:
+        print(f"Warning: could not write build state {state_file}: {e}")
+
+
+def preload_results(tests_dir):
+    """Parse every report of an experiment once, before any figure is rendered"""
+    reports, _, _, _ = discover_reports(tests_dir)
+    for (_, protocol, _), filename in sorted(reports.items()):
+        report_parser(protocol)(filename)
+
+
+def render_figures(
+    experiments,
+    jobs=1,
+    dpi=300,
+    stations_per_page=STATIONS_PER_PAGE,
+    max_points=MAX_PLOT_POINTS,
+    force=False,
+):
+    """Render the out-of-date figure pages of every experiment
+
+    A page is skipped when its PNG exists and the content hashes of its input
+    reports, its layout and the render options all match the last build
+    (graphs/.cache/build.json); force re-renders everything. Pages are
+    rendered in a process pool if jobs > 1.
+
+    Reports must already be preloaded: forked workers inherit the in-process
+    memo, and spawned workers hit the .npz cache, so nothing is parsed twice.
+    Returns the number of pages rendered.
+    """
+    tasks = []
+    states = {}
+    skipped = 0
+    for experiment in experiments:
+        tests_dir = os.path.join(experiment, "tests")
+        graphs_dir = os.path.join(experiment, "graphs")
+        state = states[graphs_dir] = load_build_state(graphs_dir)
+        _, _, stations, _ = discover_reports(tests_dir)
+        pages = len(station_pages(stations, stations_per_page))
+        for figure in FIGURES:
+            for page in range(pages):
+                output = page_output(graphs_dir, figure, page)
+                signature = figure_signature(
+                    figure, tests_dir, page, dpi, stations_per_page, max_points
+                )
+                name = os.path.basename(output)
+                if (
+                    not force
+                    and os.path.exists(output)
+                    and state.get(name) == signature
+                ):
+                    skipped += 1
+                    continue
+                tasks.append(
+                    (
+                        (graphs_dir, name, signature),
+                        (
+                            figure,
+                            tests_dir,
+                            graphs_dir,
+                            dpi,
+                            page,
+                            stations_per_page,
+                            max_points,
+                        ),
+                    )
+                )
+
+    if skipped:
+        print(f"Skipping {skipped} up-to-date figure page(s)")
+
+    try:
+        if jobs <= 1 or len(tasks) <= 1:
+            for (graphs_dir, name, signature), task in tasks:
+                render_figure(*task)
+                states[graphs_dir][name] = signature
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+                futures = [
+                    (target, pool.submit(render_figure, *task))
+                    for target, task in tasks
+                ]
+                for (graphs_dir, name, signature), future in futures:
+                    future.result()
+                    states[graphs_dir][name] = signature
+    finally:
+        # Record what was rendered, even if a later page failed
+        for graphs_dir, state in states.items():
+            save_build_state(graphs_dir, state)
+
+    return len(tasks)
+
+
+def follow_experiments(
+    experiments,
+    interval=5.0,
+    jobs=1,
+    dpi=100,
+    stations_per_page=STATIONS_PER_PAGE,
+    max_points=MAX_PLOT_POINTS,
+):
+    """Tail growing reports and refresh figures and statistics in place"""
+    tails = {}
+    print(f"Following {', '.join(experiments)} every {interval:g}s (Ctrl-C to stop)\n")
+
+    try:
+        while True:
+            changed = []
+            for experiment in experiments:
+                reports, _, _, _ = discover_reports(os.path.join(experiment, "tests"))
+                for (_, protocol, _), path in sorted(reports.items()):
+                    if path not in tails:
+                        tails[path] = ReportTail(path, report_parser(protocol))
+                    if tails[path].poll() and experiment not in changed:
+                        changed.append(experiment)
+
+            if changed:
+                for experiment in changed:
+                    os.makedirs(os.path.join(experiment, "graphs"), exist_ok=True)
+                render_figures(changed, jobs, dpi, stations_per_page, max_points)
+                for experiment in changed:
+                    print_comparison_statistics(os.path.join(experiment, "tests"))
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped following.")
+
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Generate baseline vs mobility comparison graphs"
+    )
+    parser.add_argument(
+        "experiments",
+        nargs="*",
+        default=["."],
+        help="Experiment directories containing tests/, or directories of runs "
+        "such as ./runs (default: .)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of figures rendered in parallel, 0 = all cores (default: 1)",
+    )
+    parser.add_argument(
+        "--follow",
+        "-f",
+        action="store_true",
+        help="Tail growing reports and refresh graphs/statistics in place",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Refresh interval in seconds for --follow (default: 5)",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=None,
+        help="Figure resolution (default: 300, or 100 with --follow)",
+    )
+    parser.add_argument(
+        "--stations-per-page",
+        type=int,
+        default=STATIONS_PER_PAGE,
+        help=f"Stations per figure page (default: {STATIONS_PER_PAGE})",
+    )
+    parser.add_argument(
+        "--max-points",
+        type=int,
+        default=MAX_PLOT_POINTS,
+        help="Decimate series longer than this to the subplot's pixel width, "
+        f"0 = never (default: {MAX_PLOT_POINTS})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every figure even if its input reports are unchanged",
+    )
+    parser.add_argument(
+        "--store",
+        help="Ingest the experiments into this columnar results store and "
+        "compute the statistics from it",
+    )
+    parser.add_argument(
+        "--aggregate",
+        metavar="DIR",
+        help="Also write statistics and a summary chart across all runs to DIR",
+    )
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    args.experiments = [
+        run for experiment in args.experiments for run in runs.find_runs(experiment)
+    ]
+
+    if args.follow:
+        follow_experiments(
+            args.experiments,
+            args.interval,
+            jobs,
+            args.dpi or 100,
+            args.stations_per_page,
+            args.max_points,
+        )
+        return
+
     print("\n" + "=" * 80)
     print("GENERATING COMPARISON GRAPHS: BASELINE vs MOBILITY")
     print("=" * 80 + "\n")
 
-    # Check if tests directory exists
-    if not os.path.exists("./tests"):
-        print("ERROR: ./tests directory not found!")
-        print("Please run the traffic test script first.")
+    experiments = []
+    for experiment in args.experiments:
+        tests_dir = os.path.join(experiment, "tests")
+
+        # Check if tests directory exists
+        if not os.path.exists(tests_dir):
+            print(f"ERROR: {tests_dir} directory not found!")
+            print("Please run the traffic test script first.")
+            continue
+
+        # Check for holes in the (phase, protocol, station) matrix
+        reports, phases, stations, _ = discover_reports(tests_dir)
+        missing = [
+            f"{phase}_{protocol}_{sta}"
+            for phase in phases
+            for protocol in ("icmp", "tcp", "udp")
+            for sta in stations
+            if (phase, protocol, sta) not in reports
+        ]
+        if not reports:
+            print(f"WARNING: No test files found in {tests_dir}")
+        elif missing:
+            print(f"WARNING: Missing test files in {tests_dir}: {missing}")
+            print("Some graphs may not be generated correctly.\n")
+
+        os.makedirs(os.path.join(experiment, "graphs"), exist_ok=True)
+        preload_results(tests_dir)
+        experiments.append(experiment)
+
+    if not experiments:
         return
 
-    # Check for required files
-    required_files = [
-        "baseline_icmp_sta1.txt",
-        "mobility_icmp_sta1.txt",
-        "baseline_tcp_sta1.txt",
-        "mobility_tcp_sta1.txt",
-        "baseline_udp_sta1.txt",
-        "mobility_udp_sta1.txt",
-    ]
+    results = None
+    if args.store:
+        import store
 
-    missing = [f for f in required_files if not os.path.exists(f"./tests/{f}")]
-    if missing:
-        print(f"WARNING: Missing test files: {missing}")
-        print("Some graphs may not be generated correctly.\n")
+        try:
+            added = store.ingest(experiments, args.store)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            return
+        print(f"✓ Ingested {added} samples into {args.store}\n")
+        results = store.ResultsStore(args.store)
 
     # Generate all comparison plots
-    print("Generating comparison plots...\n")
-
-    plot_icmp_comparison()
-    plot_tcp_comparison()
-    plot_udp_comparison()
-    plot_jitter_comparison()
-    plot_summary_comparison()
+    print(f"Generating comparison plots ({jobs} job(s))...\n")
+    render_figures(
+        experiments,
+        jobs,
+        args.dpi or 300,
+        args.stations_per_page,
+        args.max_points,
+        args.force,
+    )
 
     print("\n" + "=" * 80)
     print("ALL COMPARISON GRAPHS GENERATED SUCCESSFULLY!")
-    print("Check ./graphs/ directory for results:")
+    for experiment in experiments:
+        print(f"Check {os.path.join(experiment, 'graphs')}/ directory for results:")
     print("  • icmp_comparison.png   - ICMP latency baseline vs mobility")
     print("  • tcp_comparison.png    - TCP throughput baseline vs mobility")
     print("  • udp_comparison.png    - UDP throughput baseline vs mobility")
@@ -709,8 +1437,20 @@ def main():
     print("  • summary_comparison.png - Overall performance comparison")
     print("=" * 80)
 
-    # Print statistics
-    print_comparison_statistics()
+    # Export and print statistics
+    for experiment in experiments:
+        tests_dir = os.path.join(experiment, "tests")
+        table = export_statistics(
+            tests_dir, os.path.join(experiment, "graphs"), results
+        )
+        if len(experiments) > 1:
+            print(f"\n>>> Experiment: {experiment}")
+        print_comparison_statistics(tests_dir, table)
+
+    if args.aggregate:
+        print("\n" + "=" * 80)
+        export_aggregate(experiments, args.aggregate, args.dpi or 300, results)
+        print("=" * 80)
 
 
 if __name__ == "__main__":
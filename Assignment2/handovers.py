@@ -0,0 +1,194 @@
+#!/usr/bin/python
+
+import os
+import re
+import subprocess
+import time
+import numpy as np
+
+# Seconds between association/RSSI polls of a station interface
+SAMPLE_INTERVAL = 0.05
+
+# Seconds a terminated poll loop gets to exit before it is killed
+STOP_GRACE = 2
+
+# Binary timeline of one phase, written next to its reports
+TIMELINE_NAME_RE = re.compile(r"^association_(?P<phase>[A-Za-z0-9-]+)\.npz$")
+
+# One sample of the poll loop: a "@ <uptime>" marker followed by `iw dev link`
+#   @ 12345.67
+#   Connected to 02:00:00:00:10:00 (on sta1-wlan0)
+#           signal: -52 dBm
+SAMPLE_RE = re.compile(
+    r"^@ (\d+\.\d+)$|^Connected to ([0-9a-f:]{17})|^\s*signal:\s*(-?\d+)",
+    re.MULTILINE,
+)
+
+# Poll loop run by bash in a station's namespace. The timestamp is read
+# from /proc/uptime and the pause is a `read -t` on a pipe that never
+# delivers (fd 9, opened once), both builtins, so iw is the only process
+# spawned per sample
+POLL_SCRIPT = (
+    "exec 9<> <(:); while :; do "
+    "read up _ < /proc/uptime; echo @ $up; iw dev {intf} link; "
+    "read -t {interval} -u 9; "
+    "done"
+)
+
+
+def timeline_path(tests_dir, phase):
+    """Path of a phase's association timeline"""
+    return os.path.join(tests_dir, f"association_{phase}.npz")
+
+
+def uptime():
+    """Seconds since boot, the clock of the in-namespace poll loops"""
+    with open("/proc/uptime", "r") as f:
+        return float(f.read().split()[0])
+
+
+def time_pair():
+    """(wall clock, uptime) read back to back, to map poll times to wall clock"""
+    return time.time(), uptime()
+
+
+def parse_samples(content, bssids):
+    """Turn poll loop output into (time, AP index, RSSI) arrays
+
+    Unknown or missing BSSIDs give AP index -1 (not associated), missing
+    signal lines NaN RSSI.
+    """
+    times, aps, rssi = [], [], []
+    for uptime_value, bssid, signal in SAMPLE_RE.findall(content):
+        if uptime_value:
+            times.append(float(uptime_value))
+            aps.append(-1)
+            rssi.append(np.nan)
+        elif not times:
+            continue
+        elif bssid:
+            aps[-1] = bssids.get(bssid, -1)
+        else:
+            rssi[-1] = float(signal)
+    return np.array(times), np.array(aps, dtype=np.int8), np.array(rssi, np.float32)
+
+
+class AssociationSampler:
+    """Poll association and RSSI of stations from inside their namespaces
+
+    Every station gets one long-lived poll loop whose output goes to a file;
+    the files are read in one batch at stop() and packed into a binary
+    timeline, so sampling costs no shell round-trips through Mininet.
+    """
+
+    def __init__(self, stations, aps, interval=SAMPLE_INTERVAL, label=None):
+        # label maps node names to the names recorded in the timeline
+        self.label = label or (lambda name: name)
+        self.stations = stations
+        self.ap_names = [self.label(ap.name) for ap in aps]
+        self.bssids = {
+            intf.mac.lower(): index
+            for index, ap in enumerate(aps)
+            for intf in ap.wintfs.values()
+        }
+        self.interval = interval
+        self.loops = []
+
+    def start(self, tests_dir, phase):
+        """Start polling every station; output is buffered next to the reports"""
+        self.tests_dir, self.phase = tests_dir, phase
+        self.start_time, self.start_uptime = time_pair()
+        for station in self.stations:
+            script = POLL_SCRIPT.format(
+                intf=station.wintfs[0].name, interval=self.interval
+            )
+            output = os.path.join(tests_dir, f".association_{phase}_{station.name}")
+            log = open(output, "w")
+            process = station.popen(
+                ["bash", "-c", script], stdout=log, stderr=subprocess.DEVNULL
+            )
+            self.loops.append((self.label(station.name), process, log, output))
+
+    def stop(self):
+        """Stop polling and write the phase's timeline; returns its path"""
+        for _, process, _, _ in self.loops:
+            process.terminate()
+
+        columns = {"time": [], "station": [], "ap": [], "rssi": []}
+        for index, (_, process, log, output) in enumerate(self.loops):
+            try:
+                process.wait(timeout=STOP_GRACE)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            log.close()
+            with open(output, "r") as f:
+                times, aps, rssi = parse_samples(f.read(), self.bssids)
+            os.remove(output)
+            columns["time"].append(times - self.start_uptime)
+            columns["station"].append(np.full(len(times), index, dtype=np.int16))
+            columns["ap"].append(aps)
+            columns["rssi"].append(rssi)
+
+        path = timeline_path(self.tests_dir, self.phase)
+        np.savez_compressed(
+            path,
+            start_time=self.start_time,
+            stations=np.array([name for name, _, _, _ in self.loops]),
+            aps=np.array(self.ap_names),
+            **{name: np.concatenate(parts) for name, parts in columns.items()},
+        )
+        self.loops = []
+        return path
+
+
+def load_timeline(path):
+    """Read a timeline into {station: (times, AP indices, RSSI)} plus AP names"""
+    with np.load(path) as data:
+        stations = [str(name) for name in data["stations"]]
+        aps = [str(name) for name in data["aps"]]
+        order = np.lexsort((data["time"], data["station"]))
+        station, times = data["station"][order], data["time"][order]
+        ap, rssi = data["ap"][order], data["rssi"][order]
+
+    bounds = np.searchsorted(station, np.arange(len(stations) + 1))
+    return {
+        name: (
+            times[bounds[i] : bounds[i + 1]],
+            ap[bounds[i] : bounds[i + 1]],
+            rssi[bounds[i] : bounds[i + 1]],
+        )
+        for i, name in enumerate(stations)
+    }, aps
+
+
+def find_timelines(tests_dir):
+    """{phase: timeline path} of every association timeline in tests_dir"""
+    if not os.path.isdir(tests_dir):
+        return {}
+    timelines = {}
+    for name in os.listdir(tests_dir):
+        match = TIMELINE_NAME_RE.match(name)
+        if match:
+            timelines[match.group("phase")] = os.path.join(tests_dir, name)
+    return timelines
+
+
+def find_handovers(times, aps):
+    """(left, joined, from AP, to AP) of every change of associated AP
+
+    left is the last sample on the old AP and joined the first on the new
+    one, so joined - left is the handover's interruption time (including
+    any samples without association in between).
+    """
+    associated = np.flatnonzero(aps >= 0)
+    changes = np.flatnonzero(np.diff(aps[associated]))
+    return [
+        (
+            float(times[associated[i]]),
+            float(times[associated[i + 1]]),
+            int(aps[associated[i]]),
+            int(aps[associated[i + 1]]),
+        )
+        for i in changes
+    ]
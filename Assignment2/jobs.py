@@ -0,0 +1,65 @@
+#!/usr/bin/python
+
+import os
+import shlex
+import subprocess
+import time
+from mininet.log import info
+
+# Seconds between liveness checks while a phase is running
+POLL_INTERVAL = 0.2
+
+# Seconds a terminated job gets to exit before it is killed
+KILL_GRACE = 2
+
+
+class JobSupervisor:
+    """Start commands in node namespaces and track them by their popen handles"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def start(self, node, command, output=os.devnull):
+        """Run command on node in the background, writing stdout/stderr to output"""
+        log = open(output, "w")
+        process = node.popen(shlex.split(command), stdout=log, stderr=subprocess.STDOUT)
+        self.jobs.append((node.name, command, process, log))
+        return process
+
+    def running(self):
+        """Jobs that have not exited yet"""
+        return [job for job in self.jobs if job[2].poll() is None]
+
+    def wait(self, timeout):
+        """Block until every job has exited or timeout seconds have passed
+
+        Jobs still running at the deadline are stopped. Returns the
+        (node, command, returncode) of every job; a timed-out job reports None.
+        """
+        deadline = time.monotonic() + timeout
+        while self.running() and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+
+        timed_out = self.running()
+        for name, command, _, _ in timed_out:
+            info(f"*** Timeout: stopping '{command}' on {name}\n")
+        self.stop()
+
+        results = []
+        for job in self.jobs:
+            name, command, process, _ = job
+            returncode = None if job in timed_out else process.returncode
+            results.append((name, command, returncode))
+        return results
+
+    def stop(self):
+        """Terminate every job that is still running and wait for it to exit"""
+        for _, _, process, _ in self.running():
+            process.terminate()
+        for _, _, process, log in self.jobs:
+            try:
+                process.wait(timeout=KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            log.close()
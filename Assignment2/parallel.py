@@ -0,0 +1,187 @@
+#!/usr/bin/python
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import runs
+import shared  # noqa: F401
+from Rakhat_Yskak import PORTS
+from instance import Instance
+
+EXPERIMENT_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "Rakhat_Yskak.py"
+)
+
+# Seconds a controller gets to exit after the experiments are done
+CONTROLLER_GRACE = 5
+
+
+def start_controllers(command, instance, log):
+    """Start one controller per domain port of an instance from a command template"""
+    return [
+        subprocess.Popen(
+            command.format(port=instance.port(port), index=instance.index),
+            shell=True,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        for port in PORTS
+    ]
+
+
+def stop_controllers(controllers):
+    """Terminate the controllers' process groups (shell and controller alike)"""
+    for process in controllers:
+        os.killpg(process.pid, signal.SIGTERM)
+    for process in controllers:
+        try:
+            process.wait(timeout=CONTROLLER_GRACE)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+
+def run_parallel(
+    instances,
+    output_dir,
+    batch,
+    controller_cmd=None,
+    extra_args=(),
+    controller_ip=None,
+):
+    """Run one experiment per instance in parallel and collect their run directories
+
+    Every experiment is a separate process with its own name prefix, subnet
+    and DPIDs (see Project/mininet/instance.py), writing to
+    <output_dir>/<batch>-i<N>. With controller_cmd every instance gets its
+    own controllers on shifted ports, which the experiments reach at
+    controller_ip (default: this host); otherwise all instances share the
+    controllers on the default ports.
+    Returns [{"instance", "run_dir", "returncode", "complete", "duration"}].
+    """
+    if controller_cmd and controller_ip is None:
+        controller_ip = "127.0.0.1"
+
+    log_dir = os.path.join(output_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    jobs = []
+    for index in range(instances):
+        instance = Instance(index)
+        name = f"{batch}-i{index}"
+        log = open(os.path.join(log_dir, f"{name}.log"), "w")
+        controllers = (
+            start_controllers(controller_cmd, instance, log) if controller_cmd else []
+        )
+        command = [
+            sys.executable,
+            EXPERIMENT_SCRIPT,
+            "--instance",
+            str(index),
+            "--output",
+            output_dir,
+            "--name",
+            name,
+        ]
+        if not controller_cmd:
+            # Shared controllers: keep the default ports (the iperf servers
+            # run in per-instance namespaces and cannot clash either)
+            command += ["--port-offset", "0"]
+        if controller_ip:
+            command += ["--controller-ip", controller_ip]
+        command += extra_args
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        print(f"*** Instance {index}: {name} (pid {process.pid})")
+        jobs.append((instance, name, process, controllers, log, time.monotonic()))
+
+    results = []
+    for instance, name, process, controllers, log, started in jobs:
+        process.wait()
+        stop_controllers(controllers)
+        log.close()
+        run_dir = os.path.join(output_dir, name)
+        results.append(
+            {
+                "instance": instance.describe(),
+                "run_dir": run_dir,
+                "returncode": process.returncode,
+                "complete": runs.is_complete(run_dir),
+                "duration": time.monotonic() - started,
+            }
+        )
+        status = "done" if results[-1]["complete"] else f"FAILED ({process.returncode})"
+        print(f"*** Instance {instance.index}: {status}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run several isolated wifi experiments on one host in parallel",
+        epilog="Unrecognized arguments (e.g. --udp-rate 20M --concurrent) are "
+        "passed on to every Rakhat_Yskak.py instance.",
+    )
+    parser.add_argument(
+        "--instances",
+        "-k",
+        type=int,
+        default=2,
+        help="Number of experiments run in parallel (default: 2)",
+    )
+    parser.add_argument(
+        "--output",
+        default="./runs",
+        help="Directory receiving the run directories (default: ./runs)",
+    )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="Batch name prefixing the run directories (default: the start time)",
+    )
+    parser.add_argument(
+        "--controller-cmd",
+        help="Command template starting one controller, run for every domain of "
+        "every instance, e.g. 'ryu-manager --ofp-tcp-listen-port {port} "
+        "ryu.app.simple_switch_13'",
+    )
+    parser.add_argument(
+        "--controller-ip",
+        help="Controller address passed to every instance (default: 127.0.0.1 "
+        "with --controller-cmd, otherwise the experiment's default)",
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="Write statistics across the finished runs to <output>/<batch>-aggregate",
+    )
+    args, extra_args = parser.parse_known_args()
+    batch = args.batch or time.strftime("%Y%m%d-%H%M%S")
+
+    results = run_parallel(
+        args.instances,
+        args.output,
+        batch,
+        args.controller_cmd,
+        extra_args,
+        args.controller_ip,
+    )
+    with open(os.path.join(args.output, f"{batch}.json"), "w") as f:
+        json.dump({"batch": batch, "args": extra_args, "runs": results}, f, indent=2)
+
+    complete = [result["run_dir"] for result in results if result["complete"]]
+    print(f"*** {len(complete)}/{len(results)} run(s) complete in {args.output}")
+    if args.aggregate and complete:
+        import graph
+
+        graph.export_aggregate(
+            complete, os.path.join(args.output, f"{batch}-aggregate")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/python
+
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Written last into a run directory; its presence marks the run as complete
+RUN_FILE_NAME = "run.json"
+RUN_FILE_VERSION = 1
+
+# Tools whose versions are recorded with every run: name -> version command
+TOOL_VERSIONS = {
+    "iperf": ["iperf", "--version"],
+    "iperf3": ["iperf3", "--version"],
+    "ovs-vsctl": ["ovs-vsctl", "--version"],
+    "iw": ["iw", "--version"],
+}
+
+
+def new_run_dir(output_dir, name=None):
+    """Create a fresh run directory under output_dir and return its path
+
+    The name defaults to the current local time (20261018-142530); a numeric
+    suffix is added if another run, possibly a parallel one, already took it.
+    """
+    name = name or time.strftime("%Y%m%d-%H%M%S")
+    os.makedirs(output_dir, exist_ok=True)
+    for attempt in range(1, 1000):
+        run_dir = os.path.join(
+            output_dir, name if attempt == 1 else f"{name}-{attempt}"
+        )
+        try:
+            os.mkdir(run_dir)
+            return run_dir
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free run directory for {name} in {output_dir}")
+
+
+def is_complete(run_dir):
+    """A run is complete once its run file has been written"""
+    return os.path.exists(os.path.join(run_dir, RUN_FILE_NAME))
+
+
+def tool_version(command):
+    """First output line of a version command, or None if it is unavailable"""
+    try:
+        result = subprocess.run(
+            command, capture_output=True, text=True, timeout=5, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    return lines[0].strip() if lines else None
+
+
+def host_versions():
+    """Kernel, Python, Mininet(-WiFi) and traffic tool versions of this host"""
+    versions = {
+        "hostname": platform.node(),
+        "kernel": platform.release(),
+        "python": platform.python_version(),
+    }
+    for name, module in (("mininet", "mininet.net"), ("mininet-wifi", "mn_wifi.net")):
+        loaded = sys.modules.get(module)
+        versions[name] = getattr(loaded, "VERSION", None)
+    for name, command in TOOL_VERSIONS.items():
+        versions[name] = tool_version(command)
+    return versions
+
+
+def describe_topology(net):
+    """Nodes (with IPs and positions) and links of a built network"""
+    end_nodes = net.hosts + getattr(net, "stations", [])
+    nodes = []
+    for node in end_nodes + net.switches + getattr(net, "aps", []) + net.controllers:
+        entry = {"name": node.name, "type": type(node).__name__}
+        if node in end_nodes:
+            entry["ip"] = node.IP()
+        position = getattr(node, "position", None)
+        if position is not None:
+            entry["position"] = [float(value) for value in position]
+        nodes.append(entry)
+    links = [[link.intf1.node.name, link.intf2.node.name] for link in net.links]
+    return {"nodes": nodes, "links": links, "radio": getattr(net, "radio", None)}
+
+
+def file_checksums(directory):
+    """SHA-256 of every (non-hidden) file under directory, by relative path"""
+    checksums = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha256.update(block)
+            checksums[os.path.relpath(path, directory)] = sha256.hexdigest()
+    return checksums
+
+
+def write_run_file(run_dir, run_id, params, started, net=None, **extra):
+    """Write the manifest of a finished run
+
+    It records the parameters, timing, topology, host versions and the
+    checksum of every result file; extra keyword arguments are added as is.
+    """
+    manifest = {
+        "version": RUN_FILE_VERSION,
+        "run_id": run_id,
+        "params": params,
+        **extra,
+        "started": started,
+        "duration": time.time() - started,
+        "topology": describe_topology(net) if net is not None else None,
+        "host": host_versions(),
+        "files": file_checksums(run_dir),
+    }
+    tmp_file = os.path.join(run_dir, f".{RUN_FILE_NAME}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, os.path.join(run_dir, RUN_FILE_NAME))
+    return manifest
+
+
+def find_runs(path):
+    """Experiment directories under path
+
+    path itself if it has a tests/ directory, otherwise its subdirectories
+    that do (e.g. ./runs or a sweep output directory).
+    """
+    if os.path.isdir(os.path.join(path, "tests")) or not os.path.isdir(path):
+        return [path]
+    found = sorted(
+        os.path.join(path, name)
+        for name in os.listdir(path)
+        if os.path.isdir(os.path.join(path, name, "tests"))
+    )
+    return found or [path]
@@ -0,0 +1,13 @@
+#!/usr/bin/python
+
+import os
+import sys
+
+# Project/mininet holds the node helpers both script trees share (node_batch,
+# iperf_pool, instance); importing this module makes them importable here
+PROJECT_MININET = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Project", "mininet"
+)
+
+if PROJECT_MININET not in sys.path:
+    sys.path.append(PROJECT_MININET)
@@ -0,0 +1,162 @@
+#!/usr/bin/python
+
+import csv
+import json
+import warnings
+import numpy as np
+from statistics import NormalDist
+
+PERCENTILES = (50, 95, 99)
+DELTA_FIELDS = ["mean", "p50", "p95", "p99"]
+
+# Upper bound on bootstrap draws held in memory at once
+BOOTSTRAP_CHUNK_ELEMENTS = 1 << 22
+
+# Longer series use the normal approximation instead of resampling
+BOOTSTRAP_MAX_SAMPLES = 5000
+
+
+def pad_series(series):
+    """Stack 1-D series into a NaN-padded matrix plus per-row sample counts"""
+    counts = np.array([len(samples) for samples in series], dtype=int)
+    width = max(counts.max(initial=0), 1)
+    matrix = np.full((len(series), width), np.nan)
+    if series:
+        matrix[np.arange(width) < counts[:, None]] = np.concatenate(series)
+    return matrix, counts
+
+
+def normal_mean_ci(matrix, counts, confidence=0.95):
+    """Normal-approximation CI of the mean of every row"""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(matrix, axis=1)
+        margin = z * np.nanstd(matrix, axis=1, ddof=1) / np.sqrt(counts)
+    return mean - margin, mean + margin
+
+
+def bootstrap_mean_ci(matrix, counts, n_boot=1000, confidence=0.95, seed=0):
+    """Percentile bootstrap CI of the mean of every row, resampled in one batch"""
+    rows, width = matrix.shape
+    rng = np.random.default_rng(seed)
+    filled = np.where(np.isnan(matrix), 0.0, matrix)
+    valid = np.arange(width) < counts[:, None]
+    sizes = np.maximum(counts, 1)
+
+    means = np.empty((rows, n_boot))
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // max(rows * width, 1))
+    for start in range(0, n_boot, chunk):
+        stop = min(start + chunk, n_boot)
+
+        # Draw indices < count for every row; draws past count are masked out
+        draws = rng.random((rows, stop - start, width)) * sizes[:, None, None]
+        samples = np.take_along_axis(filled[:, None, :], draws.astype(int), axis=2)
+        totals = np.where(valid[:, None, :], samples, 0.0).sum(axis=2)
+        means[:, start:stop] = totals / sizes[:, None]
+
+    alpha = (1 - confidence) / 2 * 100
+    low, high = np.percentile(means, [alpha, 100 - alpha], axis=1)
+    low[counts == 0] = np.nan
+    high[counts == 0] = np.nan
+    return low, high
+
+
+def summarize(series, n_boot=1000, confidence=0.95, seed=0):
+    """Summary statistics of every series in one batched pass
+
+    series maps a key (e.g. (phase, metric, station)) to a 1-D sample array.
+    Series longer than BOOTSTRAP_MAX_SAMPLES get a normal-approximation CI.
+    Returns a columnar table: {"keys": [...], "count": array, "mean": array,
+    "std", "p50", "p95", "p99", "ci_low", "ci_high"}, one entry per key.
+    """
+    keys = list(series)
+    matrix, counts = pad_series([np.asarray(series[key], dtype=float) for key in keys])
+
+    with warnings.catch_warnings():
+        # All-NaN rows (empty series) yield NaN statistics
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(matrix, axis=1)
+        std = np.nanstd(matrix, axis=1)
+        p50, p95, p99 = np.nanpercentile(matrix, PERCENTILES, axis=1)
+
+    # Bootstrap the short series in one batch, approximate the long ones
+    ci_low, ci_high = normal_mean_ci(matrix, counts, confidence)
+    short = counts <= BOOTSTRAP_MAX_SAMPLES
+    if short.any():
+        width = max(counts[short].max(), 1)
+        ci_low[short], ci_high[short] = bootstrap_mean_ci(
+            matrix[short, :width], counts[short], n_boot, confidence, seed
+        )
+
+    return {
+        "keys": keys,
+        "count": counts,
+        "mean": mean,
+        "std": std,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def compare_phases(table, reference="baseline"):
+    """Deltas of every phase against the reference phase, for the same metric/station
+
+    Keys of the table must be (phase, ...) tuples. Returns a columnar table
+    with "keys", "reference_keys", and "<field>_delta"/"<field>_change_pct"
+    arrays for mean, p50, p95 and p99.
+    """
+    index = {key: row for row, key in enumerate(table["keys"])}
+    pairs = [
+        (row, index[(reference,) + key[1:]])
+        for row, key in enumerate(table["keys"])
+        if key[0] != reference and (reference,) + key[1:] in index
+    ]
+    rows = np.array([row for row, _ in pairs], dtype=int)
+    reference_rows = np.array([ref for _, ref in pairs], dtype=int)
+
+    deltas = {
+        "keys": [table["keys"][row] for row in rows],
+        "reference_keys": [table["keys"][ref] for ref in reference_rows],
+    }
+    for field in DELTA_FIELDS:
+        value = table[field][rows]
+        base = table[field][reference_rows]
+        delta = value - base
+        deltas[f"{field}_delta"] = delta
+        deltas[f"{field}_change_pct"] = np.divide(
+            delta * 100, base, out=np.full_like(delta, np.nan), where=base != 0
+        )
+    return deltas
+
+
+def table_rows(table, key_names=("phase", "metric", "station")):
+    """Convert a columnar table to a list of row dicts for export"""
+    fields = [name for name in table if name not in ("keys", "reference_keys")]
+    rows = []
+    for i, key in enumerate(table["keys"]):
+        row = dict(zip(key_names, key))
+        if "reference_keys" in table:
+            row["reference_phase"] = table["reference_keys"][i][0]
+        for field in fields:
+            value = table[field][i].item()
+            row[field] = None if value != value else value  # NaN -> null
+        rows.append(row)
+    return rows
+
+
+def write_csv(rows, filename):
+    """Write row dicts to a CSV file"""
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(payload, filename):
+    """Write a JSON-serializable payload to a file"""
+    with open(filename, "w") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,282 @@
+#!/usr/bin/python
+
+import argparse
+import json
+import os
+import shutil
+import numpy as np
+
+import graph
+import stats
+
+# One row per sample; string dimensions are stored as integer category codes.
+# Runs are keyed by their directory relative to the store's parent directory
+# (see run_key), so runs with the same directory name do not collide
+STORE_VERSION = 3
+CATEGORY_COLUMNS = {
+    "run": np.int32,
+    "phase": np.int16,
+    "protocol": np.int16,
+    "station": np.int32,
+    "metric": np.int16,
+}
+VALUE_COLUMNS = ["time", "value"]
+SCHEMA_NAME = "schema.json"
+
+
+def run_key(experiment, path):
+    """Directory of an experiment relative to the parent of the store at path"""
+    root = os.path.dirname(os.path.realpath(path))
+    return os.path.relpath(os.path.realpath(experiment), root)
+
+
+def experiment_samples(experiment):
+    """Yield (phase, protocol, station, metric, time, value) for every report of a run
+
+    time is the interval end (s) for iperf metrics and the packet sequence
+    for ICMP, matching the x axis of the graphs. It is relative to the start
+    of the client: the reports carry no absolute timestamps.
+    """
+    tests_dir = os.path.join(experiment, "tests")
+    reports, phases, stations, _ = graph.discover_reports(tests_dir)
+    for phase in phases:
+        for metric, spec in graph.METRICS.items():
+            for station in stations:
+                filename = reports.get((phase, spec["protocol"], station))
+                if filename is None:
+                    continue
+                x, y, _ = graph.metric_series(metric, filename)
+                if y.size:
+                    yield phase, spec["protocol"], station, metric, x, y
+
+
+class ResultsStore:
+    """Memory-mapped columnar store of samples from many experiment runs"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, SCHEMA_NAME), "r") as f:
+            self.schema = json.load(f)
+        if self.schema.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"{path}: store version {self.schema.get('version')} is not "
+                f"{STORE_VERSION}, re-ingest the runs into a new store"
+            )
+        self.categories = self.schema["categories"]
+        # run id -> experiment directory (run_key) it was ingested from
+        self.sources = self.schema["sources"]
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in list(CATEGORY_COLUMNS) + VALUE_COLUMNS
+        }
+
+    def __len__(self):
+        return self.schema["rows"]
+
+    def run_id(self, experiment):
+        """Id under which an experiment directory was ingested, or None"""
+        source = run_key(experiment, self.path)
+        for run_id, run_source in self.sources.items():
+            if run_source == source:
+                return run_id
+        return None
+
+    def mask(self, **filters):
+        """Boolean row mask for column=value (or column=[values]) filters"""
+        mask = np.ones(len(self), dtype=bool)
+        for column, wanted in filters.items():
+            if wanted is None:
+                continue
+            if isinstance(wanted, str):
+                wanted = [wanted]
+            codes = [
+                self.categories[column].index(value)
+                for value in wanted
+                if value in self.categories[column]
+            ]
+            mask &= np.isin(self.columns[column], codes)
+        return mask
+
+    def select(self, **filters):
+        """Return the (time, value) samples matching the filters"""
+        mask = self.mask(**filters)
+        return self.columns["time"][mask], self.columns["value"][mask]
+
+    def series(self, **filters):
+        """Group matching samples into {(run, phase, metric, station): values}"""
+        mask = self.mask(**filters)
+        keys = np.stack(
+            [
+                self.columns[name][mask]
+                for name in ("run", "phase", "metric", "station")
+            ],
+            axis=1,
+        )
+        values = self.columns["value"][mask]
+        if not len(values):
+            return {}
+
+        # Rows are written grouped, so a stable sort keeps sample order
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        bounds = np.cumsum(np.bincount(inverse.ravel()))[:-1]
+        groups = np.split(values[order], bounds)
+
+        names = ("run", "phase", "metric", "station")
+        return {
+            tuple(self.categories[name][code] for name, code in zip(names, key)): group
+            for key, group in zip(unique, groups)
+        }
+
+
+def load_columns(path):
+    """Load an existing store into memory as (categories, sources, columns), or empty"""
+    if not os.path.exists(os.path.join(path, SCHEMA_NAME)):
+        categories = {name: [] for name in CATEGORY_COLUMNS}
+        columns = {
+            name: np.empty(0, dtype=dtype) for name, dtype in CATEGORY_COLUMNS.items()
+        }
+        columns.update({name: np.empty(0) for name in VALUE_COLUMNS})
+        return categories, {}, columns
+
+    store = ResultsStore(path)
+    return (
+        store.categories,
+        dict(store.sources),
+        {name: np.array(column) for name, column in store.columns.items()},
+    )
+
+
+def ingest(experiments, path, run_ids=None):
+    """Add (or replace) runs in the store at path; returns the number of rows added
+
+    Runs are keyed by run_key() unless run_ids are given. Re-ingesting an
+    experiment replaces its rows; a run id that already belongs to another
+    experiment directory raises ValueError instead.
+    """
+    categories, sources, columns = load_columns(path)
+    run_ids = run_ids or [run_key(experiment, path) for experiment in experiments]
+
+    runs = {}
+    for experiment, run_id in zip(experiments, run_ids):
+        source = run_key(experiment, path)
+        owner = runs[run_id][1] if run_id in runs else sources.get(run_id, source)
+        if owner != source:
+            raise ValueError(
+                f"{path}: run id {run_id!r} is taken by {owner}, "
+                f"cannot ingest {source} under it"
+            )
+        runs[run_id] = (experiment, source)
+
+    def code(column, value):
+        if value not in categories[column]:
+            categories[column].append(value)
+        return categories[column].index(value)
+
+    # Re-ingesting a run replaces its previous rows
+    replaced = [code("run", run_id) for run_id in runs]
+    keep = ~np.isin(columns["run"], replaced)
+    chunks = {name: [column[keep]] for name, column in columns.items()}
+
+    added = 0
+    for run_id, (experiment, source) in runs.items():
+        sources[run_id] = source
+        for phase, protocol, station, metric, x, y in experiment_samples(experiment):
+            labels = {
+                "run": run_id,
+                "phase": phase,
+                "protocol": protocol,
+                "station": station,
+                "metric": metric,
+            }
+            for name, dtype in CATEGORY_COLUMNS.items():
+                chunks[name].append(np.full(y.size, code(name, labels[name]), dtype))
+            chunks["time"].append(np.asarray(x, dtype=float))
+            chunks["value"].append(np.asarray(y, dtype=float))
+            added += y.size
+
+    # Write into a temporary directory and swap it in atomically
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    rows = 0
+    for name, parts in chunks.items():
+        column = np.concatenate(parts)
+        rows = len(column)
+        np.save(os.path.join(tmp_path, f"{name}.npy"), column)
+    with open(os.path.join(tmp_path, SCHEMA_NAME), "w") as f:
+        json.dump(
+            {
+                "version": STORE_VERSION,
+                "rows": rows,
+                "categories": categories,
+                "sources": sources,
+            },
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+
+    old_path = f"{path}.{os.getpid()}.old"
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Columnar results store for baseline vs mobility experiments"
+    )
+    parser.add_argument(
+        "--store",
+        default="./results.store",
+        help="Store directory (default: ./results.store)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="Add experiment runs")
+    ingest_parser.add_argument(
+        "experiments", nargs="+", help="Experiment directories containing tests/"
+    )
+    ingest_parser.add_argument(
+        "--run-id",
+        action="append",
+        help="Run id per experiment (default: directory relative to the "
+        "store's parent directory)",
+    )
+
+    query_parser = commands.add_parser("query", help="Summarize stored samples")
+    for name in CATEGORY_COLUMNS:
+        query_parser.add_argument(f"--{name}", action="append")
+    query_parser.add_argument("--csv", help="Also write the summary to a CSV file")
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        if args.run_id and len(args.run_id) != len(args.experiments):
+            parser.error("--run-id must be given once per experiment")
+        try:
+            added = ingest(args.experiments, args.store, args.run_id)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"✓ Ingested {added} samples into {args.store}")
+        return
+
+    store = ResultsStore(args.store)
+    series = store.series(**{name: getattr(args, name) for name in CATEGORY_COLUMNS})
+    table = stats.summarize(series)
+    rows = stats.table_rows(table, key_names=("run", "phase", "metric", "station"))
+    for row in rows:
+        print(
+            f"{row['run']:<16}{row['phase']:<12}{row['metric']:<8}{row['station']:<8}"
+            f"n={row['count']:<8}mean={row['mean']:.2f}  p95={row['p95']:.2f}"
+            f"  p99={row['p99']:.2f}"
+        )
+    if args.csv:
+        stats.write_csv(rows, args.csv)
+        print(f"✓ Generated: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
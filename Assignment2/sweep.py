@@ -0,0 +1,170 @@
+#!/usr/bin/python
+
+import argparse
+import itertools
+import os
+import time
+from mininet.log import setLogLevel, info
+
+import Rakhat_Yskak as experiment
+import runs
+import shared  # noqa: F401
+from instance import Instance, add_instance_args
+from iperf_pool import IperfServerPool
+
+# Parameters that are baked into the network when it is built; runs are
+# grouped by them so that one network serves every run of a group
+BUILD_PARAMS = ["exp", "ap_range"]
+RUN_PARAMS = ["udp_rate", "trajectory"]
+
+
+def run_id(params, repetition):
+    """Stable id of one run, used as its results directory name"""
+    return (
+        f"exp{params['exp']:g}_udp{params['udp_rate']}_range{params['ap_range']:g}"
+        f"_{params['trajectory']}_rep{repetition:02d}"
+    )
+
+
+def plan_runs(grid, repetitions):
+    """Every (run id, params) of the grid, grouped by build parameters"""
+    names = BUILD_PARAMS + RUN_PARAMS
+    planned = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        for repetition in range(1, repetitions + 1):
+            planned.append((run_id(params, repetition), params))
+    return [
+        (build, list(group))
+        for build, group in itertools.groupby(
+            planned, key=lambda run: tuple(run[1][name] for name in BUILD_PARAMS)
+        )
+    ]
+
+
+def run_sweep(
+    grid, repetitions, output_dir, concurrent=False, controller_ip=experiment.HOST
+):
+    """Run every pending run of the grid, reusing one network per build group"""
+    groups = plan_runs(grid, repetitions)
+    total = sum(len(group) for _, group in groups)
+    done = 0
+
+    for build, group in groups:
+        pending = [
+            (run, params)
+            for run, params in group
+            if not runs.is_complete(os.path.join(output_dir, run))
+        ]
+        done += len(group) - len(pending)
+        if not pending:
+            continue
+
+        build_params = dict(zip(BUILD_PARAMS, build))
+        info(f"*** Building network for {build_params}\n")
+        start = time.monotonic()
+        net = experiment.build_network(
+            **build_params, control_stations=concurrent, controller_ip=controller_ip
+        )
+        info(f"*** Network built in {time.monotonic() - start:.1f}s\n")
+        servers = IperfServerPool(port_offset=experiment.INSTANCE.port_offset)
+        try:
+            for index, (run, params) in enumerate(pending):
+                done += 1
+                info(f"\n*** Run {done}/{total}: {run}\n")
+                run_dir = os.path.join(output_dir, run)
+                started = time.time()
+                if index:
+                    experiment.reset_network(net, servers)
+                experiment.run_experiment(
+                    net,
+                    os.path.join(run_dir, "tests"),
+                    servers=servers,
+                    concurrent=concurrent,
+                    **{name: params[name] for name in RUN_PARAMS},
+                )
+                runs.write_run_file(
+                    run_dir,
+                    run,
+                    params,
+                    started,
+                    net,
+                    concurrent=concurrent,
+                    instance=experiment.INSTANCE.describe(),
+                )
+        finally:
+            servers.stop()
+            net.stop()
+
+    info(f"*** Sweep complete: {total} run(s) in {output_dir}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run repetitions of the wifi experiment over a parameter grid"
+    )
+    parser.add_argument(
+        "--exp",
+        type=float,
+        nargs="+",
+        default=[experiment.PROPAGATION_EXP],
+        help="logDistance propagation exponents",
+    )
+    parser.add_argument(
+        "--udp-rate",
+        nargs="+",
+        default=[experiment.UDP_RATE],
+        help="UDP client rates (iperf -b)",
+    )
+    parser.add_argument(
+        "--ap-range",
+        type=float,
+        nargs="+",
+        default=[experiment.AP_RANGE],
+        help="Access point ranges",
+    )
+    parser.add_argument(
+        "--trajectory",
+        nargs="+",
+        choices=sorted(experiment.TRAJECTORIES) + sorted(experiment.MOBILITY_MODELS),
+        default=[experiment.TRAJECTORY],
+        help="Mobility phase trajectories",
+    )
+    parser.add_argument(
+        "--repetitions",
+        "-n",
+        type=int,
+        default=1,
+        help="Repetitions of every parameter combination (default: 1)",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Measure control group and moving stations in one phase per run",
+    )
+    parser.add_argument(
+        "--output",
+        default="./sweeps",
+        help="Directory with one results directory per run (default: ./sweeps)",
+    )
+    parser.add_argument(
+        "--controller-ip",
+        default=experiment.HOST,
+        help=f"Address of the domain controllers (default: {experiment.HOST})",
+    )
+    add_instance_args(parser)
+    args = parser.parse_args()
+
+    grid = {
+        "exp": args.exp,
+        "udp_rate": args.udp_rate,
+        "ap_range": args.ap_range,
+        "trajectory": args.trajectory,
+    }
+    setLogLevel("info")
+    experiment.use_instance(Instance.from_args(args))
+    run_sweep(grid, args.repetitions, args.output, args.concurrent, args.controller_ip)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/python
+
+import csv
+import os
+import threading
+import time
+import numpy as np
+
+# Defaults of mn_wifi's logDistance model and 802.11g interfaces
+TX_POWER_DBM = 14
+ANTENNA_GAIN_DBI = 5
+REFERENCE_DISTANCE = 1
+SPEED_OF_LIGHT = 299792458.0
+CHANNEL_FREQUENCIES_GHZ = {1: 2.412, 6: 2.437, 11: 2.462}
+
+# Position sampling interval (s) of precomputed trajectories
+TIME_STEP = 0.1
+
+# Handover policies: "sticky" keeps an AP until it is out of range (mn_wifi's
+# default), "ssf" moves to a stronger AP once it wins by HYSTERESIS_DB
+HYSTERESIS_DB = 3
+
+TIMELINE_NAME = "trajectory.npz"
+HANDOVERS_NAME = "handovers_predicted.csv"
+
+
+def parse_position(position):
+    """Turn an "x,y,z" position string into a float array"""
+    return np.array([float(value) for value in position.split(",")])
+
+
+def time_grid(duration, step=TIME_STEP):
+    """Sample instants 0, step, ..., duration"""
+    return np.arange(0, duration + step / 2, step)
+
+
+def waypoints(times, waypoint_times, waypoint_positions):
+    """Piecewise-linear track through waypoints: (T, 3) positions
+
+    Before the first and after the last waypoint time the station rests at
+    the first/last waypoint, as with net.mobility start/stop.
+    """
+    points = np.asarray(waypoint_positions, dtype=float)
+    return np.stack(
+        [np.interp(times, waypoint_times, points[:, axis]) for axis in range(3)],
+        axis=1,
+    )
+
+
+def random_waypoint(times, starts, area, speed=(1.0, 3.0), pause=(0.0, 2.0), seed=0):
+    """Random waypoint tracks of several stations: (S, T, 3) positions
+
+    Each station repeatedly moves to a uniform random point of area
+    ((x_min, y_min), (x_max, y_max)) at a random speed, then pauses; z is
+    kept from its start position.
+    """
+    rng = np.random.default_rng(seed)
+    tracks = []
+    for start in starts:
+        leg_times, leg_points = [0.0], [np.asarray(start, dtype=float)]
+        while leg_times[-1] < times[-1]:
+            target = leg_points[-1].copy()
+            target[:2] = rng.uniform(*area)
+            distance = np.linalg.norm(target - leg_points[-1])
+            arrival = leg_times[-1] + distance / rng.uniform(*speed)
+            leg_times += [arrival, arrival + rng.uniform(*pause)]
+            leg_points += [target, target]
+        tracks.append(waypoints(times, leg_times, leg_points))
+    return np.stack(tracks)
+
+
+def gauss_markov(
+    times,
+    starts,
+    area,
+    mean_speed=1.5,
+    mean_direction=None,
+    alpha=0.75,
+    speed_sigma=0.5,
+    direction_sigma=0.6,
+    seed=0,
+):
+    """Gauss-Markov tracks of several stations at once: (S, T, 3) positions
+
+    Speed and direction follow s_t = a s_{t-1} + (1 - a) mean + sqrt(1 - a^2) sigma e_t
+    per time step; stations bounce off the area walls.
+    """
+    rng = np.random.default_rng(seed)
+    starts = np.asarray(starts, dtype=float)
+    count = len(starts)
+    (x_min, y_min), (x_max, y_max) = area
+    lower, upper = np.array([x_min, y_min]), np.array([x_max, y_max])
+    steps = np.diff(times, prepend=times[0])
+
+    if mean_direction is None:
+        mean_direction = rng.uniform(0, 2 * np.pi, count)
+    mean_direction = np.broadcast_to(mean_direction, (count,)).astype(float)
+    speed = np.full(count, float(mean_speed))
+    direction = mean_direction.copy()
+    noise = np.sqrt(1 - alpha**2)
+
+    positions = np.empty((count, len(times), 3))
+    position = starts.copy()
+    for t, step in enumerate(steps):
+        speed = alpha * speed + (1 - alpha) * mean_speed
+        speed = np.abs(speed + noise * speed_sigma * rng.standard_normal(count))
+        direction = alpha * direction + (1 - alpha) * mean_direction
+        direction += noise * direction_sigma * rng.standard_normal(count)
+
+        position[:, :2] += (
+            step
+            * speed[:, None]
+            * np.stack([np.cos(direction), np.sin(direction)], axis=1)
+        )
+
+        # Reflect off the walls and mirror the heading accordingly
+        below, above = position[:, :2] < lower, position[:, :2] > upper
+        position[:, :2] = np.where(below, 2 * lower - position[:, :2], position[:, :2])
+        position[:, :2] = np.where(above, 2 * upper - position[:, :2], position[:, :2])
+        flip_x = below[:, 0] | above[:, 0]
+        flip_y = below[:, 1] | above[:, 1]
+        direction = np.where(flip_x, np.pi - direction, direction)
+        direction = np.where(flip_y, -direction, direction)
+        mean_direction = np.where(flip_x, np.pi - mean_direction, mean_direction)
+        mean_direction = np.where(flip_y, -mean_direction, mean_direction)
+
+        positions[:, t] = position
+    return positions
+
+
+def log_distance_rssi(
+    positions,
+    ap_positions,
+    frequencies_ghz,
+    exp=3,
+    tx_power=TX_POWER_DBM,
+    gain=ANTENNA_GAIN_DBI,
+):
+    """Predicted RSSI (dBm) of every AP at every station sample: (S, T, N)
+
+    Same formula as mn_wifi's logDistance model: free-space loss at the
+    reference distance plus 10 * exp * log10(d / d0).
+    """
+    distance = np.linalg.norm(
+        positions[:, :, None, :] - np.asarray(ap_positions)[None, None, :, :], axis=-1
+    )
+    distance = np.maximum(distance, 0.1)
+    frequency = np.asarray(frequencies_ghz, dtype=float) * 1e9
+    reference_loss = 20 * np.log10(
+        4 * np.pi * frequency * REFERENCE_DISTANCE / SPEED_OF_LIGHT
+    )
+    path_loss = reference_loss + 10 * exp * np.log10(distance / REFERENCE_DISTANCE)
+    return tx_power + 2 * gain - path_loss, distance
+
+
+def predict_association(
+    rssi, distance, ap_range, policy="sticky", hysteresis=HYSTERESIS_DB
+):
+    """Index of the associated AP of every station sample (-1 = none): (S, T)
+
+    Range checks and AP choice are vectorized over stations and APs; only
+    the (stateful) handover decision steps through time.
+    """
+    in_range = distance <= ap_range
+    usable = np.where(in_range, rssi, -np.inf)
+    best = np.argmax(usable, axis=2)
+    best[~in_range.any(axis=2)] = -1
+
+    stations, samples = best.shape
+    rows = np.arange(stations)
+    association = np.empty((stations, samples), dtype=int)
+    current = best[:, 0]
+    for t in range(samples):
+        candidate = best[:, t]
+        lost = (current < 0) | ~in_range[rows, t, np.maximum(current, 0)]
+        if policy == "ssf":
+            current_rssi = usable[rows, t, np.maximum(current, 0)]
+            candidate_rssi = usable[rows, t, np.maximum(candidate, 0)]
+            better = candidate_rssi > current_rssi + hysteresis
+            current = np.where(lost | better, candidate, current)
+        else:
+            current = np.where(lost, candidate, current)
+        association[:, t] = current
+    return association
+
+
+def handover_events(times, association):
+    """(station index, time, from AP index, to AP index) of every AP change"""
+    stations, samples = np.nonzero(np.diff(association, axis=1))
+    return [
+        (
+            int(station),
+            float(times[sample + 1]),
+            int(association[station, sample]),
+            int(association[station, sample + 1]),
+        )
+        for station, sample in zip(stations, samples)
+    ]
+
+
+def write_timeline(
+    tests_dir, stations, ap_names, times, positions, rssi, association, start_time
+):
+    """Write the predicted trajectory/association timeline next to the reports
+
+    trajectory.npz holds the sampled times (s since start_time, the wall
+    clock at mobility start), positions, RSSI and association indices;
+    handovers_predicted.csv lists every predicted handover.
+    """
+    os.makedirs(tests_dir, exist_ok=True)
+    np.savez_compressed(
+        os.path.join(tests_dir, TIMELINE_NAME),
+        start_time=start_time,
+        stations=np.array(stations),
+        aps=np.array(ap_names),
+        times=times,
+        positions=positions,
+        rssi=rssi.astype(np.float32),
+        association=association.astype(np.int8),
+    )
+
+    events = handover_events(times, association)
+    with open(os.path.join(tests_dir, HANDOVERS_NAME), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["station", "time", "from_ap", "to_ap", "rssi_dbm"])
+        for station, instant, old, new in events:
+            sample = int(np.searchsorted(times, instant))
+            writer.writerow(
+                [
+                    stations[station],
+                    f"{instant:.2f}",
+                    ap_names[old] if old >= 0 else "",
+                    ap_names[new] if new >= 0 else "",
+                    f"{rssi[station, sample, new]:.1f}" if new >= 0 else "",
+                ]
+            )
+    return events
+
+
+class TrajectoryPlayer(threading.Thread):
+    """Replay precomputed positions on stations with setPosition()"""
+
+    def __init__(self, nodes, times, positions):
+        super().__init__(daemon=True)
+        self.nodes = nodes
+        self.times = times
+        self.positions = positions
+        self.stopped = threading.Event()
+
+    def run(self):
+        start = time.monotonic()
+        for t, instant in enumerate(self.times):
+            delay = start + instant - time.monotonic()
+            if self.stopped.wait(max(delay, 0)):
+                return
+            for node, track in zip(self.nodes, self.positions):
+                node.setPosition(",".join(f"{value:.2f}" for value in track[t]))
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
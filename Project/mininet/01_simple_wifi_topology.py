@@ -15,16 +15,18 @@ Usage:
 
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info
 
+from ovs_provision import BulkOVSSwitch
+
 def simpleTopology(controller_ip='127.0.0.1', controller_port=6653):
     """Create a simple topology with 3 switches and 4 hosts"""
     
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         autoSetMacs=True
     )
 
@@ -9,22 +9,36 @@ Usage:
     sudo python 02_linear_topology.py
     sudo python 02_linear_topology.py --switches 5
     sudo python 02_linear_topology.py --controller 192.168.1.100 --port 6653
+    sudo python 02_linear_topology.py --switches 1000 --wait 120 --no-cli --timing linear.json
+    sudo python 02_linear_topology.py --switches 1000 --workers 16 --no-cli
 """
 
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
-from mininet.log import setLogLevel, info
+from mininet.log import setLogLevel, info, debug, error
 
-def linearTopology(num_switches=4, controller_ip='127.0.0.1', controller_port=6653):
+from ovs_provision import BulkOVSSwitch
+from parallel_build import ParallelBuilder
+from scale import (AddressPool, PhaseTimer, DEFAULT_SUBNET, SWITCH_PARAMS,
+                   start_network, add_scale_args)
+
+def linearTopology(num_switches=4, controller_ip='127.0.0.1', controller_port=6653,
+                   subnet=DEFAULT_SUBNET, wait_timeout=None, timing_file=None,
+                   interactive=True, workers=0):
     """Create a linear topology with N switches"""
-    
+
+    addresses = AddressPool(subnet)
+    addresses.check(num_switches)
+    timer = PhaseTimer()
+
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         autoSetMacs=True
     )
+    builder = ParallelBuilder(net, workers)
 
     info('*** Adding controller\n')
     controller = net.addController(
@@ -35,46 +49,50 @@ def linearTopology(num_switches=4, controller_ip='127.0.0.1', controller_port=66
     )
 
     info('*** Adding switches\n')
-    switches = []
-    for i in range(1, num_switches + 1):
-        switch = net.addSwitch('s%d' % i, protocols='OpenFlow13')
-        switches.append(switch)
-        info('  Added switch s%d\n' % i)
+    with timer.phase('add switches'):
+        switches = []
+        for i in range(1, num_switches + 1):
+            switch = net.addSwitch('s%d' % i, **SWITCH_PARAMS)
+            switches.append(switch)
+            debug('  Added switch s%d\n' % i)
 
     info('*** Adding hosts\n')
-    hosts = []
-    for i in range(1, num_switches + 1):
-        host = net.addHost('h%d' % i, ip='10.0.0.%d/24' % i)
-        hosts.append(host)
-        info('  Added host h%d (10.0.0.%d)\n' % (i, i))
+    with timer.phase('add hosts'):
+        hosts = builder.add_hosts([('h%d' % i, {'ip': addresses.allocate()})
+                                   for i in range(1, num_switches + 1)])
+        for host in hosts:
+            debug('  Added host %s (%s)\n' % (host.name, host.params['ip']))
 
     info('*** Creating links\n')
-    # Connect each host to its switch
-    for i in range(num_switches):
-        net.addLink(hosts[i], switches[i])
-        info('  h%d --- s%d\n' % (i+1, i+1))
-    
-    # Connect switches in a line
-    for i in range(num_switches - 1):
-        net.addLink(switches[i], switches[i + 1])
-        info('  s%d --- s%d\n' % (i+1, i+2))
+    with timer.phase('add links'):
+        # Connect each host to its switch, then the switches in a line
+        links = [(hosts[i], switches[i], {}) for i in range(num_switches)]
+        links += [(switches[i], switches[i + 1], {}) for i in range(num_switches - 1)]
+        builder.add_links(links)
+        for node1, node2, _ in links:
+            debug('  %s --- %s\n' % (node1.name, node2.name))
 
     info('*** Starting network\n')
-    net.start()
+    if not start_network(net, timer, wait_timeout):
+        error('*** Not all switches connected within %ss\n' % wait_timeout)
+    timer.report()
+    if timing_file:
+        timer.save(timing_file, topology='linear', switches=len(switches), hosts=len(hosts))
 
     info('*** Network topology: Linear with %d switches\n' % num_switches)
     info('*** Controller: Floodlight at %s:%d\n' % (controller_ip, controller_port))
     info('*** Web UI: http://localhost:3000\n')
     info('*** Floodlight API: http://localhost:8080\n')
     info('\n')
-    info('*** Test commands:\n')
-    info('  mininet> pingall               # Test connectivity\n')
-    info('  mininet> h1 ping h%d           # Ping across network\n' % num_switches)
-    info('  mininet> iperf h1 h%d          # Test bandwidth\n' % num_switches)
-    info('\n')
-    info('*** Running CLI. Press Ctrl-D to exit\n')
+    if interactive:
+        info('*** Test commands:\n')
+        info('  mininet> pingall               # Test connectivity\n')
+        info('  mininet> h1 ping h%d           # Ping across network\n' % num_switches)
+        info('  mininet> iperf h1 h%d          # Test bandwidth\n' % num_switches)
+        info('\n')
+        info('*** Running CLI. Press Ctrl-D to exit\n')
 
-    CLI(net)
+        CLI(net)
 
     info('*** Stopping network\n')
     net.stop()
@@ -98,6 +116,7 @@ if __name__ == '__main__':
         default=6653,
         help='Floodlight controller port (default: 6653)'
     )
+    add_scale_args(parser)
     args = parser.parse_args()
     
     setLogLevel('info')
@@ -106,5 +125,10 @@ if __name__ == '__main__':
     linearTopology(
         num_switches=args.switches,
         controller_ip=args.controller,
-        controller_port=args.port
+        controller_port=args.port,
+        subnet=args.subnet,
+        wait_timeout=args.wait,
+        timing_file=args.timing,
+        interactive=not args.no_cli,
+        workers=args.workers
     )
@@ -14,22 +14,38 @@ Usage:
     sudo python 03_tree_topology.py
     sudo python 03_tree_topology.py --depth 3 --fanout 3
     sudo python 03_tree_topology.py --controller 192.168.1.100 --port 6653
+    sudo python 03_tree_topology.py --depth 5 --fanout 4 --wait 300 --no-cli --timing tree.json
+    sudo python 03_tree_topology.py --depth 5 --fanout 4 --workers 16 --no-cli
 """
 
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
-from mininet.log import setLogLevel, info
+from mininet.log import setLogLevel, info, error
 
-def treeTopology(depth=2, fanout=2, controller_ip='127.0.0.1', controller_port=6653):
+from ovs_provision import BulkOVSSwitch
+from parallel_build import ParallelBuilder
+from scale import (AddressPool, PhaseTimer, DEFAULT_SUBNET, SWITCH_PARAMS,
+                   start_network, add_scale_args)
+
+def treeTopology(depth=2, fanout=2, controller_ip='127.0.0.1', controller_port=6653,
+                 subnet=DEFAULT_SUBNET, wait_timeout=None, timing_file=None,
+                 interactive=True, workers=0):
     """Create a tree topology with specified depth and fanout"""
-    
+
+    # One switch (and one host) per tree node: 1 + fanout + ... + fanout^depth
+    num_nodes = sum(fanout ** level for level in range(depth + 1))
+    addresses = AddressPool(subnet)
+    addresses.check(num_nodes)
+    timer = PhaseTimer()
+
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         autoSetMacs=True
     )
+    builder = ParallelBuilder(net, workers)
 
     info('*** Adding controller\n')
     controller = net.addController(
@@ -40,64 +56,52 @@ def treeTopology(depth=2, fanout=2, controller_ip='127.0.0.1', controller_port=6
     )
 
     info('*** Building tree topology (depth=%d, fanout=%d)\n' % (depth, fanout))
-    
+
     switches = []
-    hosts = []
-    host_counter = 1
-    switch_counter = 1
-    
-    # Create switches and hosts level by level
+    uplinks = []
+
+    # Create switches level by level, numbered depth-first from the root
     def add_tree_level(parent_switch, current_depth):
-        nonlocal switch_counter, host_counter
-        
         if current_depth > depth:
             return []
-        
+
         children = []
         for _ in range(fanout):
-            # Add switch
-            switch = net.addSwitch('s%d' % switch_counter, protocols='OpenFlow13')
+            switch = net.addSwitch('s%d' % (len(switches) + 1), **SWITCH_PARAMS)
             switches.append(switch)
-            
-            # Add host for this switch
-            host = net.addHost('h%d' % host_counter, ip='10.0.0.%d/24' % host_counter)
-            hosts.append(host)
-            
-            # Link host to switch
-            net.addLink(host, switch)
-            
-            # Link switch to parent (if not root)
-            if parent_switch is not None:
-                net.addLink(parent_switch, switch)
-            
-            switch_counter += 1
-            host_counter += 1
+            uplinks.append((parent_switch, switch))
             children.append(switch)
-            
+
             # Recursively add children if not at max depth
             if current_depth < depth:
                 add_tree_level(switch, current_depth + 1)
-        
+
         return children
-    
-    # Build the tree starting with root
-    info('*** Adding switches and hosts\n')
-    root = net.addSwitch('s1', protocols='OpenFlow13')
-    switches.append(root)
-    
-    # Add host for root
-    root_host = net.addHost('h1', ip='10.0.0.1/24')
-    hosts.append(root_host)
-    net.addLink(root_host, root)
-    
-    switch_counter = 2
-    host_counter = 2
-    
-    # Build tree from root
-    add_tree_level(root, 1)
+
+    info('*** Adding switches (%d)\n' % num_nodes)
+    with timer.phase('add switches'):
+        root = net.addSwitch('s1', **SWITCH_PARAMS)
+        switches.append(root)
+        add_tree_level(root, 1)
+
+    # Add a host for every switch
+    info('*** Adding hosts (%d)\n' % num_nodes)
+    with timer.phase('add hosts'):
+        hosts = builder.add_hosts([('h%d' % i, {'ip': addresses.allocate()})
+                                   for i in range(1, len(switches) + 1)])
+
+    info('*** Creating links\n')
+    with timer.phase('add links'):
+        builder.add_links([(host, switch, {}) for host, switch in zip(hosts, switches)] +
+                          [(parent, switch, {}) for parent, switch in uplinks])
 
     info('*** Starting network\n')
-    net.start()
+    if not start_network(net, timer, wait_timeout):
+        error('*** Not all switches connected within %ss\n' % wait_timeout)
+    timer.report()
+    if timing_file:
+        timer.save(timing_file, topology='tree', depth=depth, fanout=fanout,
+                   switches=len(switches), hosts=len(hosts))
 
     info('*** Network topology: Tree (depth=%d, fanout=%d)\n' % (depth, fanout))
     info('*** Total switches: %d\n' % len(switches))
@@ -106,14 +110,15 @@ def treeTopology(depth=2, fanout=2, controller_ip='127.0.0.1', controller_port=6
     info('*** Web UI: http://localhost:3000\n')
     info('*** Floodlight API: http://localhost:8080\n')
     info('\n')
-    info('*** Test commands:\n')
-    info('  mininet> pingall               # Test connectivity\n')
-    info('  mininet> h1 ping h%d           # Ping across network\n' % len(hosts))
-    info('  mininet> iperf h1 h%d          # Test bandwidth\n' % len(hosts))
-    info('\n')
-    info('*** Running CLI. Press Ctrl-D to exit\n')
+    if interactive:
+        info('*** Test commands:\n')
+        info('  mininet> pingall               # Test connectivity\n')
+        info('  mininet> h1 ping h%d           # Ping across network\n' % len(hosts))
+        info('  mininet> iperf h1 h%d          # Test bandwidth\n' % len(hosts))
+        info('\n')
+        info('*** Running CLI. Press Ctrl-D to exit\n')
 
-    CLI(net)
+        CLI(net)
 
     info('*** Stopping network\n')
     net.stop()
@@ -143,6 +148,7 @@ if __name__ == '__main__':
         default=6653,
         help='Floodlight controller port (default: 6653)'
     )
+    add_scale_args(parser)
     args = parser.parse_args()
     
     setLogLevel('info')
@@ -152,5 +158,10 @@ if __name__ == '__main__':
         depth=args.depth,
         fanout=args.fanout,
         controller_ip=args.controller,
-        controller_port=args.port
+        controller_port=args.port,
+        subnet=args.subnet,
+        wait_timeout=args.wait,
+        timing_file=args.timing,
+        interactive=not args.no_cli,
+        workers=args.workers
     )
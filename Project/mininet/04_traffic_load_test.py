@@ -11,40 +11,48 @@ Usage:
     sudo python 04_traffic_load_test.py --hosts 6 --duration 30
     sudo python 04_traffic_load_test.py --hosts 4 --bandwidth 50M --flows 4
     sudo python 04_traffic_load_test.py --controller 192.168.1.100 --port 6653
+    sudo python 04_traffic_load_test.py --instance 2 --no-cli  # parallel-safe
 """
 
 import argparse
 import time
 import subprocess
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info, error
 from random import sample
 
+from ovs_provision import BulkOVSSwitch
+from iperf_pool import IperfServerPool
+from instance import Instance, add_instance_args
+
 def trafficLoadTopology(num_hosts=4, controller_ip='127.0.0.1', controller_port=6653,
-                       bandwidth='10M', duration=20, num_flows=None, auto_traffic=True):
+                       bandwidth='10M', duration=20, num_flows=None, auto_traffic=True,
+                       instance=None, interactive=True):
     """Create a simple topology for traffic load testing"""
 
+    instance = instance or Instance()
+
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         autoSetMacs=True
     )
 
     info('*** Adding controller\n')
     controller = net.addController(
-        'c0',
+        instance.name('c0'),
         controller=RemoteController,
         ip=controller_ip,
-        port=controller_port
+        port=instance.port(controller_port)
     )
 
     info('*** Building simple topology with %d hosts\n' % num_hosts)
 
     # Create a simple 2-switch linear topology
-    s1 = net.addSwitch('s1', protocols='OpenFlow13')
-    s2 = net.addSwitch('s2', protocols='OpenFlow13')
+    s1 = net.addSwitch(instance.name('s1'), dpid=instance.dpid(1), protocols='OpenFlow13')
+    s2 = net.addSwitch(instance.name('s2'), dpid=instance.dpid(2), protocols='OpenFlow13')
 
     # Connect switches in a line
     net.addLink(s1, s2)
@@ -54,12 +62,12 @@ def trafficLoadTopology(num_hosts=4, controller_ip='127.0.0.1', controller_port=
     switches = [s1, s2]
 
     for i in range(1, num_hosts + 1):
-        host = net.addHost('h%d' % i, ip='10.0.0.%d/24' % i)
+        host = net.addHost(instance.name('h%d' % i), ip=instance.ip(i))
         hosts.append(host)
         # Distribute hosts evenly across switches
         switch = switches[(i - 1) % len(switches)]
         net.addLink(host, switch)
-        info('  Added h%d (10.0.0.%d) connected to %s\n' % (i, i, switch.name))
+        info('  Added %s (%s) connected to %s\n' % (host.name, instance.ip(i, False), switch.name))
 
     info('*** Starting network\n')
     net.start()
@@ -70,7 +78,7 @@ def trafficLoadTopology(num_hosts=4, controller_ip='127.0.0.1', controller_port=
 
     info('*** Network ready!\n')
     info('*** Topology: %d hosts distributed across 2 switches (s1---s2)\n' % num_hosts)
-    info('*** Controller: Floodlight at %s:%d\n' % (controller_ip, controller_port))
+    info('*** Controller: Floodlight at %s:%d\n' % (controller_ip, instance.port(controller_port)))
     info('*** Web UI: http://localhost:3000\n')
     info('*** Floodlight API: http://localhost:8080\n')
     info('\n')
@@ -83,7 +91,8 @@ def trafficLoadTopology(num_hosts=4, controller_ip='127.0.0.1', controller_port=
         info('    - Number of flows: %s\n' % (num_flows if num_flows else 'auto'))
         info('\n')
 
-        generate_traffic_load(net, hosts, bandwidth, duration, num_flows)
+        generate_traffic_load(net, hosts, bandwidth, duration, num_flows,
+                              instance.port_offset, interactive)
     else:
         info('*** Manual mode - use CLI to generate traffic\n')
         info('*** Example commands:\n')
@@ -97,7 +106,8 @@ def trafficLoadTopology(num_hosts=4, controller_ip='127.0.0.1', controller_port=
     net.stop()
 
 
-def generate_traffic_load(net, hosts, bandwidth, duration, num_flows):
+def generate_traffic_load(net, hosts, bandwidth, duration, num_flows, port_offset=0,
+                          interactive=True):
     """Generate high traffic load between multiple host pairs"""
 
     if num_flows is None:
@@ -105,13 +115,13 @@ def generate_traffic_load(net, hosts, bandwidth, duration, num_flows):
         num_flows = max(2, len(hosts) // 2)
 
     info('*** Setting up iperf servers on all hosts\n')
-    # Start iperf servers on all hosts (different ports to allow multiple concurrent flows)
-    for i, host in enumerate(hosts):
-        port = 5001 + i
-        host.cmd('iperf -s -p %d &' % port)
+    # One persistent server per host; the pool hands out ports 5001 + host index in order
+    pool = IperfServerPool(port_offset=port_offset)
+    for host in hosts:
+        port = pool.acquire(host)
         info('  Started iperf server on %s (port %d)\n' % (host.name, port))
 
-    time.sleep(1)  # Let servers start
+    pool.wait_ready()  # Check the listening sockets instead of sleeping
 
     # TODO(human): Implement traffic flow selection strategy
     # This is where you decide which host pairs will exchange traffic.
@@ -126,7 +136,7 @@ def generate_traffic_load(net, hosts, bandwidth, duration, num_flows):
     #
     # Example return format: [(hosts[0], hosts[1], 5002), (hosts[2], hosts[3], 5004)]
 
-    traffic_flows = select_traffic_flows(hosts, num_flows)
+    traffic_flows = select_traffic_flows(hosts, num_flows, base_ports['tcp'])
 
     info('*** Starting %d concurrent traffic flows\n' % len(traffic_flows))
 
@@ -155,6 +165,7 @@ def generate_traffic_load(net, hosts, bandwidth, duration, num_flows):
         results.append((src_name, dst_name, stdout.decode('utf-8')))
 
     info('*** Traffic generation completed!\n')
+    pool.release_all()
     info('*** Results summary:\n')
 
     # Parse and display results
@@ -166,22 +177,26 @@ def generate_traffic_load(net, hosts, bandwidth, duration, num_flows):
                 info('  %s -> %s: %s\n' % (src_name, dst_name, line.strip()))
                 break
 
-    info('\n*** Press Enter to continue or Ctrl-C to exit...\n')
-    try:
-        input()
-        info('*** Entering CLI mode for additional testing\n')
-        CLI(net)
-    except KeyboardInterrupt:
-        info('\n*** Exiting...\n')
+    if interactive:
+        info('\n*** Press Enter to continue or Ctrl-C to exit...\n')
+        try:
+            input()
+            info('*** Entering CLI mode for additional testing\n')
+            CLI(net)
+        except KeyboardInterrupt:
+            info('\n*** Exiting...\n')
+
+    pool.stop()
 
 
-def select_traffic_flows(hosts, num_flows):
+def select_traffic_flows(hosts, num_flows, base_port=5001):
     """
     Select which host pairs will exchange traffic.
 
     Args:
         hosts: List of Mininet host objects
         num_flows: Desired number of concurrent traffic flows
+        base_port: iperf server port of the first host
 
     Returns:
         List of tuples: (source_host, dest_host, dest_port)
@@ -193,7 +208,7 @@ def select_traffic_flows(hosts, num_flows):
     for i, src in enumerate(hosts):
         for j, dst in enumerate(hosts):
             if i != j:  # Avoid host talking to itself
-                dest_port = 5001 + j  # Port matches destination host index
+                dest_port = base_port + j  # Port matches destination host index
                 all_pairs.append((src, dst, dest_port))
 
     # Limit to requested number of flows
@@ -247,13 +262,23 @@ if __name__ == '__main__':
         action='store_true',
         help='Manual mode - open CLI instead of auto-generating traffic'
     )
+    parser.add_argument(
+        '--no-cli',
+        action='store_true',
+        help='Exit after the traffic run instead of offering the CLI (for batch runs)'
+    )
+    add_instance_args(parser)
     args = parser.parse_args()
+    instance = Instance.from_args(args)
 
     setLogLevel('info')
     info('*** High Traffic Load Simulation\n')
     info('*** Hosts: %d, Bandwidth: %s, Duration: %ds\n' %
          (args.hosts, args.bandwidth, args.duration))
-    info('*** Controller at %s:%d\n' % (args.controller, args.port))
+    info('*** Controller at %s:%d\n' % (args.controller, instance.port(args.port)))
+    if instance.index or instance.prefix:
+        info('*** Instance %d: prefix "%s", subnet %s, port offset %d\n' %
+             (instance.index, instance.prefix, instance.subnet, instance.port_offset))
     info('\n')
 
     trafficLoadTopology(
@@ -263,5 +288,7 @@ if __name__ == '__main__':
         bandwidth=args.bandwidth,
         duration=args.duration,
         num_flows=args.flows,
-        auto_traffic=not args.manual
+        auto_traffic=not args.manual,
+        instance=instance,
+        interactive=not args.no_cli
     )
@@ -31,10 +31,12 @@ import time
 import subprocess
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info, error, warn
 
+from ovs_provision import BulkOVSSwitch, set_controllers
+
 
 def check_controller_status(ip, port):
     """Check if controller is reachable"""
@@ -55,7 +57,7 @@ def multi_controller_topology(c0_ip='127.0.0.1', c0_port=6653, c1_ip='127.0.0.1'
     info('*** Creating network with multiple controllers\n')
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         autoSetMacs=True
     )
 
@@ -101,9 +103,8 @@ def multi_controller_topology(c0_ip='127.0.0.1', c0_port=6653, c1_ip='127.0.0.1'
 
     # Configure switches to use both controllers
     info('*** Configuring multi-controller setup\n')
+    set_controllers([s1, s2, s3], [f'tcp:{c0_ip}:{c0_port}', f'tcp:{c1_ip}:{c1_port}'])
     for switch in [s1, s2, s3]:
-        switch.cmd('ovs-vsctl set-controller', switch.name,
-                   f'tcp:{c0_ip}:{c0_port} tcp:{c1_ip}:{c1_port}')
         info(f'  {switch.name}: Connected to both controllers\n')
 
     info('*** Waiting for network stabilization (5s)...\n')
@@ -153,7 +154,7 @@ def run_automated_failover_test():
     info('*** Starting Automated Failover Test\n\n')
 
     # 1. Create the network topology
-    net = Mininet(controller=RemoteController, switch=OVSSwitch, autoSetMacs=True)
+    net = Mininet(controller=RemoteController, switch=BulkOVSSwitch, autoSetMacs=True)
 
     c0 = net.addController('c0', controller=RemoteController, ip='127.0.0.1', port=6653)
     c1 = net.addController('c1', controller=RemoteController, ip='127.0.0.1', port=6654)
@@ -175,8 +176,7 @@ def run_automated_failover_test():
     net.start()
 
     # 2. Configure multi-controller setup
-    for switch in [s1, s2, s3]:
-        switch.cmd('ovs-vsctl set-controller', switch.name, 'tcp:127.0.0.1:6653 tcp:127.0.0.1:6654')
+    set_controllers([s1, s2, s3], ['tcp:127.0.0.1:6653', 'tcp:127.0.0.1:6654'])
 
     info('*** Waiting for network stabilization (5s)...\n')
     time.sleep(5)
@@ -39,11 +39,14 @@ Usage:
 import time
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info, warn
 from mininet.link import TCLink
 
+from ovs_provision import BulkOVSSwitch
+from node_batch import run_batch, run_on_all
+
 
 def link_failure_topology(controller_ip='127.0.0.1', controller_port=6653, auto_test=False):
     """Create a redundant topology for link failure testing"""
@@ -51,7 +54,7 @@ def link_failure_topology(controller_ip='127.0.0.1', controller_port=6653, auto_
     info('*** Creating network with redundant paths\n')
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         link=TCLink,
         autoSetMacs=True
     )
@@ -145,13 +148,14 @@ def run_link_failure_test(net, test_link):
     # Start background traffic
     h1, h2, h3 = net.get('h1', 'h2', 'h3')
     info('*** Starting iperf servers\n')
-    h2.cmd('iperf -s -u -p 5001 &')
-    h3.cmd('iperf -s -p 5002 &')
+    run_batch({h2: ['iperf -s -u -p 5001 &'], h3: ['iperf -s -p 5002 &']})
     time.sleep(1)
 
     info('*** Starting background traffic flows\n')
-    h1.cmd('iperf -c 10.0.0.2 -u -b 10M -t 60 -p 5001 > /tmp/iperf_h1h2.log 2>&1 &')
-    h1.cmd('iperf -c 10.0.0.3 -b 5M -t 60 -p 5002 > /tmp/iperf_h1h3.log 2>&1 &')
+    run_batch({h1: [
+        'iperf -c 10.0.0.2 -u -b 10M -t 60 -p 5001 > /tmp/iperf_h1h2.log 2>&1 &',
+        'iperf -c 10.0.0.3 -b 5M -t 60 -p 5002 > /tmp/iperf_h1h3.log 2>&1 &',
+    ]})
     info('  h1 -> h2: 10 Mbps UDP\n')
     info('  h1 -> h3: 5 Mbps TCP\n')
     time.sleep(2)
@@ -211,9 +215,7 @@ def run_link_failure_test(net, test_link):
 
     # Clean up background processes
     info('*** Stopping background traffic\n')
-    h1.cmd('killall iperf')
-    h2.cmd('killall iperf')
-    h3.cmd('killall iperf')
+    run_on_all([h1, h2, h3], 'killall iperf')
 
     info('*** Press Enter to enter CLI or Ctrl-C to exit...\n')
     try:
@@ -28,11 +28,15 @@ Usage:
 import time
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info, warn
 from mininet.link import TCLink
 
+from ovs_provision import BulkOVSSwitch
+from iperf_pool import IperfServerPool
+from node_batch import run_batch, run_on_all
+
 
 def congestion_topology(controller_ip='127.0.0.1', controller_port=6653):
     """Create topology for congestion testing"""
@@ -40,7 +44,7 @@ def congestion_topology(controller_ip='127.0.0.1', controller_port=6653):
     info('*** Creating congestion test network\n')
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         link=TCLink,
         autoSetMacs=True
     )
@@ -95,7 +99,7 @@ def congestion_topology(controller_ip='127.0.0.1', controller_port=6653):
     return net
 
 
-def elephant_flow_pattern(net, duration=30):
+def elephant_flow_pattern(net, pool, duration=30):
     """Generate elephant flows (large, long-lived)"""
 
     info('\n' + '='*70 + '\n')
@@ -107,19 +111,21 @@ def elephant_flow_pattern(net, duration=30):
 
     h1, h2, h3, h4 = net.get('h1', 'h2', 'h3', 'h4')
 
-    # Start iperf servers
-    info('*** Starting iperf servers\n')
-    h3.cmd('iperf -s -p 5001 &')
-    h4.cmd('iperf -s -p 5002 &')
-    time.sleep(1)
+    # Reserve iperf servers
+    info('*** Reserving iperf servers\n')
+    h3_port = pool.acquire(h3)
+    h4_port = pool.acquire(h4)
+    pool.wait_ready()
 
     # Generate elephant flows (TCP, will fill bandwidth)
     info(f'*** Generating elephant flows ({duration}s)\n')
     info('  h1 -> h3: TCP bulk transfer (elephant)\n')
     info('  h2 -> h4: TCP bulk transfer (elephant)\n\n')
 
-    h1.cmd(f'iperf -c 10.0.0.3 -p 5001 -t {duration} -i 5 &')
-    h2.cmd(f'iperf -c 10.0.0.4 -p 5002 -t {duration} -i 5 &')
+    run_batch({
+        h1: [f'iperf -c 10.0.0.3 -p {h3_port} -t {duration} -i 5 &'],
+        h2: [f'iperf -c 10.0.0.4 -p {h4_port} -t {duration} -i 5 &'],
+    })
 
     info('*** Elephant flows running - bottleneck link should be RED in OpenVis\n')
     info(f'*** Monitoring for {duration} seconds...\n\n')
@@ -127,10 +133,10 @@ def elephant_flow_pattern(net, duration=30):
     time.sleep(duration)
 
     info('*** Elephant flows completed\n')
-    cleanup_traffic(net)
+    cleanup_traffic(net, pool)
 
 
-def hotspot_pattern(net, duration=30):
+def hotspot_pattern(net, pool, duration=30):
     """Generate hotspot congestion (many-to-one)"""
 
     info('\n' + '='*70 + '\n')
@@ -143,17 +149,17 @@ def hotspot_pattern(net, duration=30):
 
     h1, h2, h3, h4, h5, h6 = net.get('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
 
-    # Start iperf server on hotspot destination
-    info('*** Starting iperf server on h3 (hotspot destination)\n')
-    h3.cmd('iperf -s -p 5001 &')
-    time.sleep(1)
+    # Reserve a UDP iperf server on hotspot destination
+    info('*** Reserving iperf server on h3 (hotspot destination)\n')
+    h3_port = pool.acquire(h3, 'udp')
+    pool.wait_ready()
 
     # All other hosts send to h3
     info(f'*** All hosts sending to h3 ({duration}s)\n')
     senders = [h1, h2, h4, h5, h6]
     for i, host in enumerate(senders):
         info(f'  {host.name} -> h3: 20 Mbps UDP\n')
-        host.cmd(f'iperf -c 10.0.0.3 -u -b 20M -p 5001 -t {duration} &')
+        host.cmd(f'iperf -c 10.0.0.3 -u -b 20M -p {h3_port} -t {duration} &')
         time.sleep(0.5)  # Stagger start slightly
 
     info('\n*** Hotspot pattern running - convergent links should be RED\n')
@@ -163,10 +169,10 @@ def hotspot_pattern(net, duration=30):
     time.sleep(duration)
 
     info('*** Hotspot pattern completed\n')
-    cleanup_traffic(net)
+    cleanup_traffic(net, pool)
 
 
-def mixed_pattern(net, duration=40):
+def mixed_pattern(net, pool, duration=40):
     """Generate mixed traffic: elephants + mice"""
 
     info('\n' + '='*70 + '\n')
@@ -178,16 +184,18 @@ def mixed_pattern(net, duration=40):
 
     h1, h2, h3, h4, h5, h6 = net.get('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
 
-    # Start servers
-    info('*** Starting iperf servers\n')
-    for i, host in enumerate([h3, h4, h5, h6]):
-        host.cmd(f'iperf -s -p {5001 + i} &')
-    time.sleep(1)
+    # Reserve servers: TCP for the elephant, UDP for the mice
+    info('*** Reserving iperf servers\n')
+    h3_tcp = pool.acquire(h3)
+    h4_udp = pool.acquire(h4, 'udp')
+    h6_udp = pool.acquire(h6, 'udp')
+    h3_udp = pool.acquire(h3, 'udp')
+    pool.wait_ready()
 
     # Elephant flows (background)
     info('*** Starting elephant flows (background)\n')
     info('  h1 -> h3: TCP bulk (elephant)\n')
-    h1.cmd(f'iperf -c 10.0.0.3 -p 5001 -t {duration} &')
+    h1.cmd(f'iperf -c 10.0.0.3 -p {h3_tcp} -t {duration} &')
 
     time.sleep(2)
 
@@ -198,18 +206,18 @@ def mixed_pattern(net, duration=40):
     # Simulate bursty mice flows
     for i in range(duration // 5):
         info(f'  Burst {i+1}/{duration//5}\n')
-        h2.cmd('iperf -c 10.0.0.4 -p 5002 -t 2 -u -b 30M &')
+        h2.cmd(f'iperf -c 10.0.0.4 -p {h4_udp} -t 2 -u -b 30M &')
         time.sleep(1)
-        h5.cmd('iperf -c 10.0.0.6 -p 5004 -t 1 -u -b 15M &')
+        h5.cmd(f'iperf -c 10.0.0.6 -p {h6_udp} -t 1 -u -b 15M &')
         time.sleep(2)
-        h6.cmd('iperf -c 10.0.0.3 -p 5001 -t 1 -u -b 10M &')
+        h6.cmd(f'iperf -c 10.0.0.3 -p {h3_udp} -t 1 -u -b 10M &')
         time.sleep(2)
 
     info('\n*** Mixed pattern completed\n')
-    cleanup_traffic(net)
+    cleanup_traffic(net, pool)
 
 
-def oscillating_pattern(net, duration=40):
+def oscillating_pattern(net, pool, duration=40):
     """Generate oscillating traffic that creates dynamic congestion"""
 
     info('\n' + '='*70 + '\n')
@@ -221,18 +229,18 @@ def oscillating_pattern(net, duration=40):
 
     h1, h2, h3, h4 = net.get('h1', 'h2', 'h3', 'h4')
 
-    # Start servers
-    h3.cmd('iperf -s -u -p 5001 &')
-    h4.cmd('iperf -s -u -p 5002 &')
-    time.sleep(1)
+    # Reserve servers
+    h3_port = pool.acquire(h3, 'udp')
+    h4_port = pool.acquire(h4, 'udp')
+    pool.wait_ready()
 
     cycles = 4
     for cycle in range(cycles):
         # Ramp up
         info(f'*** Cycle {cycle + 1}/{cycles}: Ramping UP\n')
         bandwidth = 80  # 80 Mbps
-        h1.cmd(f'iperf -c 10.0.0.3 -u -b {bandwidth}M -p 5001 -t 5 &')
-        h2.cmd(f'iperf -c 10.0.0.4 -u -b {bandwidth}M -p 5002 -t 5 &')
+        h1.cmd(f'iperf -c 10.0.0.3 -u -b {bandwidth}M -p {h3_port} -t 5 &')
+        h2.cmd(f'iperf -c 10.0.0.4 -u -b {bandwidth}M -p {h4_port} -t 5 &')
         time.sleep(5)
 
         # Ramp down (quiet period)
@@ -240,13 +248,13 @@ def oscillating_pattern(net, duration=40):
         time.sleep(5)
 
     info('*** Oscillating pattern completed\n')
-    cleanup_traffic(net)
+    cleanup_traffic(net, pool)
 
 
-def cleanup_traffic(net):
-    """Stop all iperf processes"""
-    for host in net.hosts:
-        host.cmd('killall iperf 2>/dev/null')
+def cleanup_traffic(net, pool):
+    """Stop all iperf clients and return the servers to the pool"""
+    run_on_all(net.hosts, "pkill -f 'iperf -c' 2>/dev/null")
+    pool.release_all()
     time.sleep(1)
 
 
@@ -275,8 +283,11 @@ def run_congestion_test(pattern='mixed', controller_ip='127.0.0.1', controller_p
         'oscillating': oscillating_pattern
     }
 
+    # Servers are started once and shared by the pattern's tests
+    pool = IperfServerPool()
+
     if pattern in patterns:
-        patterns[pattern](net)
+        patterns[pattern](net, pool)
     else:
         warn(f'Unknown pattern: {pattern}\n')
         warn(f'Available: {", ".join(patterns.keys())}\n')
@@ -285,6 +296,7 @@ def run_congestion_test(pattern='mixed', controller_ip='127.0.0.1', controller_p
     CLI(net)
 
     info('*** Stopping network\n')
+    pool.stop()
     net.stop()
 
 
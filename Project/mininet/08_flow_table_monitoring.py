@@ -24,10 +24,13 @@ Usage:
 import time
 import argparse
 from mininet.net import Mininet
-from mininet.node import RemoteController, OVSSwitch
+from mininet.node import RemoteController
 from mininet.cli import CLI
 from mininet.log import setLogLevel, info, warn, error
 
+from ovs_provision import BulkOVSSwitch
+from node_batch import run_batch, run_on_all
+
 
 def flow_monitoring_topology(controller_ip='127.0.0.1', controller_port=6653):
     """Create simple topology for flow monitoring"""
@@ -35,7 +38,7 @@ def flow_monitoring_topology(controller_ip='127.0.0.1', controller_port=6653):
     info('*** Creating flow monitoring network\n')
     net = Mininet(
         controller=RemoteController,
-        switch=OVSSwitch,
+        switch=BulkOVSSwitch,
         autoSetMacs=True
     )
 
@@ -74,17 +77,25 @@ def show_flow_tables(net, switches=None):
     info('*** FLOW TABLE SNAPSHOT ***\n')
     info('='*70 + '\n')
 
+    # Dump every switch's flow table in one batch
+    outputs = run_batch({
+        switch: [
+            f'ovs-ofctl dump-flows {switch.name} -O OpenFlow13 | grep -c "cookie"',
+            f'ovs-ofctl dump-flows {switch.name} -O OpenFlow13 --no-stats',
+        ]
+        for switch in switches
+    })
+
     for switch in switches:
         info(f'\n{switch.name}:\n')
 
         # Get flow count
-        result = switch.cmd('ovs-ofctl dump-flows', switch.name, '-O OpenFlow13 | grep -c "cookie"')
+        result, table = outputs[switch.name]
         flow_count = result.strip()
         info(f'  Total flows: {flow_count}\n')
 
         # Show flow table summary
-        result = switch.cmd('ovs-ofctl dump-flows', switch.name, '-O OpenFlow13 --no-stats')
-        flows = [f.strip() for f in result.split('\n') if 'cookie' in f]
+        flows = [f.strip() for f in table.split('\n') if 'cookie' in f]
 
         # Analyze flows
         priorities = {}
@@ -195,20 +206,22 @@ def flow_stress_test(net, num_flows=100):
     info(f'\n*** Generating {num_flows} unique flows\n')
     info('  Using UDP with varying destination ports...\n')
 
-    # Start servers
-    for port in range(5001, 5001 + min(num_flows, 100)):
-        h2.cmd(f'nc -u -l -p {port} > /dev/null 2>&1 &')
+    # Start servers (one shell round-trip for all of them)
+    run_batch({h2: [f'nc -u -l -p {port} > /dev/null 2>&1 &'
+                    for port in range(5001, 5001 + min(num_flows, 100))]})
 
     time.sleep(1)
 
-    # Generate flows
-    for i in range(num_flows):
-        port = 5001 + (i % 100)
-        # Send small packet to create flow entry
-        h1.cmd(f'echo "flow_{i}" | nc -u -w 0 10.0.0.2 {port} &')
+    # Generate flows in batches of 20
+    for start in range(0, num_flows, 20):
+        batch = range(start, min(start + 20, num_flows))
+        # Send small packets to create flow entries
+        run_batch({h1: [f'echo "flow_{i}" | nc -u -w 0 10.0.0.2 {5001 + (i % 100)} &'
+                        for i in batch]})
 
-        if (i + 1) % 20 == 0:
-            info(f'  Generated {i + 1}/{num_flows} flows\n')
+        # Pace all but the last batch; the wait below covers that one
+        if batch.stop < num_flows:
+            info(f'  Generated {batch.stop}/{num_flows} flows\n')
             time.sleep(0.5)
 
     info('\n*** Waiting for flow entries to populate (3s)...\n')
@@ -224,8 +237,7 @@ def flow_stress_test(net, num_flows=100):
     info('\n*** Flow stress test complete\n')
 
     # Cleanup
-    h2.cmd('killall nc 2>/dev/null')
-    h1.cmd('killall nc 2>/dev/null')
+    run_on_all([h2, h1], 'killall nc 2>/dev/null')
 
     return stats
 
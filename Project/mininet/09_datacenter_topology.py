@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Data-Center Topologies: Fat-Tree, Leaf-Spine and Jellyfish
+Multipath fabrics for testing controller ECMP and path computation.
+
+Topologies:
+    fattree     k-ary fat-tree, e.g. k=4: 4 core, 8 aggregation, 8 edge, 16 hosts
+    leafspine   every leaf connected to every spine; oversubscription applies
+                through the uplink bandwidth (--bw)
+    jellyfish   random regular graph of switches
+
+All of them contain loops, so the controller must handle multipath (ECMP,
+or at least loop-free forwarding) - a plain learning switch will flood.
+The adjacency, port numbers and equal-cost shortest paths between every
+pair of edge switches can be exported with --paths for the controller or
+for checking its path choices. Hosts are h1..hN at 10.0.0.1.., so the
+traffic patterns of 07_congestion_patterns.py run on these fabrics too.
+
+Usage:
+    sudo python3 09_datacenter_topology.py fattree -k 4
+    sudo python3 09_datacenter_topology.py leafspine --leaves 8 --spines 4 --hosts-per-leaf 12 \\
+        --oversubscription 3 --bw 100
+    sudo python3 09_datacenter_topology.py jellyfish --switches 50 --degree 5 --seed 1
+    sudo python3 09_datacenter_topology.py fattree -k 8 --paths fattree8.json --wait 60 --no-cli
+    sudo python3 09_datacenter_topology.py leafspine --pattern hotspot
+    sudo python3 09_datacenter_topology.py fattree --controller 192.168.1.100 --port 6653
+"""
+
+import argparse
+import importlib
+import ipaddress
+from mininet.net import Mininet
+from mininet.node import RemoteController
+from mininet.link import Link, TCLink
+from mininet.cli import CLI
+from mininet.log import setLogLevel, info, error
+
+from ovs_provision import BulkOVSSwitch
+from parallel_build import ParallelBuilder
+from iperf_pool import IperfServerPool
+from scale import AddressPool, PhaseTimer, SWITCH_PARAMS, start_network, add_scale_args
+from datacenter import MAX_PATHS, add_fabric_args, fabric_from_args
+
+# Traffic patterns of 07_congestion_patterns.py (they use hosts h1..h6 and
+# hard-code their addresses, 10.0.0.1..6)
+PATTERNS = {
+    'elephant': 'elephant_flow_pattern',
+    'hotspot': 'hotspot_pattern',
+    'mixed': 'mixed_pattern',
+    'oscillating': 'oscillating_pattern',
+}
+PATTERN_HOSTS = 6
+PATTERN_NETWORK = ipaddress.ip_address('10.0.0.0')
+
+
+def build_fabric(net, fabric, addresses, timer, workers=0):
+    """Add a generated fabric's switches, hosts and links to net"""
+    builder = ParallelBuilder(net, workers)
+    with timer.phase('add switches'):
+        for switch in fabric.switches:
+            net.addSwitch(switch, **SWITCH_PARAMS)
+
+    with timer.phase('add hosts'):
+        builder.add_hosts([(host, {'ip': addresses.allocate()}) for host in fabric.hosts])
+
+    # Explicit port numbers keep the switches' ports identical to the path table
+    with timer.phase('add links'):
+        builder.add_links([(node1, node2,
+                            dict(port1=fabric.port(node1, node2),
+                                 port2=fabric.port(node2, node1), **link_params))
+                           for node1, node2, link_params in fabric.links])
+
+
+def run_pattern(net, pattern):
+    """Run one of the congestion patterns of 07_congestion_patterns.py"""
+    patterns = importlib.import_module('07_congestion_patterns')
+    pool = IperfServerPool()
+    try:
+        getattr(patterns, PATTERNS[pattern])(net, pool)
+    finally:
+        pool.stop()
+
+
+def datacenter_topology(fabric, controller_ip='127.0.0.1', controller_port=6653,
+                        subnet='10.0.0.0/16', paths_file=None, max_paths=MAX_PATHS,
+                        pattern=None, wait_timeout=None, timing_file=None,
+                        interactive=True, workers=0):
+    """Build a generated data-center fabric and connect it to the controller"""
+
+    addresses = AddressPool(subnet)
+    addresses.check(len(fabric.hosts))
+    timer = PhaseTimer()
+    info('*** %s\n' % fabric.summary())
+
+    if paths_file:
+        info('*** Computing ECMP path table\n')
+        with timer.phase('path table'):
+            table = fabric.save_path_table(paths_file, max_paths)
+        info('  %d switch pairs written to %s\n' % (len(table['paths']), paths_file))
+        if table['unreachable_pairs']:
+            error('*** %d switch pairs are disconnected\n' % table['unreachable_pairs'])
+
+    shaped = any(link_params for _, _, link_params in fabric.links)
+    net = Mininet(
+        controller=RemoteController,
+        switch=BulkOVSSwitch,
+        link=TCLink if shaped else Link,
+        autoSetMacs=True
+    )
+
+    info('*** Adding controller\n')
+    net.addController('c0', controller=RemoteController, ip=controller_ip, port=controller_port)
+
+    info('*** Building %s\n' % fabric.name)
+    build_fabric(net, fabric, addresses, timer, workers)
+
+    info('*** Starting network\n')
+    if not start_network(net, timer, wait_timeout):
+        error('*** Not all switches connected within %ss\n' % wait_timeout)
+    timer.report()
+    if timing_file:
+        timer.save(timing_file, topology=fabric.name, params=fabric.params,
+                   switches=len(fabric.switches), hosts=len(fabric.hosts))
+
+    info('*** Network topology: %s\n' % fabric.summary())
+    info('*** Controller: %s:%d\n' % (controller_ip, controller_port))
+    info('\n')
+
+    if pattern:
+        if len(fabric.hosts) < PATTERN_HOSTS:
+            error('*** Pattern %s needs at least %d hosts\n' % (pattern, PATTERN_HOSTS))
+        else:
+            run_pattern(net, pattern)
+
+    if interactive:
+        info('*** Test commands:\n')
+        info('  mininet> pingall               # Test connectivity (all paths)\n')
+        info('  mininet> h1 ping h%d           # Ping across the fabric\n' % len(fabric.hosts))
+        info('  mininet> iperf h1 h%d          # Test bandwidth\n' % len(fabric.hosts))
+        info('\n')
+        info('*** Running CLI. Press Ctrl-D to exit\n')
+
+        CLI(net)
+
+    info('*** Stopping network\n')
+    net.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Data-center Mininet topologies')
+    add_fabric_args(parser)
+    parser.add_argument(
+        '--paths',
+        metavar='FILE',
+        help='Export adjacency, ports and ECMP paths as JSON'
+    )
+    parser.add_argument(
+        '--max-paths',
+        type=int,
+        default=MAX_PATHS,
+        help='Equal-cost paths listed per switch pair (default: %d)' % MAX_PATHS
+    )
+    parser.add_argument(
+        '--pattern',
+        choices=sorted(PATTERNS),
+        help='Run a traffic pattern of 07_congestion_patterns.py after bring-up'
+    )
+    parser.add_argument(
+        '--controller', '-c',
+        default='127.0.0.1',
+        help='Controller IP address (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port', '-p',
+        type=int,
+        default=6653,
+        help='Controller port (default: 6653)'
+    )
+    add_scale_args(parser)
+    args = parser.parse_args()
+
+    # Unshaped links cannot express a ratio, and 07's patterns only know 10.0.0.x
+    if args.oversubscription is not None and args.bw is None:
+        parser.error('--oversubscription needs --bw (unshaped uplinks cannot be oversubscribed)')
+    if args.pattern and ipaddress.ip_network(args.subnet).network_address != PATTERN_NETWORK:
+        parser.error('--pattern needs hosts at 10.0.0.x (07_congestion_patterns.py '
+                     'hard-codes them), so it cannot be combined with --subnet %s' % args.subnet)
+
+    fabric = fabric_from_args(args)
+
+    setLogLevel('info')
+    info('*** Controller at %s:%d\n' % (args.controller, args.port))
+    datacenter_topology(
+        fabric,
+        controller_ip=args.controller,
+        controller_port=args.port,
+        subnet=args.subnet,
+        paths_file=args.paths,
+        max_paths=args.max_paths,
+        pattern=args.pattern,
+        wait_timeout=args.wait,
+        timing_file=args.timing,
+        interactive=not args.no_cli,
+        workers=args.workers
+    )
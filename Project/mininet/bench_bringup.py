@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Bring-up Benchmark: Sequential vs Parallel
+Times building a tree topology node by node (plain Mininet) and with
+ParallelBuilder (parallel host shells, one 'ip -batch' for all veth pairs,
+parallel tc setup) at several sizes.
+
+Each size N is a tree of N/2 switches (numbered breadth-first, --fanout
+children per switch) with one host per switch. No controller is needed.
+After every bring-up the benchmark checks that all link interfaces exist
+and are up in the right namespaces, and that both modes produced the same
+topology (nodes, ports, interface names, host addresses).
+
+Usage:
+    sudo python3 bench_bringup.py
+    sudo python3 bench_bringup.py --sizes 100 500 1000 --workers 32 --repeat 3
+    sudo python3 bench_bringup.py --bw 100 --output bringup.json   # with TCLink qdiscs
+"""
+
+import argparse
+import json
+import statistics
+from mininet.net import Mininet
+from mininet.link import Link, TCLink
+from mininet.log import setLogLevel, info, error
+from mininet.clean import cleanup
+
+from ovs_provision import BulkOVSSwitch
+from parallel_build import ParallelBuilder, DEFAULT_WORKERS, missing_interfaces
+from scale import AddressPool, PhaseTimer, SWITCH_PARAMS
+
+PHASES = ['add switches', 'add hosts', 'add links', 'start network']
+
+
+def topology_signature(net):
+    """Everything that must not depend on how the network was brought up"""
+    links = sorted((link.intf1.node.name, link.intf1.name, link.intf2.node.name, link.intf2.name)
+                   for link in net.links)
+    hosts = sorted((host.name, host.IP()) for host in net.hosts)
+    return links, hosts
+
+
+def bring_up(num_nodes, workers, fanout=4, bw=None):
+    """Build, start, check and stop one tree; returns (phase times, missing, signature)"""
+    num_switches = max(num_nodes // 2, 1)
+    addresses = AddressPool()
+    timer = PhaseTimer()
+
+    net = Mininet(
+        controller=None,
+        switch=BulkOVSSwitch,
+        link=TCLink if bw else Link,
+        autoSetMacs=True
+    )
+    builder = ParallelBuilder(net, workers)
+    link_params = {'bw': bw} if bw else {}
+
+    with timer.phase('add switches'):
+        switches = [net.addSwitch('s%d' % i, **SWITCH_PARAMS) for i in range(1, num_switches + 1)]
+    with timer.phase('add hosts'):
+        hosts = builder.add_hosts([('h%d' % i, {'ip': addresses.allocate()})
+                                   for i in range(1, num_switches + 1)])
+    with timer.phase('add links'):
+        # Switch i (0-based) hangs below switch (i - 1) // fanout
+        builder.add_links([(host, switch, link_params) for host, switch in zip(hosts, switches)] +
+                          [(switches[(i - 1) // fanout], switches[i], link_params)
+                           for i in range(1, num_switches)])
+    with timer.phase('start network'):
+        net.start()
+
+    missing = missing_interfaces(net)
+    signature = topology_signature(net)
+    net.stop()
+    return dict(timer.phases), missing, signature
+
+
+def run_benchmark(sizes, workers, repeat=1, fanout=4, bw=None):
+    """Bring up every size sequentially and in parallel; returns result rows"""
+    rows = []
+    for size in sizes:
+        signatures = {}
+        for mode, mode_workers in (('sequential', 0), ('parallel', workers)):
+            runs = []
+            for attempt in range(repeat):
+                info('*** %d nodes, %s (run %d/%d)\n' % (size, mode, attempt + 1, repeat))
+                cleanup()
+                phases, missing, signature = bring_up(size, mode_workers, fanout, bw)
+                if missing:
+                    error('*** %d interfaces missing or down, e.g. %s\n' %
+                          (len(missing), ', '.join(missing[:5])))
+                runs.append((phases, missing))
+                signatures[mode] = signature
+            rows.append({
+                'nodes': size,
+                'mode': mode,
+                'workers': mode_workers,
+                'phases': {phase: statistics.median(phases[phase] for phases, _ in runs)
+                           for phase in PHASES},
+                'total': statistics.median(sum(phases.values()) for phases, _ in runs),
+                'missing_interfaces': max(len(missing) for _, missing in runs),
+            })
+        same = signatures['sequential'] == signatures['parallel']
+        rows[-1]['same_topology'] = rows[-2]['same_topology'] = same
+        if not same:
+            error('*** %d nodes: parallel bring-up produced a different topology\n' % size)
+    return rows
+
+
+def print_results(rows):
+    """Median phase times per size and mode, with the parallel speed-up"""
+    info('\n' + '=' * 78 + '\n')
+    info('%6s  %-10s %9s %9s %9s %9s %9s %8s\n' % (
+        'nodes', 'mode', 'switches', 'hosts', 'links', 'start', 'total', 'speedup'))
+    info('=' * 78 + '\n')
+    sequential = {}
+    for row in rows:
+        if row['mode'] == 'sequential':
+            sequential[row['nodes']] = row['total']
+        speedup = sequential.get(row['nodes'], row['total']) / row['total'] if row['total'] else 0
+        flags = '' if row['same_topology'] and not row['missing_interfaces'] else '  (!)'
+        info('%6d  %-10s %8.2fs %8.2fs %8.2fs %8.2fs %8.2fs %7.1fx%s\n' % (
+            row['nodes'], row['mode'], row['phases']['add switches'],
+            row['phases']['add hosts'], row['phases']['add links'],
+            row['phases']['start network'], row['total'], speedup, flags))
+    info('=' * 78 + '\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sequential vs parallel Mininet bring-up')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[100, 500, 1000],
+        help='Topology sizes in nodes, half switches and half hosts (default: 100 500 1000)'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='Workers of the parallel bring-up (default: %d)' % DEFAULT_WORKERS
+    )
+    parser.add_argument(
+        '--repeat', '-r',
+        type=int,
+        default=1,
+        help='Bring-ups per size and mode, the median is reported (default: 1)'
+    )
+    parser.add_argument(
+        '--fanout', '-f',
+        type=int,
+        default=4,
+        help='Children per switch of the tree (default: 4)'
+    )
+    parser.add_argument(
+        '--bw',
+        type=float,
+        default=None,
+        help='Shape every link to N Mbps with TCLink (default: plain links)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        help='Write the results as JSON'
+    )
+    args = parser.parse_args()
+
+    setLogLevel('warning')
+    rows = run_benchmark(args.sizes, args.workers, args.repeat, args.fanout, args.bw)
+    setLogLevel('info')
+    print_results(rows)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'workers': args.workers, 'fanout': args.fanout, 'bw': args.bw,
+                       'results': rows}, f, indent=2)
@@ -0,0 +1,411 @@
+"""
+Data-center topology generators with precomputed multipath tables.
+
+Each generator returns a Fabric: a plain description of switches (with
+their role), hosts, links and port numbers that can be built into a Mininet
+network and exported for a controller. Switches are named s1..sN and hosts
+h1..hN whatever their role, so every datapath ID is unique and the existing
+traffic patterns (which address h1, h2, ... as 10.0.0.1, 10.0.0.2, ...)
+work unchanged. Roles are kept in Fabric.roles.
+
+Generators:
+    linear(switches), tree(depth, fanout)
+                                         the topologies of 02 and 03
+    fat_tree(k)                          k-ary fat-tree: (k/2)^2 core, k pods of
+                                         k/2 aggregation + k/2 edge, k^3/4 hosts
+    leaf_spine(leaves, spines, ...)      two-tier Clos; oversubscription sets
+                                         the uplink bandwidth when bw is given
+    jellyfish(switches, degree, ...)     random regular graph (Singla et al.)
+
+Usage:
+    fabric = fat_tree(4)
+    table = fabric.path_table()          # adjacency, ports and ECMP paths
+    fabric = fabric_from_args(args)      # after add_fabric_args(parser)
+"""
+
+import json
+import random
+from collections import deque
+
+# Cap on the equal-cost paths listed per switch pair
+MAX_PATHS = 64
+
+
+class Fabric:
+    """Switches, hosts and links of a generated topology"""
+
+    def __init__(self, name, **params):
+        self.name = name
+        self.params = params
+        self.switches = []
+        self.roles = {}
+        self.hosts = []
+        self.host_switch = {}
+        self.links = []
+        self.ports = {}
+
+    def add_switch(self, role):
+        switch = 's%d' % (len(self.switches) + 1)
+        self.switches.append(switch)
+        self.roles[switch] = role
+        self.ports[switch] = {}
+        return switch
+
+    def add_host(self, switch, **link_params):
+        host = 'h%d' % (len(self.hosts) + 1)
+        self.hosts.append(host)
+        self.host_switch[host] = switch
+        self.ports[host] = {}
+        self.add_link(host, switch, **link_params)
+        return host
+
+    def add_link(self, node1, node2, **link_params):
+        """Add a link and number its ports the way Mininet would (hosts from 0, switches from 1)"""
+        for node, peer in ((node1, node2), (node2, node1)):
+            base = 0 if node in self.host_switch else 1
+            self.ports[node][peer] = base + len(self.ports[node])
+        self.links.append((node1, node2, link_params))
+
+    def remove_link(self, node1, node2):
+        """Remove a switch-to-switch link (only used while generating)"""
+        self.links = [link for link in self.links if {link[0], link[1]} != {node1, node2}]
+        del self.ports[node1][node2]
+        del self.ports[node2][node1]
+
+    def renumber_ports(self):
+        """Recompute port numbers from the final link order"""
+        self.ports = {node: {} for node in self.switches + self.hosts}
+        links, self.links = self.links, []
+        for node1, node2, link_params in links:
+            self.add_link(node1, node2, **link_params)
+
+    def adjacency(self):
+        """Switch-to-switch neighbours: {switch: [neighbour, ...]}"""
+        order = {switch: i for i, switch in enumerate(self.switches)}
+        return {switch: sorted((peer for peer in self.ports[switch] if peer in self.roles),
+                               key=order.get)
+                for switch in self.switches}
+
+    def port(self, node, peer):
+        """Port of node that leads to peer"""
+        return self.ports[node][peer]
+
+    def shortest_paths(self, src, limit=MAX_PATHS, adjacency=None):
+        """Equal-cost shortest paths (at most limit) from src to every other switch"""
+        adjacency = adjacency or self.adjacency()
+        distance = {src: 0}
+        parents = {src: []}
+        queue = deque([src])
+        while queue:
+            switch = queue.popleft()
+            for peer in adjacency[switch]:
+                if peer not in distance:
+                    distance[peer] = distance[switch] + 1
+                    parents[peer] = [switch]
+                    queue.append(peer)
+                elif distance[peer] == distance[switch] + 1:
+                    parents[peer].append(switch)
+
+        # Paths from src to each switch, built in BFS order from its parents' paths
+        paths = {src: [[src]]}
+        for switch in sorted(distance, key=distance.get)[1:]:
+            paths[switch] = [path + [switch] for parent in parents[switch]
+                             for path in paths[parent]][:limit]
+        del paths[src]
+        return paths
+
+    def path_table(self, limit=MAX_PATHS):
+        """Adjacency, port map, host attachment and ECMP paths between edge switches"""
+        adjacency = self.adjacency()
+        attached = set(self.host_switch.values())
+        edges = [switch for switch in self.switches if switch in attached]
+        paths = {}
+        unreachable = 0
+        for src in edges:
+            reachable = self.shortest_paths(src, limit, adjacency)
+            for dst in edges:
+                if dst == src:
+                    continue
+                if dst not in reachable:
+                    unreachable += 1
+                    continue
+                paths['%s-%s' % (src, dst)] = reachable[dst]
+        return {
+            'topology': self.name,
+            'params': self.params,
+            'roles': self.roles,
+            'hosts': {host: {'switch': switch, 'port': self.port(switch, host)}
+                      for host, switch in self.host_switch.items()},
+            'adjacency': adjacency,
+            'ports': {switch: {peer: port for peer, port in self.ports[switch].items()
+                               if peer in self.roles}
+                      for switch in self.switches},
+            'paths': paths,
+            'unreachable_pairs': unreachable,
+        }
+
+    def save_path_table(self, path, limit=MAX_PATHS):
+        table = self.path_table(limit)
+        with open(path, 'w') as f:
+            json.dump(table, f, indent=1)
+        return table
+
+    def summary(self):
+        counts = {}
+        for role in self.roles.values():
+            counts[role] = counts.get(role, 0) + 1
+        roles = ', '.join('%d %s' % (count, role) for role, count in counts.items())
+        return '%s: %s switches (%s), %d hosts, %d links' % (
+            self.name, len(self.switches), roles, len(self.hosts), len(self.links))
+
+
+def fat_tree(k=4, bw=None):
+    """k-ary fat-tree (Al-Fares et al.), k even"""
+    if k < 2 or k % 2:
+        raise ValueError('Fat-tree arity k must be even and >= 2, got %d' % k)
+    half = k // 2
+    link_params = {'bw': bw} if bw else {}
+    fabric = Fabric('fat-tree', k=k, bw=bw)
+
+    cores = [fabric.add_switch('core') for _ in range(half * half)]
+    for _ in range(k):
+        aggs = [fabric.add_switch('aggregation') for _ in range(half)]
+        edges = [fabric.add_switch('edge') for _ in range(half)]
+        # Aggregation switch j of every pod connects to core switches j*k/2 .. (j+1)*k/2-1
+        for j, agg in enumerate(aggs):
+            for core in cores[j * half:(j + 1) * half]:
+                fabric.add_link(agg, core, **link_params)
+            for edge in edges:
+                fabric.add_link(edge, agg, **link_params)
+        for edge in edges:
+            for _ in range(half):
+                fabric.add_host(edge, **link_params)
+    return fabric
+
+
+def leaf_spine(leaves=4, spines=2, hosts_per_leaf=4, oversubscription=1.0, bw=None):
+    """Two-tier leaf-spine fabric, every leaf connected to every spine
+
+    Oversubscription is the ratio of a leaf's host-facing to spine-facing
+    capacity. With a host link bandwidth (bw, Mbps) each uplink gets
+    bw * hosts_per_leaf / (spines * oversubscription); without one all
+    links are unshaped, the ratio is simply hosts_per_leaf / spines and an
+    oversubscription other than 1 is rejected.
+    """
+    if leaves < 1 or spines < 1 or oversubscription <= 0:
+        raise ValueError('Leaf-spine needs at least one leaf and spine and a positive '
+                         'oversubscription ratio')
+    if oversubscription != 1.0 and not bw:
+        raise ValueError('Leaf-spine oversubscription needs a host link bandwidth (bw)')
+    host_params = {'bw': bw} if bw else {}
+    uplink_params = {'bw': bw * hosts_per_leaf / (spines * oversubscription)} if bw else {}
+    fabric = Fabric('leaf-spine', leaves=leaves, spines=spines, hosts_per_leaf=hosts_per_leaf,
+                    oversubscription=oversubscription if bw else hosts_per_leaf / spines,
+                    bw=bw)
+
+    spine_switches = [fabric.add_switch('spine') for _ in range(spines)]
+    for _ in range(leaves):
+        leaf = fabric.add_switch('leaf')
+        for spine in spine_switches:
+            fabric.add_link(leaf, spine, **uplink_params)
+        for _ in range(hosts_per_leaf):
+            fabric.add_host(leaf, **host_params)
+    return fabric
+
+
+def jellyfish(switches=20, degree=4, hosts_per_switch=1, seed=None, bw=None):
+    """Jellyfish: random regular graph of switches (Singla et al., NSDI 2012)
+
+    Random pairs of switches with free ports are linked until no such pair
+    is left; a switch that still has two or more free ports then replaces a
+    random link (x, y) with links to x and y.
+    """
+    if degree >= switches:
+        raise ValueError('Jellyfish degree (%d) must be below the switch count (%d)'
+                         % (degree, switches))
+    rng = random.Random(seed)
+    link_params = {'bw': bw} if bw else {}
+    fabric = Fabric('jellyfish', switches=switches, degree=degree,
+                    hosts_per_switch=hosts_per_switch, seed=seed, bw=bw)
+
+    nodes = [fabric.add_switch('switch') for _ in range(switches)]
+    free = {switch: degree for switch in nodes}
+    linked = {switch: set() for switch in nodes}
+
+    def connect(a, b):
+        fabric.add_link(a, b, **link_params)
+        linked[a].add(b)
+        linked[b].add(a)
+        free[a] -= 1
+        free[b] -= 1
+
+    while True:
+        open_switches = [switch for switch in nodes if free[switch] > 0]
+        pairs = None
+        # Random draws are enough while many switches have free ports
+        for _ in range(4 * len(open_switches)):
+            a, b = rng.sample(open_switches, 2) if len(open_switches) > 1 else (None, None)
+            if a is not None and b not in linked[a]:
+                pairs = [(a, b)]
+                break
+        if pairs is None:
+            pairs = [(a, b) for i, a in enumerate(open_switches)
+                     for b in open_switches[i + 1:] if b not in linked[a]]
+        if pairs:
+            connect(*rng.choice(pairs))
+            continue
+
+        stuck = [switch for switch in open_switches if free[switch] >= 2]
+        if not stuck:
+            break
+        switch = stuck[0]
+        candidates = [(x, y) for x in nodes for y in linked[x]
+                      if x < y and switch not in (x, y)
+                      and x not in linked[switch] and y not in linked[switch]]
+        if not candidates:
+            break
+        x, y = rng.choice(candidates)
+        fabric.remove_link(x, y)
+        linked[x].discard(y)
+        linked[y].discard(x)
+        free[x] += 1
+        free[y] += 1
+        connect(switch, x)
+        connect(switch, y)
+
+    # Hosts are attached after the switch graph is final, so their ports
+    # follow the switch ports
+    fabric.renumber_ports()
+    for switch in nodes:
+        for _ in range(hosts_per_switch):
+            fabric.add_host(switch, **link_params)
+    return fabric
+
+
+def linear(switches=4, bw=None):
+    """Chain of switches with one host each (as 02_linear_topology.py)"""
+    link_params = {'bw': bw} if bw else {}
+    fabric = Fabric('linear', switches=switches, bw=bw)
+    nodes = [fabric.add_switch('switch') for _ in range(switches)]
+    for switch in nodes:
+        fabric.add_host(switch, **link_params)
+    for a, b in zip(nodes, nodes[1:]):
+        fabric.add_link(a, b, **link_params)
+    return fabric
+
+
+def tree(depth=2, fanout=2, bw=None):
+    """Tree with one host per switch, numbered depth-first (as 03_tree_topology.py)"""
+    link_params = {'bw': bw} if bw else {}
+    fabric = Fabric('tree', depth=depth, fanout=fanout, bw=bw)
+    uplinks = []
+
+    def add_subtree(parent, level):
+        switch = fabric.add_switch('root' if parent is None else 'level%d' % level)
+        if parent is not None:
+            uplinks.append((parent, switch))
+        if level < depth:
+            for _ in range(fanout):
+                add_subtree(switch, level + 1)
+
+    add_subtree(None, 0)
+    for switch in list(fabric.switches):
+        fabric.add_host(switch, **link_params)
+    for parent, switch in uplinks:
+        fabric.add_link(parent, switch, **link_params)
+    return fabric
+
+
+GENERATORS = {
+    'linear': linear,
+    'tree': tree,
+    'fattree': fat_tree,
+    'leafspine': leaf_spine,
+    'jellyfish': jellyfish,
+}
+
+# Generators selectable on the command line of 09_datacenter_topology.py
+# (linear and tree have scripts of their own, 02 and 03)
+DATACENTER_TOPOLOGIES = ('fattree', 'leafspine', 'jellyfish')
+
+
+def add_fabric_args(parser):
+    """Add the topology choice and the options of its generator to an argument parser"""
+    parser.add_argument(
+        'topology',
+        choices=DATACENTER_TOPOLOGIES,
+        help='Topology generator'
+    )
+    parser.add_argument(
+        '-k',
+        type=int,
+        default=4,
+        help='Fat-tree arity, even (default: 4)'
+    )
+    parser.add_argument(
+        '--leaves',
+        type=int,
+        default=4,
+        help='Leaf-spine: number of leaf switches (default: 4)'
+    )
+    parser.add_argument(
+        '--spines',
+        type=int,
+        default=2,
+        help='Leaf-spine: number of spine switches (default: 2)'
+    )
+    parser.add_argument(
+        '--hosts-per-leaf',
+        type=int,
+        default=4,
+        help='Leaf-spine: hosts per leaf (default: 4)'
+    )
+    parser.add_argument(
+        '--oversubscription',
+        type=float,
+        default=None,
+        help='Leaf-spine: host to uplink capacity ratio, needs --bw (default: 1.0)'
+    )
+    parser.add_argument(
+        '--switches',
+        type=int,
+        default=20,
+        help='Jellyfish: number of switches (default: 20)'
+    )
+    parser.add_argument(
+        '--degree',
+        type=int,
+        default=4,
+        help='Jellyfish: switch-to-switch links per switch (default: 4)'
+    )
+    parser.add_argument(
+        '--hosts-per-switch',
+        type=int,
+        default=1,
+        help='Jellyfish: hosts per switch (default: 1)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Jellyfish: random seed for a reproducible graph'
+    )
+    parser.add_argument(
+        '--bw',
+        type=float,
+        default=None,
+        help='Host link bandwidth in Mbps (default: unshaped links)'
+    )
+
+
+def fabric_from_args(args):
+    """Generate the fabric selected by the options of add_fabric_args()"""
+    if args.topology == 'fattree':
+        return fat_tree(args.k, bw=args.bw)
+    if args.topology == 'leafspine':
+        return leaf_spine(args.leaves, args.spines, args.hosts_per_leaf,
+                          args.oversubscription or 1.0, bw=args.bw)
+    if args.topology == 'jellyfish':
+        return jellyfish(args.switches, args.degree, args.hosts_per_switch, args.seed, bw=args.bw)
+    raise ValueError('unknown data-center topology %r (choose from %s)'
+                     % (args.topology, ', '.join(DATACENTER_TOPOLOGIES)))
@@ -0,0 +1,100 @@
+"""
+Instance isolation for running several Mininet experiments on one host.
+
+Parallel networks share the root namespace, OVS and often the controller
+host, so each instance prefixes its node names (and with them interface and
+bridge names), takes its own subnet and shifts its controller and iperf
+ports. Mininet derives a switch's DPID from the first number in its name,
+which for i2s1 would be 2, so switches also get explicit DPIDs with the
+instance index in the upper bits. Instance 0 keeps the plain names,
+10.0.0.0/24, default ports and DPIDs, so scripts behave exactly as before
+unless --instance is given.
+
+The Assignment2 wifi experiment uses the same class (see Assignment2/shared.py):
+it moves its fixed 10.0.0.x addresses into the subnet with address() instead
+of numbering hosts with ip().
+
+Usage:
+    inst = Instance.from_args(args)        # after add_instance_args(parser)
+    h1 = net.addHost(inst.name('h1'), ip=inst.ip(1))
+    s1 = net.addSwitch(inst.name('s1'), dpid=inst.dpid(1))
+    net.addController(inst.name('c0'), port=inst.port(6653))
+    sta1 = net.addStation(inst.name('sta1'), ip=inst.address('10.0.0.13/24'))
+"""
+
+import ipaddress
+
+# Subnet of instance 0, whose addresses address() moves into other subnets
+DEFAULT_SUBNET = '10.0.0.0/24'
+
+# Ports (controller and iperf servers) are shifted by index * PORT_STRIDE
+PORT_STRIDE = 100
+
+
+class Instance:
+    """Name prefix, subnet and port offset of one experiment instance"""
+
+    def __init__(self, index=0, prefix=None, subnet=None, port_offset=None):
+        self.index = index
+        self.prefix = prefix if prefix is not None else (f'i{index}' if index else '')
+        self.subnet = ipaddress.ip_network(subnet or f'10.{index}.0.0/24')
+        self.port_offset = port_offset if port_offset is not None else index * PORT_STRIDE
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(args.instance, args.prefix, args.subnet, args.port_offset)
+
+    def name(self, name):
+        """Node name of a logical node name (h1 -> i2h1)"""
+        return f'{self.prefix}{name}'
+
+    def logical(self, name):
+        """Logical name of one of this instance's node names (i2sta1 -> sta1)"""
+        return name[len(self.prefix):] if name.startswith(self.prefix) else name
+
+    def ip(self, host, with_prefix=True):
+        """Address of host number `host` in the instance subnet (1 -> 10.2.0.1/24)"""
+        address = str(self.subnet.network_address + host)
+        return f'{address}/{self.subnet.prefixlen}' if with_prefix else address
+
+    def address(self, address):
+        """Move a 10.0.0.x address (optionally /prefix) into the instance subnet"""
+        host, _, prefixlen = address.partition('/')
+        offset = int(ipaddress.ip_address(host)) - int(
+            ipaddress.ip_network(DEFAULT_SUBNET).network_address)
+        return self.ip(offset, with_prefix=bool(prefixlen))
+
+    def port(self, port):
+        """Shift a default port by the instance's port offset"""
+        return port + self.port_offset
+
+    def dpid(self, switch):
+        """DPID of switch number `switch`, unique across instances (1 -> 0x20001)"""
+        return '%016x' % ((self.index << 16) | switch)
+
+    def describe(self):
+        """JSON-serializable summary for run manifests"""
+        return {
+            'index': self.index,
+            'prefix': self.prefix,
+            'subnet': str(self.subnet),
+            'port_offset': self.port_offset,
+        }
+
+
+def add_instance_args(parser):
+    """Add --instance/--prefix/--subnet/--port-offset to an argument parser"""
+    parser.add_argument(
+        '--instance',
+        type=int,
+        default=0,
+        help='Instance index for parallel runs on one host: name prefix i<N>, '
+             'subnet 10.<N>.0.0/24, ports shifted by N*100 (default: 0)'
+    )
+    parser.add_argument('--prefix', help='Node name prefix (overrides --instance)')
+    parser.add_argument('--subnet', help='IPv4 subnet (overrides --instance)')
+    parser.add_argument(
+        '--port-offset',
+        type=int,
+        help='Controller and iperf port offset (overrides --instance)'
+    )
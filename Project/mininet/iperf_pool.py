@@ -0,0 +1,126 @@
+"""
+Persistent iperf server pool for the Mininet test scripts.
+
+Servers are started once per host and reused by every test of a run instead
+of being started and killed around each traffic pattern. Concurrent tests get
+their own port, and readiness is checked on the listening socket rather than
+guessed with a sleep.
+
+The Assignment2 scripts use this pool too (see Assignment2/shared.py); they
+shift its ports per parallel instance and restart() it after network resets.
+
+Usage:
+    pool = IperfServerPool()
+    port = pool.acquire(h3)              # TCP server on h3
+    udp_port = pool.acquire(h4, 'udp')   # UDP server on h4
+    pool.wait_ready()
+    h1.cmd(f'iperf -c {h3.IP()} -p {port} -t 10')
+    pool.release(port)
+    ...
+    pool.restart()                       # e.g. after resetting the network
+    pool.stop()
+"""
+
+import subprocess
+import time
+from mininet.log import warn
+
+from node_batch import run_on_all
+
+# First port handed out per protocol
+BASE_PORTS = {'tcp': 5001, 'udp': 5101}
+
+
+class IperfServerPool:
+    """Long-lived iperf servers shared by tests, one port per concurrent test"""
+
+    def __init__(self, base_ports=None, port_offset=0):
+        self.next_port = {protocol: port + port_offset
+                          for protocol, port in (base_ports or BASE_PORTS).items()}
+        self.servers = {}
+
+    def acquire(self, host, protocol='tcp'):
+        """Reserve an idle iperf server on host (starting one if needed), return its port"""
+        for (name, proto, port), server in self.servers.items():
+            if name == host.name and proto == protocol and not server['busy']:
+                server['busy'] = True
+                return port
+
+        port = self.next_port[protocol]
+        self.next_port[protocol] += 1
+        self.start_server(host, protocol, port, busy=True)
+        return port
+
+    def start_server(self, host, protocol, port, busy=False):
+        """Start one iperf server on host and register it with the pool"""
+        cmd = ['iperf', '-s', '-p', str(port)] + (['-u'] if protocol == 'udp' else [])
+        self.servers[(host.name, protocol, port)] = {
+            'host': host,
+            'proc': host.popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+            'busy': busy,
+            'ready': False,
+        }
+
+    def release(self, *ports):
+        """Return reserved ports to the pool; the servers keep running"""
+        for (_, _, port), server in self.servers.items():
+            if port in ports:
+                server['busy'] = False
+
+    def release_all(self):
+        """Return every port to the pool"""
+        for server in self.servers.values():
+            server['busy'] = False
+
+    def wait_ready(self, timeout=5, interval=0.1):
+        """Block until every server is listening (one batched `ss` per poll)"""
+        deadline = time.time() + timeout
+        while True:
+            pending = {}
+            for (name, protocol, port), server in self.servers.items():
+                if not server['ready']:
+                    pending.setdefault(name, []).append((protocol, port, server))
+            if not pending:
+                return True
+            if time.time() >= deadline:
+                warn('*** iperf servers not ready on %s\n' % ', '.join(sorted(pending)))
+                return False
+
+            outputs = run_on_all([servers[0][2]['host'] for servers in pending.values()],
+                                 'ss -H -ltun')
+            for name, servers in pending.items():
+                listening = parse_listening_ports(outputs[name])
+                for protocol, port, server in servers:
+                    server['ready'] = (protocol, port) in listening
+            time.sleep(interval)
+
+    def restart(self):
+        """Restart every server on its port, e.g. after a network reset"""
+        servers = self.servers
+        self.stop()
+        for (_, protocol, port), server in servers.items():
+            self.start_server(server['host'], protocol, port)
+        self.wait_ready()
+
+    def stop(self):
+        """Stop every server"""
+        for server in self.servers.values():
+            server['proc'].terminate()
+        for server in self.servers.values():
+            try:
+                server['proc'].wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                server['proc'].kill()
+        self.servers = {}
+
+
+def parse_listening_ports(output):
+    """Return the (protocol, port) of every socket listed by `ss -H -ltun`"""
+    listening = set()
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) >= 5:
+            port = fields[4].rpartition(':')[2]
+            if port.isdigit():
+                listening.add((fields[0], int(port)))
+    return listening
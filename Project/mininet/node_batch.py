@@ -0,0 +1,67 @@
+"""
+Batched command execution on Mininet nodes.
+
+node.cmd() is a blocking round-trip through the node's shell, so issuing a
+few commands on many nodes costs O(nodes x commands) serialized round-trips.
+run_batch() joins each node's commands into a single shell line, writes the
+lines to every shell before reading any output, and collects the outputs as
+they arrive by polling all shells at once.
+
+The Assignment2 scripts import this module too (see Assignment2/shared.py).
+
+Usage:
+    outputs = run_batch({
+        s1: ['ovs-ofctl dump-flows s1', 'ovs-ofctl dump-ports s1'],
+        s2: ['ovs-ofctl dump-flows s2', 'ovs-ofctl dump-ports s2'],
+    })
+    flows_s1, ports_s1 = outputs['s1']
+"""
+
+import re
+import select
+
+# Printed after every command of a batch to split the node's output
+MARKER = '@@batch-done@@'
+SPLIT_RE = re.compile(re.escape(MARKER) + r'\r?\n')
+
+
+def batch_line(commands):
+    """Join commands into one shell line that marks the end of each output"""
+    parts = []
+    for command in commands:
+        command = command.strip()
+        parts.append(command if command.endswith('&') else command + ';')
+        parts.append(f'echo {MARKER};')
+    return ' '.join(parts)
+
+
+def run_batch(commands):
+    """Run {node: [command, ...]} and return {node name: [output, ...]}"""
+    commands = {node: list(lines) for node, lines in commands.items() if lines}
+    for node, lines in commands.items():
+        node.sendCmd(batch_line(lines))
+
+    outputs = {node.name: '' for node in commands}
+    poller = select.poll()
+    pending = {}
+    for node in commands:
+        pending[node.stdout.fileno()] = node
+        poller.register(node.stdout.fileno(), select.POLLIN)
+    while pending:
+        for fd, _ in poller.poll():
+            node = pending[fd]
+            outputs[node.name] += node.monitor()
+            if not node.waiting:
+                poller.unregister(fd)
+                del pending[fd]
+
+    return {
+        node.name: SPLIT_RE.split(outputs[node.name])[:len(lines)]
+        for node, lines in commands.items()
+    }
+
+
+def run_on_all(nodes, command):
+    """Run the same command on every node; returns {node name: output}"""
+    outputs = run_batch({node: [command] for node in nodes})
+    return {name: output[0] for name, output in outputs.items()}
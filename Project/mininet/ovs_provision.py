@@ -0,0 +1,67 @@
+"""
+Bulk Open vSwitch provisioning for Mininet networks.
+
+Every OVSSwitch normally runs its own ovs-vsctl process at start (add-br,
+add-port, protocols, controller), and scripts often follow up with one
+`ovs-vsctl set-controller` per switch. On large topologies network start is
+then dominated by hundreds of serialized ovs-vsctl round-trips to OVSDB.
+
+BulkOVSSwitch defers each switch's setup, so Mininet.start() creates all
+bridges, ports, protocols and controller targets in one combined ovs-vsctl
+transaction (OVSSwitch.batchStartup); net.stop() removes them the same way.
+vsctl() runs any list of ovs-vsctl commands as one transaction, split only
+when the command line would exceed ARG_MAX.
+
+Usage:
+    net = Mininet(switch=BulkOVSSwitch, controller=RemoteController)
+    ...
+    net.start()                                  # one ovs-vsctl for all switches
+    set_controllers(net.switches, ['tcp:127.0.0.1:6653', 'tcp:127.0.0.1:6654'])
+"""
+
+import subprocess
+
+from mininet.log import error
+from mininet.node import OVSSwitch
+
+# Keep each ovs-vsctl command line well below the kernel's ARG_MAX (the
+# same limit OVSSwitch.batchStartup uses)
+MAX_COMMAND_LENGTH = 128000
+
+
+class BulkOVSSwitch(OVSSwitch):
+    """OVSSwitch whose setup joins one ovs-vsctl transaction with all others"""
+
+    def __init__(self, name, batch=True, **params):
+        super().__init__(name, batch=batch, **params)
+
+
+def vsctl(commands):
+    """Run ovs-vsctl commands (lists of arguments) as few transactions
+
+    Returns True if every transaction succeeded.
+    """
+    transactions = [[]]
+    length = 0
+    for command in commands:
+        command_length = sum(len(arg) + 1 for arg in command) + 3
+        if transactions[-1] and length + command_length > MAX_COMMAND_LENGTH:
+            transactions.append([])
+            length = 0
+        transactions[-1] += ['--'] + list(command)
+        length += command_length
+
+    ok = True
+    for transaction in transactions:
+        if not transaction:
+            continue
+        result = subprocess.run(['ovs-vsctl'] + transaction, capture_output=True, text=True)
+        if result.returncode != 0:
+            error(f'*** ovs-vsctl failed: {result.stderr.strip()}\n')
+            ok = False
+    return ok
+
+
+def set_controllers(switches, targets):
+    """Point every switch at the same controller targets in one transaction"""
+    return vsctl([['set-controller', switch.name] + list(targets) for switch in switches])
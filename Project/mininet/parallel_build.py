@@ -0,0 +1,208 @@
+"""
+Parallel bring-up of Mininet hosts and links.
+
+Mininet adds nodes and links one at a time: every host waits for its shell
+(a new network namespace) before the next one is forked, every link runs
+'ip link add' through a node's shell, and every TCLink end then runs its tc
+commands and 'ifconfig up' in turn. For large trees that is thousands of
+serialized round-trips.
+
+ParallelBuilder keeps Mininet's bookkeeping (net.hosts, net.links, ports,
+interface names and MACs come out exactly as with net.addHost/addLink) but
+- starts host shells in a bounded thread pool,
+- creates all veth pairs, directly in their target namespaces, with a
+  single 'ip -batch' run in the root namespace and brings them up in the
+  same batch (namespaced ends through their nodes' shells, all at once);
+  pairs the batch fails to create are retried with Mininet's own
+  makeIntfPair, which raises if they still cannot be created,
+- applies TCLink qdiscs in the thread pool, one worker per node.
+With workers=0 it falls back to plain net.addHost/net.addLink.
+
+Usage:
+    builder = ParallelBuilder(net, workers=16)
+    hosts = builder.add_hosts([('h1', {'ip': '10.0.0.1/16'}), ...])
+    builder.add_links([(h1, s1, {}), (s1, s2, {'bw': 100}), ...])
+    net.start()
+"""
+
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from mininet.link import Link, Intf, TCIntf, TCLink
+from mininet.log import warn
+
+from node_batch import run_batch
+
+# Host shells and tc calls mostly wait on the kernel, so more workers than
+# cores still helps; beyond a few dozen forks contend for the same locks
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 'ip -batch' names every failed line on stderr as "Command failed -:<line>"
+FAILED_LINE_RE = re.compile(r'Command failed -:(\d+)')
+
+
+class DeferredConfig:
+    """Interface mixin that postpones config() until the veth pair exists"""
+
+    def config(self, **params):
+        if getattr(self.link, 'pending', False):
+            self.pending_params = params
+            return {}
+        return super().config(**params)
+
+
+class DeferredIntf(DeferredConfig, Intf):
+    pass
+
+
+class DeferredTCIntf(DeferredConfig, TCIntf):
+    pass
+
+
+class DeferredLink(Link):
+    """Link whose veth pair is queued on a ParallelBuilder instead of created"""
+
+    def __init__(self, node1, node2, builder=None, shaped=False, **params):
+        self.builder = builder
+        self.pending = True
+        params.pop('intf', None)
+        super().__init__(node1, node2, intf=DeferredTCIntf if shaped else DeferredIntf,
+                         **params)
+
+    def makeIntfPair(self, intfname1, intfname2, addr1=None, addr2=None,
+                     node1=None, node2=None, deleteIntfs=True):
+        self.builder.queue_pair(intfname1, intfname2, addr1, addr2, node1, node2)
+
+
+def ip_batch(commands):
+    """Run commands through one 'ip -force -batch'; returns the failed line numbers"""
+    result = subprocess.run(['ip', '-force', '-batch', '-'], input='\n'.join(commands) + '\n',
+                            capture_output=True, text=True)
+    if result.returncode == 0:
+        return []
+    failed = sorted({int(line) for line in FAILED_LINE_RE.findall(result.stderr)})
+    if not failed:
+        raise RuntimeError('ip -batch failed: %s' % result.stderr.strip())
+    return failed
+
+
+def veth_end(name, address, node):
+    """'ip link add' arguments of one end of a veth pair"""
+    args = 'name %s' % name
+    if address:
+        args += ' address %s' % address
+    if node is not None and node.inNamespace:
+        args += ' netns %d' % node.pid
+    return args
+
+
+class ParallelBuilder:
+    """Adds hosts and links to a Mininet network concurrently"""
+
+    def __init__(self, net, workers=DEFAULT_WORKERS):
+        self.net = net
+        self.workers = workers
+        self.pairs = []
+
+    def add_hosts(self, hosts):
+        """Add [(name, params), ...] in order, starting their shells in parallel"""
+        if not self.workers:
+            return [self.net.addHost(name, **params) for name, params in hosts]
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            started = list(pool.map(lambda host: self.net.host(host[0], **host[1]), hosts))
+
+        # Register through addHost so Mininet assigns the same defaults
+        # (IP, MAC) as in a sequential build
+        added = []
+        for host, (name, params) in zip(started, hosts):
+            def adopt(_name, host=host, **merged):
+                host.params.update(merged)
+                return host
+            added.append(self.net.addHost(name, cls=adopt, **params))
+        return added
+
+    def add_links(self, links):
+        """Add [(node1, node2, params), ...] and create all their veth pairs at once"""
+        if not self.workers:
+            return [self.net.addLink(node1, node2, **params) for node1, node2, params in links]
+
+        shaped = isinstance(self.net.link, type) and issubclass(self.net.link, TCLink)
+        added = [self.net.addLink(node1, node2, cls=DeferredLink, builder=self,
+                                  shaped=shaped, **params)
+                 for node1, node2, params in links]
+        self.create_links(added)
+        return added
+
+    def queue_pair(self, intfname1, intfname2, addr1, addr2, node1, node2):
+        self.pairs.append((intfname1, intfname2, addr1, addr2, node1, node2))
+
+    def create_links(self, links):
+        """Create the queued veth pairs, bring them up and apply deferred configs"""
+        intfs = [intf for link in links for intf in (link.intf1, link.intf2)]
+        root_up = ['link set dev %s up' % intf.name for intf in intfs
+                   if not intf.node.inNamespace]
+        pairs, self.pairs = self.pairs, []
+        add = ['link add %s type veth peer %s' % (veth_end(name1, addr1, node1),
+                                                  veth_end(name2, addr2, node2))
+               for name1, name2, addr1, addr2, node1, node2 in pairs]
+        failed = ip_batch(add + root_up)
+
+        # Retry failed pairs one by one (makeIntfPair raises if one still
+        # fails), then bring their root namespace ends up as well
+        if failed:
+            retry = [pairs[line - 1] for line in failed if line <= len(pairs)]
+            warn('*** ip -batch failed on %d line(s), retrying %d veth pair(s) '
+                 'one by one\n' % (len(failed), len(retry)))
+            for pair in retry:
+                Link.makeIntfPair(*pair)
+            down = ip_batch(root_up)
+            if down:
+                raise RuntimeError('Could not bring up %s' % ', '.join(
+                    root_up[line - 1].split()[-2] for line in down))
+
+        namespaced = {}
+        for intf in intfs:
+            if intf.node.inNamespace:
+                namespaced.setdefault(intf.node, []).append('ip link set dev %s up' % intf.name)
+        run_batch(namespaced)
+
+        for link in links:
+            link.pending = False
+
+        # Interfaces with parameters (tc shaping, addresses) are configured
+        # now, one worker per node since a node's shell is not thread-safe
+        configure = {}
+        for intf in intfs:
+            if getattr(intf, 'pending_params', None):
+                configure.setdefault(intf.node, []).append(intf)
+        with ThreadPoolExecutor(self.workers) as pool:
+            list(pool.map(configure_intfs, configure.values()))
+
+
+def configure_intfs(intfs):
+    for intf in intfs:
+        intf.config(**intf.pending_params)
+        del intf.pending_params
+
+
+def missing_interfaces(net):
+    """Names of link interfaces that are absent or down in their node's namespace"""
+    expected = {}
+    for link in net.links:
+        for intf in (link.intf1, link.intf2):
+            key = intf.node if intf.node.inNamespace else None
+            expected.setdefault(key, set()).add(intf.name)
+
+    def up_names(output):
+        return {line.split(': ')[1].split('@')[0] for line in output.splitlines() if ': ' in line}
+
+    missing = set()
+    root = subprocess.run(['ip', '-o', 'link', 'show', 'up'], capture_output=True, text=True)
+    missing |= expected.pop(None, set()) - up_names(root.stdout)
+    outputs = run_batch({node: ['ip -o link show up'] for node in expected})
+    for node, names in expected.items():
+        missing |= names - up_names(outputs[node.name][0])
+    return sorted(missing)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Parallel Experiment Launcher
+Runs K isolated instances of a Mininet test script on one host at once.
+
+Every instance is started with --instance N, so it gets its own node name
+prefix, subnet, DPIDs and ports (see instance.py); scripts without
+--instance are refused. --controller-port is passed to every instance as its
+--port. With --controller-cmd every instance gets its own controller on that
+port shifted by the instance's offset; without it, all instances connect to
+the same controller on the unshifted port. Output of
+each instance goes to its own log; when all have finished, the launcher
+writes a summary.json and prints the throughput lines of every instance.
+
+Usage:
+    sudo python3 run_parallel.py 04_traffic_load_test.py -k 8 -- --no-cli --duration 30
+    sudo python3 run_parallel.py 04_traffic_load_test.py -k 4 \\
+        --controller-cmd 'ryu-manager --ofp-tcp-listen-port {port} ryu.app.simple_switch_13' \\
+        --controller-port 6653 -- --no-cli
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from instance import Instance
+
+# Lines of an instance log that are echoed in the final summary
+RESULT_MARKERS = ('Mbits/sec', 'Kbits/sec', 'Gbits/sec')
+
+
+def start_instance(script, index, script_args, log_file, controller_port=6653,
+                   shift_ports=True):
+    """Start one instance of a test script in the background
+
+    Without shift_ports the instance keeps the default ports, i.e. connects
+    to the shared controller (hosts live in their own namespaces, so iperf
+    ports do not clash either).
+    """
+    log = open(log_file, 'w')
+    cmd = [sys.executable, script, '--instance', str(index), '--port', str(controller_port)]
+    if not shift_ports:
+        cmd += ['--port-offset', '0']
+    cmd += script_args
+    return subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT), log
+
+
+def supports_instances(script):
+    """Whether a test script takes --instance (see instance.add_instance_args)"""
+    result = subprocess.run([sys.executable, script, '--help'], capture_output=True, text=True)
+    return '--instance' in result.stdout
+
+
+def start_controller(command, port, log_file):
+    """Start a controller for one instance from a command template"""
+    log = open(log_file, 'w')
+    proc = subprocess.Popen(command.format(port=port), shell=True, stdout=log,
+                            stderr=subprocess.STDOUT, start_new_session=True)
+    return proc, log
+
+
+def stop_controller(proc):
+    """Stop a controller's whole process group"""
+    os.killpg(proc.pid, signal.SIGTERM)
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+def run_parallel(script, instances, script_args, output_dir, controller_cmd=None,
+                 controller_port=6653):
+    """Run `instances` copies of script in parallel and collect their results"""
+    os.makedirs(output_dir, exist_ok=True)
+    controllers = []
+    running = []
+
+    for index in range(instances):
+        instance = Instance(index)
+        if controller_cmd:
+            port = instance.port(controller_port)
+            log_file = os.path.join(output_dir, f'controller_i{index}.log')
+            controllers.append(start_controller(controller_cmd, port, log_file))
+        log_file = os.path.join(output_dir, f'i{index}.log')
+        proc, log = start_instance(script, index, script_args, log_file, controller_port,
+                                   shift_ports=bool(controller_cmd))
+        print(f'*** Started instance {index} (prefix "{instance.prefix}", '
+              f'subnet {instance.subnet}, pid {proc.pid})')
+        running.append((index, proc, log, log_file, time.time()))
+
+    results = []
+    try:
+        for index, proc, log, log_file, started in running:
+            proc.wait()
+            log.close()
+            results.append({
+                'instance': index,
+                'returncode': proc.returncode,
+                'duration': round(time.time() - started, 1),
+                'log': os.path.basename(log_file),
+            })
+    finally:
+        for proc, log in controllers:
+            stop_controller(proc)
+            log.close()
+
+    with open(os.path.join(output_dir, 'summary.json'), 'w') as f:
+        json.dump({'script': script, 'args': script_args, 'instances': results}, f, indent=2)
+    return results
+
+
+def print_summary(results, output_dir):
+    """Print the status and throughput lines of every instance"""
+    print('\n' + '=' * 70)
+    print(f'*** {len(results)} instance(s) finished, logs in {output_dir}')
+    print('=' * 70)
+    for result in results:
+        status = 'ok' if result['returncode'] == 0 else f'FAILED ({result["returncode"]})'
+        print(f'\ninstance {result["instance"]}: {status} in {result["duration"]}s')
+        with open(os.path.join(output_dir, result['log'])) as f:
+            for line in f:
+                if any(marker in line for marker in RESULT_MARKERS):
+                    print(f'  {line.strip()}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Run isolated instances of a Mininet test script in parallel'
+    )
+    parser.add_argument('script', help='Test script supporting --instance')
+    parser.add_argument(
+        '--instances', '-k',
+        type=int,
+        default=os.cpu_count() // 4 or 1,
+        help='Number of parallel instances (default: one per 4 cores)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default=None,
+        help='Directory for logs and summary (default: parallel_runs/<timestamp>)'
+    )
+    parser.add_argument(
+        '--controller-cmd',
+        help='Start one controller per instance, e.g. '
+             '"ryu-manager --ofp-tcp-listen-port {port} ryu.app.simple_switch_13"'
+    )
+    parser.add_argument(
+        '--controller-port',
+        type=int,
+        default=6653,
+        help='Controller port passed to every instance as --port, shifted per '
+             'instance when --controller-cmd is given (default: 6653)'
+    )
+
+    # Everything after -- is passed to every instance
+    argv = sys.argv[1:]
+    script_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, script_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    if not supports_instances(args.script):
+        parser.error(f'{args.script} does not support --instance')
+    # The controllers started here and the instances must agree on the port
+    if any(arg in ('--port', '-p') or arg.startswith('--port=') for arg in script_args):
+        parser.error('set the controller port with --controller-port, not the script\'s --port')
+
+    output_dir = args.output or os.path.join('parallel_runs', time.strftime('%Y%m%d-%H%M%S'))
+
+    results = run_parallel(args.script, args.instances, script_args, output_dir,
+                           args.controller_cmd, args.controller_port)
+    print_summary(results, output_dir)
+    sys.exit(0 if all(r['returncode'] == 0 for r in results) else 1)
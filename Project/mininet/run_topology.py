@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Topology Runner
+Starts any topology described in a YAML/JSON topology file (see
+topology_plan.py and topologies/) instead of a hand-written script.
+
+The file is compiled once into a build plan and cached; later launches of
+the same, unchanged file reuse the plan. Switches are started with the
+controllers the plan maps them to, in one ovs-vsctl transaction.
+
+Usage:
+    sudo python3 run_topology.py topologies/simple.yaml
+    sudo python3 run_topology.py topologies/congestion.yaml --controller 192.168.1.100 --port 6653
+    sudo python3 run_topology.py topologies/fattree.yaml --wait 60 --no-cli --timing fattree.json
+    sudo python3 run_topology.py topologies/assignment1_task2.yaml
+    python3 run_topology.py topologies/link_failure.yaml --show    # print the plan only
+"""
+
+import argparse
+import json
+import sys
+from mininet.net import Mininet
+from mininet.node import RemoteController, Controller
+from mininet.link import Link, TCLink
+from mininet.cli import CLI
+from mininet.log import setLogLevel, info, error
+
+from ovs_provision import BulkOVSSwitch
+from scale import PhaseTimer
+from topology_plan import load_plan, CACHE_DIR
+
+
+def build_network(plan, controller_ip=None, controller_port=None):
+    """Create the Mininet network of a plan (not started)
+
+    controller_ip replaces the address of every remote controller and
+    controller_port the port of the first controller.
+    """
+    # Without controllers Mininet would add a default one when building
+    net = Mininet(
+        controller=RemoteController if plan['controllers'] else None,
+        switch=BulkOVSSwitch,
+        link=TCLink if plan['shaped'] else Link,
+        **plan['options']
+    )
+
+    for i, entry in enumerate(plan['controllers']):
+        port = controller_port if controller_port and i == 0 else entry['port']
+        if entry['type'] == 'local':
+            net.addController(entry['name'], controller=Controller, port=port, **entry['params'])
+        else:
+            net.addController(entry['name'], controller=RemoteController,
+                              ip=controller_ip or entry['ip'], port=port, **entry['params'])
+
+    for entry in plan['switches']:
+        net.addSwitch(entry['name'], **entry['params'])
+
+    for entry in plan['hosts']:
+        net.addHost(entry['name'], ip=entry['ip'], **entry['params'])
+
+    for link in plan['links']:
+        net.addLink(link['node1'], link['node2'], port1=link['port1'], port2=link['port2'],
+                    intfName1=link['intf1'], intfName2=link['intf2'], **link['params'])
+    return net
+
+
+def start_network(net, plan):
+    """Start net, connecting each switch only to the controllers mapped to it"""
+    if not plan['mapped']:
+        net.start()
+        return
+
+    # Same steps as Mininet.start(), with per-switch controller lists
+    net.build()
+    for controller in net.controllers:
+        controller.start()
+    for entry in plan['switches']:
+        net[entry['name']].start([net[name] for name in entry['controllers']])
+    BulkOVSSwitch.batchStartup(net.switches)
+    if plan['options'].get('waitConnected'):
+        net.waitConnected()
+
+
+def describe_plan(plan):
+    """One line per controller and a summary of the nodes of a plan"""
+    info('*** Topology %s: %d switches, %d hosts, %d links\n' % (
+        plan['name'], len(plan['switches']), len(plan['hosts']), len(plan['links'])))
+    if plan['description']:
+        info('  %s\n' % plan['description'])
+    for controller in plan['controllers']:
+        switches = [entry['name'] for entry in plan['switches']
+                    if controller['name'] in entry['controllers']]
+        info('  %s (%s %s:%d): %d switches\n' % (controller['name'], controller['type'],
+                                                 controller['ip'], controller['port'],
+                                                 len(switches)))
+
+
+def run_topology(path, controller_ip=None, controller_port=None, use_cache=True,
+                 wait_timeout=None, timing_file=None, interactive=True):
+    """Load, build and start a topology file"""
+    timer = PhaseTimer()
+    with timer.phase('load plan'):
+        plan, cached = load_plan(path, use_cache=use_cache)
+    info('*** Plan %s\n' % ('loaded from cache' if cached else 'compiled'))
+    describe_plan(plan)
+
+    with timer.phase('add nodes and links'):
+        net = build_network(plan, controller_ip, controller_port)
+    info('*** Starting network\n')
+    with timer.phase('start network'):
+        start_network(net, plan)
+    if wait_timeout is not None:
+        with timer.phase('controller connection'):
+            if not net.waitConnected(timeout=wait_timeout or None):
+                error('*** Not all switches connected within %ss\n' % wait_timeout)
+    timer.report()
+    if timing_file:
+        timer.save(timing_file, topology=plan['name'], cached=cached,
+                   switches=len(plan['switches']), hosts=len(plan['hosts']))
+
+    if interactive:
+        info('*** Running CLI. Press Ctrl-D to exit\n')
+        CLI(net)
+
+    info('*** Stopping network\n')
+    net.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a topology file in Mininet')
+    parser.add_argument('topology', help='YAML or JSON topology file')
+    parser.add_argument(
+        '--controller', '-c',
+        default=None,
+        help='Address of all remote controllers (default: as in the file)'
+    )
+    parser.add_argument(
+        '--port', '-p',
+        type=int,
+        default=None,
+        help='Port of the first controller (default: as in the file)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Recompile the plan instead of using %s' % CACHE_DIR
+    )
+    parser.add_argument(
+        '--show',
+        action='store_true',
+        help='Print the compiled plan as JSON and exit (no root needed)'
+    )
+    parser.add_argument(
+        '--wait',
+        type=float,
+        default=None,
+        help='Wait up to N seconds for all switches to connect (0: no limit)'
+    )
+    parser.add_argument(
+        '--timing',
+        metavar='FILE',
+        help='Write the time per phase to a JSON file'
+    )
+    parser.add_argument(
+        '--no-cli',
+        action='store_true',
+        help='Stop the network after bring-up instead of opening the CLI'
+    )
+    args = parser.parse_args()
+
+    if args.show:
+        plan, _ = load_plan(args.topology, use_cache=not args.no_cache)
+        json.dump(plan, sys.stdout, indent=2)
+        print()
+        sys.exit(0)
+
+    setLogLevel('info')
+    run_topology(
+        args.topology,
+        controller_ip=args.controller,
+        controller_port=args.port,
+        use_cache=not args.no_cache,
+        wait_timeout=args.wait,
+        timing_file=args.timing,
+        interactive=not args.no_cli
+    )
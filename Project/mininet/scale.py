@@ -0,0 +1,137 @@
+"""
+Helpers for bringing up large (1,000+ switch) Mininet fabrics.
+
+Addresses come from an AddressPool over a /16 (or larger) subnet instead of
+'10.0.0.%d/24', so topologies past 254 hosts stay valid. Switches are
+BulkOVSSwitches (see ovs_provision.py), which Mininet creates in one large
+ovs-vsctl transaction instead of one ovs-vsctl call per switch. PhaseTimer
+records how long each bring-up phase took.
+
+Usage:
+    addresses = AddressPool(args.subnet)
+    timer = PhaseTimer()
+    with timer.phase('switches'):
+        s1 = net.addSwitch('s1', **SWITCH_PARAMS)
+    h1 = net.addHost('h1', ip=addresses.allocate())
+    start_network(net, timer, wait_timeout=args.wait)
+    timer.report()
+"""
+
+import ipaddress
+import json
+import time
+from contextlib import contextmanager
+
+from mininet.log import info
+
+# Large enough for 65,534 hosts
+DEFAULT_SUBNET = '10.0.0.0/16'
+
+# Parameters of every switch of a scaled topology
+SWITCH_PARAMS = {'protocols': 'OpenFlow13'}
+
+
+class AddressPool:
+    """Hands out consecutive host addresses of a subnet"""
+
+    def __init__(self, subnet=DEFAULT_SUBNET):
+        self.subnet = ipaddress.ip_network(subnet)
+        self.next_host = 1
+
+    @property
+    def capacity(self):
+        """Number of usable host addresses (network and broadcast excluded)"""
+        return max(self.subnet.num_addresses - 2, 0)
+
+    def check(self, count):
+        """Raise ValueError if count hosts do not fit into the subnet"""
+        if count > self.capacity:
+            raise ValueError('%d hosts do not fit into %s (%d addresses); use a larger '
+                             '--subnet, e.g. 10.0.0.0/8' % (count, self.subnet, self.capacity))
+
+    def allocate(self):
+        """Next free address with prefix length (10.0.1.4/16)"""
+        if self.next_host > self.capacity:
+            raise ValueError('Subnet %s is exhausted' % self.subnet)
+        address = self.subnet.network_address + self.next_host
+        self.next_host += 1
+        return '%s/%d' % (address, self.subnet.prefixlen)
+
+
+class PhaseTimer:
+    """Wall-clock duration of each named bring-up phase"""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    @property
+    def total(self):
+        return sum(seconds for _, seconds in self.phases)
+
+    def report(self):
+        info('*** Bring-up time per phase\n')
+        for name, seconds in self.phases:
+            info('  %-24s %8.2fs\n' % (name, seconds))
+        info('  %-24s %8.2fs\n' % ('total', self.total))
+
+    def save(self, path, **extra):
+        """Write the phase durations (and extra fields, e.g. sizes) as JSON"""
+        with open(path, 'w') as f:
+            json.dump({**extra, 'phases': dict(self.phases), 'total': self.total}, f, indent=2)
+
+
+def start_network(net, timer, wait_timeout=None):
+    """Build and start net phase by phase, optionally waiting for the controller
+
+    Returns False if the switches did not all connect within wait_timeout
+    seconds (0 waits forever, None does not wait).
+    """
+    with timer.phase('configure hosts'):
+        net.build()
+    with timer.phase('start switches'):
+        net.start()
+    if wait_timeout is None:
+        return True
+    with timer.phase('controller connection'):
+        return net.waitConnected(timeout=wait_timeout or None)
+
+
+def add_scale_args(parser):
+    """Add --subnet/--wait/--timing/--workers/--no-cli to an argument parser"""
+    parser.add_argument(
+        '--subnet',
+        default=DEFAULT_SUBNET,
+        help='Host address space (default: %s)' % DEFAULT_SUBNET
+    )
+    parser.add_argument(
+        '--wait',
+        type=float,
+        default=None,
+        help='Wait up to N seconds for all switches to connect to the controller '
+             'and time it (0: no limit)'
+    )
+    parser.add_argument(
+        '--timing',
+        metavar='FILE',
+        help='Write the bring-up time per phase to a JSON file'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Start hosts and create links with N parallel workers (see parallel_build.py; '
+             'default: 0, sequential)'
+    )
+    parser.add_argument(
+        '--no-cli',
+        action='store_true',
+        help='Stop the network after bring-up instead of opening the CLI'
+    )
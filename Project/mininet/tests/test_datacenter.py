@@ -0,0 +1,53 @@
+"""Command line of 09_datacenter_topology.py: topology choice to generator"""
+
+import argparse
+
+import pytest
+
+from datacenter import DATACENTER_TOPOLOGIES, add_fabric_args, fabric_from_args
+
+
+def parse(*argv):
+    parser = argparse.ArgumentParser()
+    add_fabric_args(parser)
+    return parser.parse_args(argv)
+
+
+def test_fattree():
+    fabric = fabric_from_args(parse('fattree', '-k', '4'))
+    assert fabric.name == 'fat-tree'
+    assert fabric.params['k'] == 4
+    assert len(fabric.switches) == 20
+    assert len(fabric.hosts) == 16
+
+
+def test_leafspine():
+    fabric = fabric_from_args(parse('leafspine', '--leaves', '3', '--spines', '2',
+                                    '--hosts-per-leaf', '5', '--oversubscription', '2.5',
+                                    '--bw', '100'))
+    assert fabric.name == 'leaf-spine'
+    assert fabric.params['oversubscription'] == 2.5
+    assert len(fabric.switches) == 5
+    assert len(fabric.hosts) == 15
+
+
+def test_jellyfish():
+    fabric = fabric_from_args(parse('jellyfish', '--switches', '10', '--degree', '3',
+                                    '--hosts-per-switch', '2', '--seed', '1'))
+    assert fabric.name == 'jellyfish'
+    assert fabric.params['seed'] == 1
+    assert len(fabric.switches) == 10
+    assert len(fabric.hosts) == 20
+
+
+def test_every_choice_has_a_generator():
+    for topology in DATACENTER_TOPOLOGIES:
+        assert fabric_from_args(parse(topology)).switches
+
+
+@pytest.mark.parametrize('topology', ['linear', 'tree'])
+def test_non_datacenter_generators_are_rejected(topology):
+    with pytest.raises(SystemExit):
+        parse(topology)
+    with pytest.raises(ValueError):
+        fabric_from_args(argparse.Namespace(topology=topology))
@@ -0,0 +1,260 @@
+"""
+Declarative topologies: load, validate and compile a topology file into a
+build plan, cached across launches.
+
+A topology file (YAML or JSON) lists controllers, switches, hosts and links,
+or names a generator from datacenter.py:
+
+    name: congestion
+    subnet: 10.0.0.0/24            # hosts without an ip get the next address
+    switch: {protocols: OpenFlow13}  # defaults for every switch
+    controllers:
+      - {name: c0, ip: 127.0.0.1, port: 6653}
+    switches: [s1, s2, {name: s3, controllers: [c0]}]
+    hosts: [{name: h1, ip: 10.0.0.1/24}, h2]
+    links:
+      - [h1, s1, {bw: 1000}]
+      - {node1: s1, node2: s2, bw: 100, delay: 5ms}
+
+    name: fattree
+    generator: {type: fattree, k: 4}
+
+The compiled plan fixes everything Mininet would otherwise decide while
+building: node parameters, addresses, port numbers and interface names,
+link parameters and the controllers of each switch. Plans are cached in
+.cache/plans/ by the SHA-256 of the file and of the code that compiles it
+(this module and the generators of datacenter.py), so launching the same
+topology again skips parsing, validation and generation, while a change to
+a generator recompiles its plans.
+
+Usage:
+    plan, cached = load_plan('topologies/congestion.yaml')
+    # run_topology.py builds and starts a Mininet network from the plan
+"""
+
+import hashlib
+import ipaddress
+import json
+import os
+from collections import Counter
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+import datacenter
+from datacenter import GENERATORS
+
+# Bump when the plan layout changes, so stale cached plans are recompiled
+PLAN_VERSION = 1
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'plans')
+
+# Source files whose content is part of every plan's cache key
+COMPILER_SOURCES = [os.path.abspath(__file__), os.path.abspath(datacenter.__file__)]
+
+# Mininet's own default address space for hosts without an ip
+DEFAULT_SUBNET = '10.0.0.0/8'
+
+CONTROLLER_TYPES = ('remote', 'local')
+
+# Mininet() options a topology file may set
+NET_OPTIONS = ('autoSetMacs', 'autoStaticArp', 'waitConnected')
+
+# Link parameters understood by Mininet's Link/TCLink
+LINK_PARAMS = ('bw', 'delay', 'jitter', 'loss', 'max_queue_size', 'use_htb', 'port1', 'port2')
+
+
+def read_spec(path):
+    """Parse a YAML or JSON topology file"""
+    with open(path) as f:
+        text = f.read()
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ValueError(f'{path}: reading YAML topologies needs PyYAML '
+                             '(pip install pyyaml); JSON files work without it')
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+    if not isinstance(spec, dict):
+        raise ValueError(f'{path}: a topology file must contain a mapping')
+    return spec
+
+
+def _entries(spec, key, path):
+    """Entries of a node list, each as a dict with a name"""
+    entries = []
+    for entry in spec.get(key, []):
+        entry = {'name': entry} if isinstance(entry, str) else dict(entry)
+        if 'name' not in entry:
+            raise ValueError(f'{path}: an entry of {key} has no name')
+        entries.append(entry)
+    return entries
+
+
+def _links(spec, path):
+    """Links as (node1, node2, params), from [a, b, {params}] or {node1, node2, ...}"""
+    links = []
+    for i, entry in enumerate(spec.get('links', []), 1):
+        if isinstance(entry, (list, tuple)):
+            if len(entry) not in (2, 3):
+                raise ValueError(f'{path}: link {i} must be [node1, node2] or [node1, node2, {{params}}]')
+            params = dict(entry[2]) if len(entry) == 3 else {}
+            node1, node2 = entry[:2]
+        else:
+            params = dict(entry)
+            node1, node2 = params.pop('node1', None), params.pop('node2', None)
+        unknown = set(params) - set(LINK_PARAMS)
+        if unknown:
+            raise ValueError(f'{path}: link {i} has unknown parameters {sorted(unknown)}')
+        links.append((node1, node2, params))
+    return links
+
+
+def _expand_generator(spec, path):
+    """Replace a generator entry with the switches, hosts and links it produces"""
+    params = dict(spec['generator'])
+    kind = params.pop('type', None)
+    if kind not in GENERATORS:
+        raise ValueError(f'{path}: unknown generator {kind!r} (choose from {sorted(GENERATORS)})')
+    try:
+        fabric = GENERATORS[kind](**params)
+    except TypeError as e:
+        raise ValueError(f'{path}: bad parameters for generator {kind}: {e}')
+    spec = dict(spec)
+    spec['switches'] = [{'name': switch, 'role': fabric.roles[switch]}
+                        for switch in fabric.switches]
+    spec['hosts'] = list(fabric.hosts)
+    spec['links'] = [{'node1': node1, 'node2': node2,
+                      'port1': fabric.port(node1, node2), 'port2': fabric.port(node2, node1),
+                      **link_params}
+                     for node1, node2, link_params in fabric.links]
+    return spec
+
+
+def compile_plan(spec, path='<topology>'):
+    """Validate a parsed topology and compile it into a build plan"""
+    if 'generator' in spec:
+        spec = _expand_generator(spec, path)
+
+    controllers = []
+    for entry in _entries(spec, 'controllers', path):
+        kind = entry.pop('type', 'remote')
+        if kind not in CONTROLLER_TYPES:
+            raise ValueError(f'{path}: controller {entry["name"]} has unknown type {kind!r}')
+        controllers.append({'name': entry.pop('name'), 'type': kind,
+                            'ip': entry.pop('ip', '127.0.0.1'),
+                            'port': int(entry.pop('port', 6653)), 'params': entry})
+    controller_names = [controller['name'] for controller in controllers]
+
+    switch_defaults = dict(spec.get('switch', {}))
+    switches = []
+    for entry in _entries(spec, 'switches', path):
+        name = entry.pop('name')
+        role = entry.pop('role', None)
+        mapped = entry.pop('controllers', controller_names)
+        missing = set(mapped) - set(controller_names)
+        if missing:
+            raise ValueError(f'{path}: switch {name} uses unknown controllers {sorted(missing)}')
+        switches.append({'name': name, 'role': role, 'controllers': list(mapped),
+                         'params': {**switch_defaults, **entry}})
+
+    subnet = ipaddress.ip_network(spec.get('subnet', DEFAULT_SUBNET))
+    host_defaults = dict(spec.get('host', {}))
+    hosts = []
+    taken = set()
+    for entry in _entries(spec, 'hosts', path):
+        if 'ip' in entry:
+            taken.add(ipaddress.ip_interface(entry['ip']).ip)
+        hosts.append({'name': entry.pop('name'), 'ip': entry.pop('ip', None),
+                      'params': {**host_defaults, **entry}})
+    free = (address for address in subnet.hosts() if address not in taken)
+    for host in hosts:
+        if host['ip'] is None:
+            address = next(free, None)
+            if address is None:
+                raise ValueError(f'{path}: subnet {subnet} has no address left for {host["name"]}')
+            host['ip'] = f'{address}/{subnet.prefixlen}'
+
+    names = Counter(node['name'] for node in controllers + switches + hosts)
+    duplicates = sorted(name for name, count in names.items() if count > 1)
+    if duplicates:
+        raise ValueError(f'{path}: duplicate node names {duplicates}')
+    host_names = {host['name'] for host in hosts}
+    node_names = host_names | {switch['name'] for switch in switches}
+
+    # Number ports the way Mininet does (hosts from 0, switches from 1)
+    # unless the file fixes them
+    next_port = {name: 0 if name in host_names else 1 for name in node_names}
+    used_ports = {name: set() for name in node_names}
+    links = []
+    default_link = dict(spec.get('link', {}))
+    for i, (node1, node2, params) in enumerate(_links(spec, path), 1):
+        for node in (node1, node2):
+            if node not in node_names:
+                raise ValueError(f'{path}: link {i} references unknown node {node!r}')
+        params = {**default_link, **params}
+        ports = []
+        for node, key in ((node1, 'port1'), (node2, 'port2')):
+            port = params.pop(key, None)
+            if port is None:
+                while next_port[node] in used_ports[node]:
+                    next_port[node] += 1
+                port = next_port[node]
+            if port in used_ports[node]:
+                raise ValueError(f'{path}: link {i} reuses port {port} of {node}')
+            used_ports[node].add(port)
+            ports.append(port)
+        links.append({'node1': node1, 'node2': node2,
+                      'port1': ports[0], 'port2': ports[1],
+                      'intf1': f'{node1}-eth{ports[0]}', 'intf2': f'{node2}-eth{ports[1]}',
+                      'params': params})
+
+    options = dict(spec.get('options', {}))
+    unknown = set(options) - set(NET_OPTIONS)
+    if unknown:
+        raise ValueError(f'{path}: unknown options {sorted(unknown)}')
+
+    return {
+        'version': PLAN_VERSION,
+        'name': spec.get('name', os.path.splitext(os.path.basename(path))[0]),
+        'description': spec.get('description', ''),
+        'options': {'autoSetMacs': True, **options},
+        'controllers': controllers,
+        'switches': switches,
+        'hosts': hosts,
+        'links': links,
+        'shaped': any(link['params'] for link in links),
+        'mapped': any(switch['controllers'] != controller_names for switch in switches),
+    }
+
+
+def plan_digest(path):
+    """Cache key of a topology file: its content, the plan version and compiler"""
+    sha256 = hashlib.sha256(b'plan-v%d\n' % PLAN_VERSION)
+    for source in COMPILER_SOURCES + [path]:
+        with open(source, 'rb') as f:
+            sha256.update(hashlib.sha256(f.read()).digest())
+    return sha256.hexdigest()
+
+
+def load_plan(path, cache_dir=CACHE_DIR, use_cache=True):
+    """Compiled plan of a topology file, from the cache when the file is unchanged
+
+    Returns (plan, cached).
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    cache_file = os.path.join(cache_dir, f'{name}-{plan_digest(path)[:16]}.json')
+    if use_cache and os.path.exists(cache_file):
+        with open(cache_file) as f:
+            return json.load(f), True
+
+    plan = compile_plan(read_spec(path), path)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(plan, f)
+        os.replace(tmp_file, cache_file)
+    return plan, False